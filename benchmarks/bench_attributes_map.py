@@ -0,0 +1,62 @@
+"""
+Benchmark the detection of the attributes to expose when creating a compound.
+
+Time the classification of the external connections of growing selections
+to show it scale linearly with the number of nodes. Run with mayapy:
+
+    mayapy benchmarks/bench_attributes_map.py --count 2000
+"""
+import argparse
+import timeit
+
+from maya import cmds, standalone
+
+
+def _setup(count):
+    """ Create a network of nodes with external connections of all kinds.
+
+    :param int count: The number of nodes in the network
+    :return: The network nodes
+    :rtype: list[str]
+    """
+    cmds.file(new=True, force=True)
+    src = cmds.createNode("transform")
+    dst = cmds.createNode("network")
+    cmds.addAttr(dst, longName="nodes", attributeType="message", multi=True)
+    nodes = []
+    for idx in range(count):
+        node = cmds.createNode("multiplyDivide")
+        cmds.connectAttr(src + ".translateX", node + ".input1X")
+        cmds.connectAttr(node + ".message", "%s.nodes[%s]" % (dst, idx))
+        if nodes:
+            cmds.connectAttr(nodes[-1] + ".outputX", node + ".input2X")
+        nodes.append(node)
+    cmds.connectAttr(nodes[-1] + ".outputX", src + ".translateY")
+    return nodes
+
+
+def main():
+    """ Entry point """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=2000)
+    args = parser.parse_args()
+
+    standalone.initialize()
+
+    from omtk_compound.core._factory import (  # pylint: disable=protected-access
+        _get_attributes_map_from_nodes,
+    )
+
+    for count in (args.count // 8, args.count // 4, args.count // 2, args.count):
+        nodes = _setup(count)
+        duration = timeit.timeit(
+            lambda nodes=nodes: _get_attributes_map_from_nodes(nodes), number=1
+        )
+        print(
+            "%8s nodes %8.3fs (%.1fus per node)"
+            % (count, duration, duration / count * 1e6)
+        )
+
+
+if __name__ == "__main__":
+    main()
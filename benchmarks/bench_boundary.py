@@ -0,0 +1,97 @@
+"""
+Benchmark the detection of the nodes between input and output attributes.
+
+Time the graph traversal used by from_attributes against the previous
+listHistory implementation on a network where most nodes are outside
+of the boundaries. Run with mayapy:
+
+    mayapy benchmarks/bench_boundary.py --count 2000
+"""
+import argparse
+import timeit
+
+from maya import cmds, standalone
+
+
+def _create_chain(count):
+    """ Create a chain of nodes connected by their translateX attribute.
+
+    :param int count: The number of nodes in the chain
+    :return: The chain nodes
+    :rtype: list[str]
+    """
+    nodes = [cmds.createNode("transform") for _ in range(count)]
+    for src, dst in zip(nodes, nodes[1:]):
+        cmds.connectAttr(src + ".translateX", dst + ".translateX")
+    return nodes
+
+
+def _setup(count):
+    """ Create a chain of nodes with long chains upstream and downstream of it.
+    Each node of the chain also drive a node that don't lead to the output.
+
+    :param int count: The number of nodes between the input and the output
+    :return: The input and output attributes
+    :rtype: tuple[list[str], list[str]]
+    """
+    cmds.file(new=True, force=True)
+    upstream = _create_chain(count)
+    enclosed = _create_chain(count)
+    downstream = _create_chain(count)
+    cmds.connectAttr(upstream[-1] + ".translateX", enclosed[0] + ".translateX")
+    cmds.connectAttr(enclosed[-1] + ".translateX", downstream[0] + ".translateX")
+    for node in enclosed:
+        leaf = cmds.createNode("transform")
+        cmds.connectAttr(node + ".translateY", leaf + ".translateY")
+    return [enclosed[0] + ".translateX"], [enclosed[-1] + ".translateX"]
+
+
+def _list_history(inputs, outputs):
+    """ The previous implementation, for comparison.
+
+    :param list[str] inputs: A list of input attributes.
+    :param list[str] outputs: A list of output attributes.
+    :return: The nodes between the inputs and the outputs
+    :rtype: set[str]
+    """
+    hist_inn = set()
+    hist_out = set()
+    for attr_inn in inputs:
+        hist_inn.update(cmds.listHistory(attr_inn, future=True) or [])
+    for attr_out in outputs:
+        hist_out.update(cmds.listHistory(attr_out, future=False) or [])
+    return hist_inn & hist_out
+
+
+def _timeit(label, func, count):
+    """ Time a function and print the result.
+
+    :param str label: A description of what is timed
+    :param callable func: The function to time
+    :param int count: The number of enclosed nodes
+    """
+    duration = timeit.timeit(func, number=1)
+    print("%-24s %8.3fs for %s enclosed nodes" % (label, duration, count))
+
+
+def main():
+    """ Entry point """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=2000)
+    args = parser.parse_args()
+
+    standalone.initialize()
+
+    from omtk_compound.core._factory import (  # pylint: disable=protected-access
+        _get_nodes_from_attributes,
+    )
+
+    inputs, outputs = _setup(args.count)
+    _timeit("listHistory", lambda: _list_history(inputs, outputs), args.count)
+    _timeit(
+        "traversal", lambda: _get_nodes_from_attributes(inputs, outputs), args.count
+    )
+
+
+if __name__ == "__main__":
+    main()
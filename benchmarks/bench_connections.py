@@ -0,0 +1,76 @@
+"""
+Benchmark holding and restoring the connections of a compound.
+
+Time hold_connections, fetch_connections and explode on a compound
+with a large number of external connections. Run with mayapy:
+
+    mayapy benchmarks/bench_connections.py --count 1000
+"""
+import argparse
+import timeit
+
+from maya import cmds, standalone
+
+
+def _setup(count):
+    """ Create a compound with external connections.
+
+    :param int count: The number of external connections
+    :return: The compound
+    :rtype: Compound
+    """
+    from omtk_compound.core import create_empty
+
+    cmds.file(new=True, force=True)
+    inst = create_empty()
+    src = cmds.createNode("transform")
+    for idx in range(count // 2):
+        name_inn = "input%s" % idx
+        name_out = "output%s" % idx
+        inst.add_input_attr(name_inn)
+        inst.add_output_attr(name_out)
+        dst = cmds.createNode("transform")
+        cmds.connectAttr(src + ".translateX", "%s.%s" % (inst.input, name_inn))
+        cmds.connectAttr(
+            "%s.%s" % (inst.input, name_inn), "%s.%s" % (inst.output, name_out)
+        )
+        cmds.connectAttr("%s.%s" % (inst.output, name_out), dst + ".translateX")
+    return inst
+
+
+def _timeit(label, func, count):
+    """ Time a function and print the result.
+
+    :param str label: A description of what is timed
+    :param callable func: The function to time
+    :param int count: The number of connections
+    """
+    duration = timeit.timeit(func, number=1)
+    print("%-24s %8.3fs for %s connections" % (label, duration, count))
+
+
+def main():
+    """ Entry point """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=1000)
+    args = parser.parse_args()
+
+    standalone.initialize()
+    cmds.undoInfo(state=True, infinity=True)
+
+    inst = _setup(args.count)
+    connections = []
+    _timeit(
+        "hold_connections",
+        lambda: connections.extend(inst.hold_connections()),
+        args.count,
+    )
+    _timeit(
+        "fetch_connections", lambda: inst.fetch_connections(*connections), args.count
+    )
+    _timeit("explode", inst.explode, args.count)
+    _timeit("undo explode", cmds.undo, args.count)
+
+
+if __name__ == "__main__":
+    main()
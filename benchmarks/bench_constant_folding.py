@@ -0,0 +1,100 @@
+"""
+Benchmark the playback of a rig before and after folding the constant nodes.
+
+Each instance of the test rig is a compound where an animated control
+is multiplied by an offset matrix built from constant utility nodes.
+Print the node count and the frames per second before and after running
+the "constants" optimization pass. Run with mayapy:
+
+    mayapy benchmarks/bench_constant_folding.py --count 200 --frames 100
+"""
+import argparse
+import time
+
+from maya import cmds, standalone
+
+
+def _create_instance(namespace):
+    """ Create a compound with constant nodes driving an animated transform.
+
+    :param str namespace: The compound namespace
+    :return: The attribute to pull to evaluate the compound
+    :rtype: str
+    """
+    cmds.namespace(addNamespace=namespace)
+    cmds.createNode("network", name=namespace + ":inputs")
+    cmds.createNode("network", name=namespace + ":outputs")
+
+    ctrl = cmds.createNode("transform", name=namespace + "_ctrl")
+    cmds.setKeyframe(ctrl, attribute="translateX", time=1, value=0)
+    cmds.setKeyframe(ctrl, attribute="translateX", time=100, value=10)
+
+    multiply = cmds.createNode("multiplyDivide", name=namespace + ":multiply")
+    cmds.setAttr(multiply + ".input1", 1.0, 2.0, 3.0)
+    cmds.setAttr(multiply + ".input2", 0.5, 0.5, 0.5)
+    product = cmds.createNode("vectorProduct", name=namespace + ":product")
+    cmds.setAttr(product + ".operation", 0)  # no operation
+    cmds.connectAttr(multiply + ".output", product + ".input1")
+    offset = cmds.createNode("fourByFourMatrix", name=namespace + ":offset")
+    for axis, attr in zip("XYZ", ("in30", "in31", "in32")):
+        cmds.connectAttr(product + ".output" + axis, offset + "." + attr)
+
+    mult = cmds.createNode("multMatrix", name=namespace + ":mult")
+    cmds.connectAttr(offset + ".output", mult + ".matrixIn[0]")
+    cmds.connectAttr(ctrl + ".worldMatrix[0]", mult + ".matrixIn[1]")
+    decompose = cmds.createNode("decomposeMatrix", name=namespace + ":decompose")
+    cmds.connectAttr(mult + ".matrixSum", decompose + ".inputMatrix")
+    driven = cmds.createNode("transform", name=namespace + "_driven")
+    cmds.connectAttr(decompose + ".outputTranslate", driven + ".translate")
+    return driven + ".worldMatrix[0]"
+
+
+def _measure_fps(attrs, frames):
+    """ Step through frames and pull the rig outputs.
+
+    :param list[str] attrs: The attributes to pull on each frame
+    :param int frames: The number of frames to play
+    :return: The number of frames evaluated per second
+    :rtype: float
+    """
+    start = time.time()
+    for frame in range(1, frames + 1):
+        cmds.currentTime(frame, update=True)
+        for attr in attrs:
+            cmds.getAttr(attr)
+    return frames / (time.time() - start)
+
+
+def main():
+    """ Entry point """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=200)
+    parser.add_argument("--frames", type=int, default=100)
+    args = parser.parse_args()
+
+    standalone.initialize()
+
+    from omtk_compound.core import Compound
+
+    cmds.file(new=True, force=True)
+    namespaces = ["rig%s" % idx for idx in range(args.count)]
+    attrs = [_create_instance(namespace) for namespace in namespaces]
+
+    count_before = len(cmds.ls())
+    fps_before = _measure_fps(attrs, args.frames)
+
+    removed = 0
+    for namespace in namespaces:
+        report = Compound(namespace).optimize(passes=["constants"])
+        removed += report.nodes_removed
+
+    count_after = len(cmds.ls())
+    fps_after = _measure_fps(attrs, args.frames)
+
+    print("%-24s %8s nodes %8.1f fps" % ("before", count_before, fps_before))
+    print("%-24s %8s nodes %8.1f fps" % ("after", count_after, fps_after))
+    print("%-24s %8s nodes" % ("folded", removed))
+
+
+if __name__ == "__main__":
+    main()
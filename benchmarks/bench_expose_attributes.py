@@ -0,0 +1,96 @@
+"""
+Benchmark exposing attributes on a compound.
+
+Time exposing, querying the connections of and exploding a compound
+with a large number of attributes. Exposing is timed one attribute at a time
+and in bulk. Run with mayapy:
+
+    mayapy benchmarks/bench_expose_attributes.py --count 1000
+"""
+import argparse
+import timeit
+
+from maya import cmds, standalone
+
+
+def _setup(count):
+    """ Create a compound and a network of nodes to expose.
+
+    :param int count: The number of attributes to expose
+    :return: The compound and the attributes to expose as inputs and outputs.
+    :rtype: tuple[Compound, list[str], list[str]]
+    """
+    from omtk_compound.core import create_empty
+
+    cmds.file(new=True, force=True)
+    inst = create_empty()
+    inputs = []
+    outputs = []
+    for _ in range(count // 2):
+        node = cmds.createNode("plusMinusAverage")
+        src = cmds.createNode("transform")
+        dst = cmds.createNode("transform")
+        cmds.connectAttr(src + ".translateX", node + ".input1D[0]")
+        cmds.connectAttr(node + ".output1D", dst + ".translateX")
+        inputs.append(node + ".input1D[1]")
+        outputs.append(node + ".output3D")
+    return inst, inputs, outputs
+
+
+def _expose(inst, inputs, outputs):
+    """ Expose the provided attributes on a compound, one at a time.
+
+    :param Compound inst: A compound
+    :param list[str] inputs: The attributes to expose as inputs
+    :param list[str] outputs: The attributes to expose as outputs
+    """
+    for attr in inputs:
+        inst.expose_input_attr(attr)
+    for attr in outputs:
+        inst.expose_output_attr(attr)
+
+
+def _expose_bulk(inst, inputs, outputs):
+    """ Expose the provided attributes on a compound, all at once.
+
+    :param Compound inst: A compound
+    :param list[str] inputs: The attributes to expose as inputs
+    :param list[str] outputs: The attributes to expose as outputs
+    """
+    inst.expose_inputs(inputs)
+    inst.expose_outputs(outputs)
+
+
+def _timeit(label, func, count):
+    """ Time a function and print the result.
+
+    :param str label: A description of what is timed
+    :param callable func: The function to time
+    :param int count: The number of attributes
+    """
+    duration = timeit.timeit(func, number=1)
+    print(
+        "%-24s %8.3fs for %s attributes (%.0f attributes/s)"
+        % (label, duration, count, count / duration)
+    )
+
+
+def main():
+    """ Entry point """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=1000)
+    args = parser.parse_args()
+
+    standalone.initialize()
+
+    inst, inputs, outputs = _setup(args.count)
+    _timeit("expose", lambda: _expose(inst, inputs, outputs), args.count)
+
+    inst, inputs, outputs = _setup(args.count)
+    _timeit("expose_bulk", lambda: _expose_bulk(inst, inputs, outputs), args.count)
+    _timeit("get_connections", inst.get_connections, args.count)
+    _timeit("explode", inst.explode, args.count)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Benchmark instantiating the same compound many times.
+
+Compare importing the compound file for each instance
+with duplicating an imported template. Run with mayapy:
+
+    mayapy benchmarks/bench_instantiate.py --count 200
+"""
+import argparse
+import os
+import timeit
+
+from maya import cmds, standalone
+
+_PATH_COMPOUND = os.path.join(
+    os.path.dirname(__file__), "..", "compounds", "omtk.matrixFrom2Vectors_v0.0.1.ma"
+)
+
+
+def _import(count):
+    """ Import the compound file for each instance.
+
+    :param int count: The number of instances to create
+    """
+    from omtk_compound.core._factory import from_file
+
+    cmds.file(new=True, force=True)
+    for _ in range(count):
+        from_file(_PATH_COMPOUND)
+
+
+def _duplicate(count):
+    """ Import the compound file once and duplicate it for each instance.
+
+    :param int count: The number of instances to create
+    """
+    from omtk_compound.core._template import TemplateCache
+
+    cmds.file(new=True, force=True)
+    cache = TemplateCache()
+    for _ in range(count):
+        cache.instantiate(_PATH_COMPOUND)
+
+
+def main():
+    """ Entry point """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=200)
+    args = parser.parse_args()
+
+    standalone.initialize()
+
+    for label, func in (("import", _import), ("template", _duplicate)):
+        duration = timeit.timeit(
+            lambda: func(args.count), number=1  # pylint: disable=cell-var-from-loop
+        )
+        print("%-24s %8.3fs for %s instances" % (label, duration, args.count))
+
+
+if __name__ == "__main__":
+    main()
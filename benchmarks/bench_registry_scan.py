@@ -0,0 +1,96 @@
+"""
+Benchmark scanning a compound library.
+
+Compare a serial scan, a parallel scan and a warm scan using the registry index
+on a generated library. Run with mayapy:
+
+    mayapy benchmarks/bench_registry_scan.py --count 10000 --workers 8
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import timeit
+
+from omtk_compound.core._index import RegistryIndex
+from omtk_compound.core._registry import Registry
+
+_CONTENT = """//Maya ASCII 2017ff05 scene
+//Name: compound.ma
+requires maya "2017ff05";
+currentUnit -l centimeter -a degree -t film;
+fileInfo "omtk.compound.uid" "uid_%(idx)s";
+fileInfo "omtk.compound.name" "compound_%(idx)s";
+fileInfo "omtk.compound.version" "0.0.1";
+createNode network -n "inputs";
+createNode network -n "outputs";
+"""
+
+
+def _generate_library(path, count):
+    """ Generate a library of compounds.
+
+    :param str path: The library location
+    :param int count: The number of compounds to generate
+    """
+    for idx in range(count):
+        dirname = os.path.join(path, "group_%s" % (idx % 100))
+        if not os.path.isdir(dirname):
+            os.makedirs(dirname)
+        with open(os.path.join(dirname, "compound_%s.ma" % idx), "w") as stream:
+            stream.write(_CONTENT % {"idx": idx})
+
+
+def _scan(path, index_path=None, workers=None):
+    """ Scan a library into a new registry.
+
+    :param str path: The library location
+    :param str index_path: An optional path to a registry index
+    :param int workers: An optional number of workers
+    :return: The new registry
+    :rtype: Registry
+    """
+    registry = Registry()
+    index = RegistryIndex(index_path) if index_path else None
+    registry.parse_directory(path, index=index, workers=workers)
+    return registry
+
+
+def main():
+    """ Entry point """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=10000)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--location", help="Generate the library in this directory")
+    args = parser.parse_args()
+
+    path = args.location or tempfile.mkdtemp()
+    index_path = os.path.join(path, "index.json")
+    try:
+        _generate_library(path, args.count)
+        serial = _scan(path)
+        parallel = _scan(path, workers=args.workers)
+        assert serial == parallel, "Parallel scan don't match serial scan"
+
+        for label, kwargs in (
+            ("serial", {}),
+            ("parallel (%s workers)" % args.workers, {"workers": args.workers}),
+            ("indexed (warm)", {"index_path": index_path}),
+        ):
+            _scan(path, **kwargs)  # warm up the file system cache and index
+            duration = min(
+                timeit.repeat(
+                    lambda: _scan(path, **kwargs),  # pylint: disable=cell-var-from-loop
+                    number=1,
+                    repeat=args.repeat,
+                )
+            )
+            print("%-24s %8.3fs for %s files" % (label, duration, args.count))
+    finally:
+        if not args.location:
+            shutil.rmtree(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Maya plugin providing the command that register OpenMaya modifiers
+executed by omtk_compound in the undo queue.
+
+See omtk_compound.core._utils_undo.commit.
+"""
+# pylint: disable=invalid-name
+from maya.api import OpenMaya
+
+from omtk_compound.core import _utils_undo
+
+
+def maya_useNewAPI():
+    """ Tell Maya this plugin use the OpenMaya 2.0 api. """
+
+
+class UndoCommand(OpenMaya.MPxCommand):
+    """
+    Command that take ownership of an already executed modifier
+    so it can be undone and redone.
+    """
+
+    def __init__(self):
+        super(UndoCommand, self).__init__()
+        self._modifier = None
+
+    def doIt(self, _):
+        """ Re-implement MPxCommand.doIt. The modifier was already executed. """
+        self._modifier = _utils_undo.pop_pending()
+
+    def redoIt(self):
+        """ Re-implement MPxCommand.redoIt """
+        self._modifier.doIt()
+
+    def undoIt(self):
+        """ Re-implement MPxCommand.undoIt """
+        self._modifier.undoIt()
+
+    def isUndoable(self):  # pylint: disable=no-self-use
+        """ Re-implement MPxCommand.isUndoable """
+        return True
+
+    @classmethod
+    def creator(cls):
+        """
+        :return: A new command instance
+        :rtype: UndoCommand
+        """
+        return cls()
+
+
+def initializePlugin(mobject):
+    """ Register the plugin command. """
+    plugin = OpenMaya.MFnPlugin(mobject, "omtk", "0.0.1")
+    plugin.registerCommand(_utils_undo.COMMAND_NAME, UndoCommand.creator)
+
+
+def uninitializePlugin(mobject):
+    """ Deregister the plugin command. """
+    plugin = OpenMaya.MFnPlugin(mobject)
+    plugin.deregisterCommand(_utils_undo.COMMAND_NAME)
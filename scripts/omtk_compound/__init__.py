@@ -5,6 +5,7 @@ from omtk_compound.core import (
     Compound,
     CompoundDefinition,
     CompoundValidationError,
+    LazyManager,
     Manager,
     Preferences,
     Registry,
@@ -14,11 +15,12 @@ __all__ = (
     "Compound",
     "CompoundDefinition",
     "CompoundValidationError",
+    "LazyManager",
     "Manager",
     "Preferences",
     "Registry",
     "manager",
 )
 
-# Default manager
-manager = Manager()  # pylint: disable=invalid-name
+# Default manager. The compound location is only scanned when it is first used.
+manager = LazyManager()  # pylint: disable=invalid-name
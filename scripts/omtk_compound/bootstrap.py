@@ -123,3 +123,8 @@ def bootstrap():
     create_runtime_commands()
     if not cmds.about(batch=True):
         build_shelf()
+
+        # Scan the compound library in the background so it's ready when needed.
+        from omtk_compound import manager
+
+        manager.preload()
@@ -4,10 +4,14 @@ Do not use from outside.
 """
 from ._compound import Compound, CompoundValidationError
 from ._definition import CompoundDefinition
+from ._graph import MaGraph
 from ._factory import create_empty, create_from_nodes, from_attributes, from_namespace
 from ._registry import Registry
 from ._preferences import Preferences
-from ._manager import Manager
+from ._manager import Manager, LazyManager
+from ._optimize import OptimizationReport, register_pass
+from ._dedup import merge_duplicates
+from ._profiling import CompoundProfile, ProfileCache, profile_compounds
 
 __all__ = (
     "Compound",
@@ -17,7 +21,15 @@ __all__ = (
     "create_from_nodes",
     "from_attributes",
     "from_namespace",
+    "MaGraph",
     "Registry",
     "Preferences",
     "Manager",
+    "LazyManager",
+    "OptimizationReport",
+    "register_pass",
+    "merge_duplicates",
+    "CompoundProfile",
+    "ProfileCache",
+    "profile_compounds",
 )
@@ -0,0 +1,395 @@
+"""
+Specification of an attribute that can be re-created on any node.
+
+Specifications of static attributes are cached by node type and attribute name
+so exposing the same attribute many times only inspect it once.
+"""
+import logging
+
+from maya import OpenMaya as OpenMayaV1
+from maya.api import OpenMaya
+
+_LOG = logging.getLogger(__name__)
+
+# Properties copied from the source attribute, in the order they need to be set.
+_PROPERTIES = (
+    "array",
+    "indexMatters",
+    "usesArrayDataBuilder",
+    "readable",
+    "writable",
+    "connectable",
+    "storable",
+    "cached",
+    "keyable",
+    "channelBox",
+    "hidden",
+    "disconnectBehavior",
+)
+
+# Ranges copied from numeric and unit attributes
+_RANGES = (
+    ("hasMin", "getMin", "setMin"),
+    ("hasMax", "getMax", "setMax"),
+    ("hasSoftMin", "getSoftMin", "setSoftMin"),
+    ("hasSoftMax", "getSoftMax", "setSoftMax"),
+)
+
+_SPECS = {}
+
+
+class UnsupportedAttributeError(Exception):
+    """Raised when no specification can be built for an attribute."""
+
+
+class AttributeSpec(object):  # pylint: disable=too-many-instance-attributes
+    """
+    Everything needed to re-create an attribute.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        kind,
+        long_name,
+        short_name,
+        args=(),
+        ranges=(),
+        fields=(),
+        properties=None,
+        children=(),
+    ):
+        """
+        :param str kind: The kind of attribute. ex: "numeric", "compound"
+        :param str long_name: The attribute long name
+        :param str short_name: The attribute short name
+        :param tuple args: Additional arguments for the function set `create` method
+        :param ranges: Setter names and values for the attribute ranges
+        :type ranges: tuple[tuple[str, object]]
+        :param fields: Names and values of enum attribute fields
+                       or data types of generic attributes.
+        :type fields: tuple
+        :param properties: The MFnAttribute properties values
+        :type properties: dict[str, object]
+        :param children: The children specifications of compound attributes
+        :type children: tuple[AttributeSpec]
+        """
+        self.kind = kind
+        self.long_name = long_name
+        self.short_name = short_name
+        self.args = args
+        self.ranges = ranges
+        self.fields = fields
+        self.properties = properties or {}
+        self.children = children
+
+    def __repr__(self):
+        return "<AttributeSpec %s %r>" % (self.kind, self.long_name)
+
+    def get_child_names(self, child, long_name, short_name):
+        """ Resolve the names of a child attribute when it's parent is renamed.
+        Children prefixed by their parent name are renamed with it.
+        ex: "translateX" become "translate1X" when "translate" is renamed "translate1".
+
+        :param AttributeSpec child: One of the specification children
+        :param str long_name: The parent new long name
+        :param str short_name: The parent new short name
+        :return: The child new long name and short name
+        :rtype: tuple[str, str]
+        """
+        return (
+            _replace_prefix(child.long_name, self.long_name, long_name),
+            _replace_prefix(child.short_name, self.short_name, short_name),
+        )
+
+    def iter_names(self, long_name=None, short_name=None):
+        """ Yield the names of the attribute and all it's descendants.
+
+        :param str long_name: An optional new long name
+        :param str short_name: An optional new short name
+        :return: A generator of long names and short names
+        :rtype: Generator[tuple[str, str]]
+        """
+        long_name = long_name or self.long_name
+        short_name = short_name or self.short_name
+        yield long_name, short_name
+        for child in self.children:
+            for names in child.iter_names(
+                *self.get_child_names(child, long_name, short_name)
+            ):
+                yield names
+
+    def create(self, long_name=None, short_name=None, **properties):
+        """ Create a new attribute from the specification.
+
+        :param str long_name: An optional new long name
+        :param str short_name: An optional new short name
+        :param properties: MFnAttribute properties to override. ex: readable=True
+        :return: The new attribute MObject, ready to be added to a node.
+        :rtype: maya.api.OpenMaya.MObject
+        """
+        long_name = long_name or self.long_name
+        short_name = short_name or self.short_name
+        mfn, mobject = _CREATORS[self.kind](self, long_name, short_name)
+
+        for setter, value in self.ranges:
+            getattr(mfn, setter)(value)
+
+        properties = dict(self.properties, **properties)
+        for name in _PROPERTIES:
+            if name not in properties:
+                continue
+            if name in ("indexMatters", "usesArrayDataBuilder") and not properties.get(
+                "array"
+            ):
+                continue
+            setattr(mfn, name, properties[name])
+
+        return mobject
+
+
+def _replace_prefix(name, old_prefix, new_prefix):
+    """
+    :param str name: A name
+    :param str old_prefix: The prefix to replace
+    :param str new_prefix: The replacement prefix
+    :return: The name with it's prefix replaced, if it start with it
+    :rtype: str
+    """
+    if name.startswith(old_prefix):
+        return new_prefix + name[len(old_prefix) :]
+    return name
+
+
+def _create_numeric(spec, long_name, short_name):
+    mfn = OpenMaya.MFnNumericAttribute()
+    return mfn, mfn.create(long_name, short_name, *spec.args)
+
+
+def _create_numeric_compound(spec, long_name, short_name):
+    children = [
+        child.create(*spec.get_child_names(child, long_name, short_name))
+        for child in spec.children
+    ]
+    mfn = OpenMaya.MFnNumericAttribute()
+    return mfn, mfn.create(long_name, short_name, *children)
+
+
+def _create_unit(spec, long_name, short_name):
+    mfn = OpenMaya.MFnUnitAttribute()
+    return mfn, mfn.create(long_name, short_name, *spec.args)
+
+
+def _create_typed(spec, long_name, short_name):
+    mfn = OpenMaya.MFnTypedAttribute()
+    return mfn, mfn.create(long_name, short_name, *spec.args)
+
+
+def _create_enum(spec, long_name, short_name):
+    mfn = OpenMaya.MFnEnumAttribute()
+    mobject = mfn.create(long_name, short_name, *spec.args)
+    for name, value in spec.fields:
+        mfn.addField(name, value)
+    return mfn, mobject
+
+
+def _create_matrix(spec, long_name, short_name):
+    mfn = OpenMaya.MFnMatrixAttribute()
+    return mfn, mfn.create(long_name, short_name, *spec.args)
+
+
+def _create_message(_, long_name, short_name):
+    mfn = OpenMaya.MFnMessageAttribute()
+    return mfn, mfn.create(long_name, short_name)
+
+
+def _create_generic(spec, long_name, short_name):
+    mfn = OpenMaya.MFnGenericAttribute()
+    mobject = mfn.create(long_name, short_name)
+    for data_type in spec.fields:
+        mfn.addDataType(data_type)
+    return mfn, mobject
+
+
+def _create_compound(spec, long_name, short_name):
+    mfn = OpenMaya.MFnCompoundAttribute()
+    mobject = mfn.create(long_name, short_name)
+    for child in spec.children:
+        mfn.addChild(child.create(*spec.get_child_names(child, long_name, short_name)))
+    return mfn, mobject
+
+
+_CREATORS = {
+    "numeric": _create_numeric,
+    "numeric_compound": _create_numeric_compound,
+    "unit": _create_unit,
+    "typed": _create_typed,
+    "enum": _create_enum,
+    "matrix": _create_matrix,
+    "message": _create_message,
+    "generic": _create_generic,
+    "compound": _create_compound,
+}
+
+
+def _get_ranges(mfn):
+    """
+    :param mfn: A numeric or unit attribute function set
+    :return: The setter name and value of each range defined on the attribute
+    :rtype: tuple[tuple[str, object]]
+    """
+    return tuple(
+        (setter, getattr(mfn, getter)())
+        for has, getter, setter in _RANGES
+        if getattr(mfn, has)()
+    )
+
+
+def _get_enum_fields(mfn):
+    """
+    :param mfn: An enum attribute function set
+    :return: The name and value of each field
+    :rtype: tuple[tuple[str, int]]
+    """
+    fields = []
+    for value in range(mfn.getMin(), mfn.getMax() + 1):
+        try:
+            fields.append((mfn.fieldName(value), value))
+        except RuntimeError:  # no field for this value
+            continue
+    return tuple(fields)
+
+
+def _get_generic_data_types(node_name, attr_name):
+    """ Get the data types accepted by a generic attribute.
+    OpenMaya 2.0 cannot query them so the OpenMaya 1.0 api is used here.
+
+    :param str node_name: The name of a node holding the attribute
+    :param str attr_name: The generic attribute name
+    :return: The accepted MFnData types
+    :rtype: tuple[int]
+    """
+    sel = OpenMayaV1.MSelectionList()
+    sel.add(node_name)
+    node = OpenMayaV1.MObject()
+    sel.getDependNode(0, node)
+    attr = OpenMayaV1.MFnDependencyNode(node).attribute(attr_name)
+    mfn = OpenMayaV1.MFnGenericAttribute(attr)
+    return tuple(
+        idx
+        for idx in range(OpenMayaV1.MFnData.kInvalid + 1, OpenMayaV1.MFnData.kLast)
+        if mfn.accepts(idx)
+    )
+
+
+def _build_spec(attr, node_name):  # pylint: disable=too-many-return-statements
+    """ Inspect an attribute and build it's specification.
+
+    :param attr: An attribute MObject
+    :type attr: maya.api.OpenMaya.MObject
+    :param str node_name: The name of a node holding the attribute
+    :return: An attribute specification
+    :rtype: AttributeSpec
+    :raises UnsupportedAttributeError: If the attribute type is not supported
+    """
+    mfn = OpenMaya.MFnAttribute(attr)
+    base = {
+        "long_name": mfn.name,
+        "short_name": mfn.shortName,
+        "properties": {name: getattr(mfn, name) for name in _PROPERTIES},
+    }
+    api_type = OpenMaya.MFn
+
+    if attr.hasFn(api_type.kCompoundAttribute):
+        mfn = OpenMaya.MFnCompoundAttribute(attr)
+        children = tuple(
+            _build_spec(mfn.child(idx), node_name) for idx in range(mfn.numChildren())
+        )
+        if attr.hasFn(api_type.kNumericAttribute):
+            return AttributeSpec("numeric_compound", children=children, **base)
+        return AttributeSpec("compound", children=children, **base)
+
+    if attr.hasFn(api_type.kNumericAttribute):
+        mfn = OpenMaya.MFnNumericAttribute(attr)
+        return AttributeSpec(
+            "numeric",
+            args=(mfn.numericType(), mfn.default),
+            ranges=_get_ranges(mfn),
+            **base
+        )
+
+    if attr.hasFn(api_type.kUnitAttribute):
+        mfn = OpenMaya.MFnUnitAttribute(attr)
+        return AttributeSpec(
+            "unit", args=(mfn.unitType(), mfn.default), ranges=_get_ranges(mfn), **base
+        )
+
+    if attr.hasFn(api_type.kEnumAttribute):
+        mfn = OpenMaya.MFnEnumAttribute(attr)
+        return AttributeSpec(
+            "enum", args=(mfn.default,), fields=_get_enum_fields(mfn), **base
+        )
+
+    if attr.hasFn(api_type.kTypedAttribute):
+        mfn = OpenMaya.MFnTypedAttribute(attr)
+        return AttributeSpec("typed", args=(mfn.attrType(),), **base)
+
+    if attr.hasFn(api_type.kFloatMatrixAttribute):
+        return AttributeSpec(
+            "matrix", args=(OpenMaya.MFnMatrixAttribute.kFloat,), **base
+        )
+
+    if attr.hasFn(api_type.kMatrixAttribute):
+        return AttributeSpec(
+            "matrix", args=(OpenMaya.MFnMatrixAttribute.kDouble,), **base
+        )
+
+    if attr.hasFn(api_type.kMessageAttribute):
+        return AttributeSpec("message", **base)
+
+    if attr.hasFn(api_type.kGenericAttribute):
+        return AttributeSpec(
+            "generic", fields=_get_generic_data_types(node_name, mfn.name), **base
+        )
+
+    raise UnsupportedAttributeError(
+        "Unsupported attribute type %r for %s.%s"
+        % (attr.apiTypeStr, node_name, mfn.name)
+    )
+
+
+def get_attribute_spec(plug):
+    """ Get the specification of an attribute.
+    The specification of static attributes are cached by node type and attribute name.
+
+    :param plug: An attribute MPlug
+    :type plug: maya.api.OpenMaya.MPlug
+    :return: An attribute specification
+    :rtype: AttributeSpec
+    :raises UnsupportedAttributeError: If the attribute type is not supported
+    """
+    attr = plug.attribute()
+    mfn = OpenMaya.MFnAttribute(attr)
+    node = plug.node()
+    node_mfn = OpenMaya.MFnDependencyNode(node)
+    node_name = (
+        OpenMaya.MFnDagNode(node).partialPathName()
+        if node.hasFn(OpenMaya.MFn.kDagNode)
+        else node_mfn.name()
+    )
+
+    # Dynamic attributes can differ between nodes of the same type.
+    if mfn.dynamic:
+        return _build_spec(attr, node_name)
+
+    key = (node_mfn.typeName, mfn.name)
+    try:
+        return _SPECS[key]
+    except KeyError:
+        _LOG.debug("Caching attribute specification for %s.%s", *key)
+        spec = _SPECS[key] = _build_spec(attr, node_name)
+        return spec
+
+
+def clear_cache():
+    """ Forget about all cached specifications. """
+    _SPECS.clear()
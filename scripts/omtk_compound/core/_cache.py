@@ -0,0 +1,259 @@
+"""
+Cache for the values of a compound that are expensive to query from Maya.
+
+Entries are invalidated by Maya callbacks when the compound change.
+"""
+import copy
+import functools
+import logging
+
+from maya.api import OpenMaya
+
+from . import _utils_attr
+
+_LOG = logging.getLogger(__name__)
+
+# Cache keys
+KEY_NODES = "nodes"
+KEY_INPUTS = "inputs"
+KEY_OUTPUTS = "outputs"
+KEY_METADATA = "metadata"
+
+_METADATA_ATTR_NAME = "notes"
+
+
+def cached(key):
+    """ Decorator that cache a compound method return value if it's cache is enabled.
+    A copy of the cached value is returned so the cache cannot be modified.
+
+    :param str key: The cache key
+    :return: A decorator
+    :rtype: callable
+    """
+
+    def _decorator(func):
+        @functools.wraps(func)
+        def _wrapper(inst):
+            cache = inst._cache  # pylint: disable=protected-access
+            if cache is None:
+                return func(inst)
+            return copy.copy(cache.get(key, lambda: func(inst)))
+
+        return _wrapper
+
+    return _decorator
+
+
+def _iter_namespaces(name):
+    """ Yield the namespaces of a node, from the deepest to the root.
+
+    >>> list(_iter_namespaces("a:b:node"))
+    ['a:b', 'a']
+
+    :param str name: A node name
+    :return: A namespace generator
+    :rtype: Generator[str]
+    """
+    namespace = name.rpartition(":")[0]
+    while namespace:
+        yield namespace
+        namespace = namespace.rpartition(":")[0]
+
+
+class _CacheListener(object):
+    """
+    Maya callbacks shared by all registered caches.
+
+    Global events, like a node being added anywhere in the scene,
+    are dispatched to the caches of the node namespaces only,
+    so their cost don't grow with the number of cached compounds.
+    All caches are released before a new scene is created or opened.
+    """
+
+    def __init__(self):
+        self._caches = {}  # caches by namespace
+        self._namespaces = {}  # namespace by cache, the compound might be renamed
+        self._callback_ids = []
+
+    def add(self, cache):
+        """ Start dispatching events to a cache.
+
+        :param CompoundCache cache: A cache
+        """
+        self.discard(cache)
+        if not self._callback_ids:
+            self._register()
+        self._namespaces[cache] = cache.namespace
+        self._caches.setdefault(cache.namespace, set()).add(cache)
+
+    def discard(self, cache):
+        """ Stop dispatching events to a cache.
+
+        :param CompoundCache cache: A cache
+        """
+        namespace = self._namespaces.pop(cache, None)
+        caches = self._caches.get(namespace, set())
+        caches.discard(cache)
+        if not caches:
+            self._caches.pop(namespace, None)
+        if not self._caches:
+            self._unregister()
+
+    def _register(self):
+        null = OpenMaya.MObject.kNullObj
+        self._callback_ids = [
+            OpenMaya.MDGMessage.addNodeAddedCallback(self._on_node_added_or_removed),
+            OpenMaya.MDGMessage.addNodeRemovedCallback(self._on_node_added_or_removed),
+            OpenMaya.MNodeMessage.addNameChangedCallback(null, self._on_name_changed),
+            OpenMaya.MSceneMessage.addCallback(
+                OpenMaya.MSceneMessage.kBeforeNew, self._on_scene_changed
+            ),
+            OpenMaya.MSceneMessage.addCallback(
+                OpenMaya.MSceneMessage.kBeforeOpen, self._on_scene_changed
+            ),
+        ]
+
+    def _unregister(self):
+        if self._callback_ids:
+            OpenMaya.MMessage.removeCallbacks(self._callback_ids)
+        self._callback_ids = []
+
+    def _iter_caches(self, name):
+        """
+        :param str name: A node name
+        :return: The caches of the compounds containing the node
+        :rtype: Generator[CompoundCache]
+        """
+        for namespace in _iter_namespaces(name):
+            for cache in tuple(self._caches.get(namespace, ())):
+                yield cache
+
+    def _on_node_added_or_removed(self, mobject, *_):
+        for cache in self._iter_caches(OpenMaya.MFnDependencyNode(mobject).name()):
+            # The hubs might have been removed, invalidate everything.
+            cache.invalidate()
+
+    def _on_name_changed(self, mobject, old_name, *_):
+        caches = set(self._iter_caches(old_name))
+        caches.update(self._iter_caches(OpenMaya.MFnDependencyNode(mobject).name()))
+        for cache in caches:
+            cache.invalidate(KEY_NODES)
+
+    def _on_scene_changed(self, *_):
+        for caches in list(self._caches.values()):
+            for cache in list(caches):
+                cache.release()
+
+
+_LISTENER = _CacheListener()
+
+
+class CompoundCache(object):
+    """
+    Store the values of a compound and invalidate them using Maya callbacks:
+    - Nodes are invalidated when a node is added, removed or renamed in the namespace.
+    - Inputs and outputs are invalidated when an hub attribute is added,
+      removed or renamed.
+    - Metadata is invalidated when the input hub notes attribute change.
+    """
+
+    def __init__(self, compound):
+        """
+        :param compound: The compound to cache the values of
+        :type compound: omtk_compound.core.Compound
+        """
+        self._compound = compound
+        self._values = {}
+        self._callback_ids = []
+
+    def __contains__(self, key):
+        return key in self._values
+
+    def get(self, key, func):
+        """ Get a cached value, computing it if needed.
+
+        :param str key: The cache key
+        :param callable func: A function that compute the value
+        :return: The cached value
+        """
+        try:
+            return self._values[key]
+        except KeyError:
+            value = self._values[key] = func()
+            return value
+
+    def invalidate(self, *keys):
+        """ Invalidate cached values.
+
+        :param str keys: The keys to invalidate. If not provided, all keys are.
+        """
+        if not keys:
+            self._values.clear()
+            return
+        for key in keys:
+            self._values.pop(key, None)
+
+    # --- Callbacks management ---
+
+    @property
+    def namespace(self):
+        """
+        :return: The namespace of the cached compound
+        :rtype: str
+        """
+        return self._compound.namespace
+
+    def register(self):
+        """ Register the Maya callbacks that invalidate the cache. """
+        self.unregister()
+        self.invalidate()
+
+        hub_inn = _utils_attr.get_mobject(self._compound.input)
+        hub_out = _utils_attr.get_mobject(self._compound.output)
+        self._callback_ids = [
+            OpenMaya.MNodeMessage.addAttributeAddedOrRemovedCallback(
+                hub_inn, self._on_hub_inn_attribute_added_or_removed
+            ),
+            OpenMaya.MNodeMessage.addAttributeAddedOrRemovedCallback(
+                hub_out, self._on_hub_out_attribute_added_or_removed
+            ),
+            OpenMaya.MNodeMessage.addAttributeChangedCallback(
+                hub_inn, self._on_hub_inn_attribute_changed
+            ),
+            OpenMaya.MNodeMessage.addAttributeChangedCallback(
+                hub_out, self._on_hub_out_attribute_changed
+            ),
+        ]
+        _LISTENER.add(self)
+
+    def unregister(self):
+        """ Remove the Maya callbacks that invalidate the cache. """
+        _LISTENER.discard(self)
+        if self._callback_ids:
+            OpenMaya.MMessage.removeCallbacks(self._callback_ids)
+        self._callback_ids = []
+
+    def release(self):
+        """ Disable the compound cache, ex: when the scene is about to change. """
+        self._compound.disable_cache()
+
+    def _on_hub_inn_attribute_added_or_removed(self, _, plug, *__):
+        self.invalidate(KEY_INPUTS)
+        if plug.partialName(useLongNames=True) == _METADATA_ATTR_NAME:
+            self.invalidate(KEY_METADATA)
+
+    def _on_hub_out_attribute_added_or_removed(self, *_):
+        self.invalidate(KEY_OUTPUTS)
+
+    def _on_hub_inn_attribute_changed(self, msg, plug, *_):
+        if msg & OpenMaya.MNodeMessage.kAttributeRenamed:
+            self.invalidate(KEY_INPUTS)
+        if (
+            msg & OpenMaya.MNodeMessage.kAttributeSet
+            and plug.partialName(useLongNames=True) == _METADATA_ATTR_NAME
+        ):
+            self.invalidate(KEY_METADATA)
+
+    def _on_hub_out_attribute_changed(self, msg, *_):
+        if msg & OpenMaya.MNodeMessage.kAttributeRenamed:
+            self.invalidate(KEY_OUTPUTS)
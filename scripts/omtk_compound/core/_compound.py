@@ -7,11 +7,19 @@ import logging
 import six
 
 from maya import cmds
-import pymel.core as pymel
-
+from maya.api import OpenMaya
+
+from ._cache import (
+    CompoundCache,
+    cached,
+    KEY_INPUTS,
+    KEY_METADATA,
+    KEY_NODES,
+    KEY_OUTPUTS,
+)
 from ._constants import INPUT_NODE_NAME, OUTPUT_NODE_NAME
-from ._parser import remove_root_namespace, write_metadata_to_ma_file
-from . import _utils_attr, _utils_namespace
+from ._parser import write_metadata_to_ma_file
+from . import _optimize, _utils_attr, _utils_namespace, _utils_undo
 
 _LOG = logging.getLogger(__name__)
 
@@ -24,23 +32,42 @@ class CompoundValidationError(CompoundError):
     """Exception raised when a compound object is invalid"""
 
 
+def _get_duplicates_errors(dagpaths):
+    """
+    :param list[str] dagpaths: Attributes to expose
+    :return: An error message for each attribute that would be exposed twice.
+    :rtype: list[str]
+    """
+    known = set()
+    errors = []
+    for dagpath in dagpaths:
+        if dagpath in known:
+            errors.append("Cannot expose an attribute twice: %r" % dagpath)
+        known.add(dagpath)
+    return errors
+
+
 class Compound(object):  # pylint: disable=too-many-public-methods
     """ An instance of a network of Maya nodes that represent encapsulation.
     It share a common namespace and have an input and output networks.
     """
 
-    def __init__(self, namespace):
+    def __init__(self, namespace, validate=True):
         """
         :param str namespace: A namespace
+        :param bool validate: Should we validate the compound?
+                              Only skip it if the namespace is known to be valid.
         :raises CompoundValidationError: If the namespace don't contain a valid compound
         """
         self._inputs = {}
         self._outputs = {}
         self._nodes = set()
+        self._cache = None
         self.dagpath = namespace
         self.namespace = namespace  # alias
 
-        self.validate()
+        if validate:
+            self.validate()
 
     def __str__(self):
         return "<Compound %r>" % self.dagpath
@@ -66,6 +93,32 @@ class Compound(object):  # pylint: disable=too-many-public-methods
         return self.dagpath
 
     @property
+    def cache_enabled(self):
+        """
+        :return: Are the compound nodes, inputs, outputs and metadata cached?
+        :rtype: bool
+        """
+        return self._cache is not None
+
+    def enable_cache(self):
+        """ Cache the compound nodes, inputs, outputs and metadata.
+        The cache is invalidated by Maya callbacks when the compound change.
+        Call `disable_cache` when the compound is not needed anymore
+        to remove the callbacks. The cache is also disabled
+        before a new scene is created or opened.
+        """
+        if self._cache is None:
+            self._cache = CompoundCache(self)
+        self._cache.register()
+
+    def disable_cache(self):
+        """ Stop caching the compound values and remove the associated callbacks. """
+        if self._cache is not None:
+            self._cache.unregister()
+            self._cache = None
+
+    @property
+    @cached(KEY_NODES)
     def nodes(self):
         """
         :return: The dagpath of all the nodes under the compound.
@@ -90,6 +143,7 @@ class Compound(object):  # pylint: disable=too-many-public-methods
         return ":".join((self.namespace, OUTPUT_NODE_NAME))
 
     @property
+    @cached(KEY_INPUTS)
     def inputs(self):
         """
         :return: A list of the compound inputs attributes as dagpath
@@ -100,6 +154,7 @@ class Compound(object):  # pylint: disable=too-many-public-methods
         return [prefix + attr_name for attr_name in attr_names]
 
     @property
+    @cached(KEY_OUTPUTS)
     def outputs(self):
         """
         :return: A list of the compound input attributes as dagpath
@@ -123,6 +178,7 @@ class Compound(object):  # pylint: disable=too-many-public-methods
         if not cmds.objExists(self.output):
             raise CompoundValidationError("%r don't exist." % self.output)
 
+    @cached(KEY_METADATA)
     def get_metadata(self):
         """ A compound can have associated metadata.
         This generally mean an ID, a name and a version, but it's all arbitrary.
@@ -188,21 +244,11 @@ class Compound(object):  # pylint: disable=too-many-public-methods
         # Hold current file
         current_path = cmds.file(q=True, sn=True)
 
-        # Conform to pynode
-        input_ = pymel.PyNode(self.input)
-        output = pymel.PyNode(self.output)
-
-        # todo: optimise this
-        grp_inn_attrs = set(input_.listAttr())
-        grp_inn_attrs.remove(input_.message)
-        grp_out_attrs = set(output.listAttr())
-        grp_out_attrs.remove(output.message)
-
-        with _utils_attr.context_disconnected_attrs(
-            grp_inn_attrs, hold_inputs=True, hold_outputs=False
+        with _utils_attr.context_disconnected_node(
+            self.input, hold_inputs=True, hold_outputs=False
         ):
-            with _utils_attr.context_disconnected_attrs(
-                grp_out_attrs, hold_inputs=False, hold_outputs=True
+            with _utils_attr.context_disconnected_node(
+                self.output, hold_inputs=False, hold_outputs=True
             ):
                 cmds.select(objs)
                 cmds.file(rename=path)
@@ -210,31 +256,55 @@ class Compound(object):  # pylint: disable=too-many-public-methods
 
                 # Hack: Rename current namespace from the file
                 # TODO: Investigate any maya built-in option for that
-                remove_root_namespace(self.namespace, path)
-
-                write_metadata_to_ma_file(path, self.get_metadata())
+                # Both are done in the same pass to only rewrite the file once.
+                write_metadata_to_ma_file(
+                    path, self.get_metadata(), namespace=self.namespace
+                )
 
                 # Fetch current file
                 cmds.file(rename=current_path)
 
     def delete(self):
         """Delete the content of a compound and it's associated namespace(s)."""
+        self.disable_cache()
         cmds.namespace(removeNamespace=self.namespace, deleteNamespaceContent=True)
+        _utils_namespace.get_allocator().discard(self.namespace)
 
-    def optimize(self):
-        """
-        Implement optimisation routines. Call before publishing rig to animation.
+    def get_dead_nodes(self):
+        """ Get the nodes that cannot affect any of the compound outputs.
+        They can be removed with `optimize(passes=["dead_nodes"])`.
 
-        There's multiple things that can be done here, here's some idea:
-        - Remove the inn and out hub.
-        - Remove decomposeMatrix connected to composeMatrix
-        - Remove composeMatrix connected to decomposeMatrix
+        :return: The dead nodes dagpaths
+        :rtype: list[str]
+        """
+        return _optimize.get_dead_nodes(self)
 
-        :raises NotImplementedError: Always
+    def optimize(self, passes=None, dry_run=False):
         """
-        self.explode()
+        Run optimisation routines. Call before publishing rig to animation.
+
+        The default passes:
+        - Remove composeMatrix that rebuild the matrix decomposed by a decomposeMatrix.
+        - Remove the nodes that cannot affect any output.
+        - Remove the inn and out hub. The compound don't exist afterward.
 
-        raise NotImplementedError
+        Other passes need to be requested by name.
+        ex: "constants" bake nodes that have no connected inputs,
+        "compose_decompose" remove decomposeMatrix connected to composeMatrix.
+
+        :param passes: The name of the optimization passes to run, in order.
+                       Default to `omtk_compound.core._optimize.DEFAULT_PASSES`.
+        :type passes: Sequence[str]
+        :param bool dry_run: If True, only report what would be removed.
+        :return: What was removed, or would be removed.
+        :rtype: omtk_compound.core.OptimizationReport
+        :raises ValueError: If a pass is unknown or a final pass is not the last one.
+        """
+        passes = _optimize.DEFAULT_PASSES if passes is None else tuple(passes)
+        if dry_run:
+            return _optimize.run_passes(self, passes, dry_run=True)
+        with _utils_undo.undo_chunk("optimize %s" % self.namespace):
+            return _optimize.run_passes(self, passes)
 
     # --- Interface management ---
 
@@ -281,37 +351,7 @@ class Compound(object):  # pylint: disable=too-many-public-methods
         :return: The dagpath of the exposed attribute
         :raises: ValueError: If the attribute is already a connection destination
         """
-        # TODO: Remove pymel usage
-        attr = pymel.Attribute(dagpath)
-        dagpath = str(attr)
-
-        # TODO: Solidify array element support with appropriate tests
-        attr = attr.array() if attr.isElement() else attr
-        if not cmds.attributeQuery(
-            attr.longName(), node=str(attr.node()), writable=True
-        ):
-            raise ValueError(
-                "Cannot expose un-writable attribute %r as an input." % dagpath
-            )
-
-        if cmds.connectionInfo(dagpath, isDestination=True):
-            raise ValueError("Cannot expose a destination attribute: %r" % dagpath)
-
-        # TODO: Manage name collision
-        src_node = str(attr.node())
-        src_dagpath = _utils_attr.expose_attribute(
-            src_node, self.input, attr.longName()
-        )
-
-        # Our reference attribute might not be "readable"
-        # (a possible connection destination).
-        # TODO: Don't use pymel?
-        mattr = pymel.Attribute(src_dagpath).__apimattr__()
-        mattr.setReadable(True)
-
-        cmds.connectAttr(src_dagpath, dagpath)
-
-        return src_dagpath
+        return self.expose_inputs([dagpath])[0]
 
     def expose_output_attr(self, dagpath):
         """
@@ -321,35 +361,79 @@ class Compound(object):  # pylint: disable=too-many-public-methods
         :return: The dagpath of the exposed attribute
         :raises: ValueError: If the attribute is the source of an existing connection.
         """
-        # TODO: Remove pymel usage
-        attr = pymel.Attribute(dagpath)
-        dagpath = str(attr)
-
-        # TODO: Solidify array element support with appropriate tests
-        attr_to_check = attr.array() if attr.isElement() else attr
-        if not cmds.attributeQuery(
-            attr_to_check.longName(), node=str(attr.node()), readable=True
-        ):
-            raise ValueError(
-                "Cannot expose un-readable attribute %r as an output." % dagpath
-            )
-
-        if cmds.connectionInfo(dagpath, isSource=True):
-            raise ValueError("Cannot expose a source attribute: %r" % dagpath)
-
-        # TODO: Manage name collision
-        src_node = str(attr.node())
-        attr_name = str(attr.longName())
-        dst_dagpath = _utils_attr.expose_attribute(src_node, self.output, attr_name)
-
-        # Our reference attribute might not be "writable"
-        # (a possible connection source)
-        mattr = pymel.Attribute(dst_dagpath).__apimattr__()
-        mattr.setWritable(True)
-
-        cmds.connectAttr(dagpath, dst_dagpath)
-
-        return dst_dagpath
+        return self.expose_outputs([dagpath])[0]
+
+    def expose_inputs(self, dagpaths):
+        """ Expose many attributes as input attributes of the compound at once.
+        Every attribute is validated before anything is changed.
+
+        :param dagpaths: The attributes to expose
+        :type dagpaths: Iterable[str]
+        :return: The dagpath of the exposed attributes, in order.
+        :rtype: list[str]
+        :raises: ValueError: If an attribute is un-writable
+                             or is already a connection destination.
+        """
+        plugs = [_utils_attr.get_plug(str(dagpath)) for dagpath in dagpaths]
+        dagpaths = [_utils_attr.get_plug_name(plug) for plug in plugs]
+
+        errors = []
+        for plug, dagpath in zip(plugs, dagpaths):
+            # TODO: Solidify array element support with appropriate tests
+            root_plug = plug.array() if plug.isElement else plug
+            if not OpenMaya.MFnAttribute(root_plug.attribute()).writable:
+                errors.append(
+                    "Cannot expose un-writable attribute %r as an input." % dagpath
+                )
+            elif plug.isDestination:
+                errors.append("Cannot expose a destination attribute: %r" % dagpath)
+        errors.extend(_get_duplicates_errors(dagpaths))
+        if errors:
+            raise ValueError("\n".join(errors))
+
+        with _utils_undo.undo_chunk("expose inputs %s" % self.namespace):
+            # Our reference attribute might not be "readable"
+            # (a possible connection destination).
+            exposed = _utils_attr.expose_attributes(plugs, self.input, readable=True)
+            _utils_attr.edit_connections(connections=zip(exposed, dagpaths))
+
+        return exposed
+
+    def expose_outputs(self, dagpaths):
+        """ Expose many attributes as output attributes of the compound at once.
+        Every attribute is validated before anything is changed.
+
+        :param dagpaths: The attributes to expose
+        :type dagpaths: Iterable[str]
+        :return: The dagpath of the exposed attributes, in order.
+        :rtype: list[str]
+        :raises: ValueError: If an attribute is un-readable
+                             or is the source of an existing connection.
+        """
+        plugs = [_utils_attr.get_plug(str(dagpath)) for dagpath in dagpaths]
+        dagpaths = [_utils_attr.get_plug_name(plug) for plug in plugs]
+
+        errors = []
+        for plug, dagpath in zip(plugs, dagpaths):
+            # TODO: Solidify array element support with appropriate tests
+            root_plug = plug.array() if plug.isElement else plug
+            if not OpenMaya.MFnAttribute(root_plug.attribute()).readable:
+                errors.append(
+                    "Cannot expose un-readable attribute %r as an output." % dagpath
+                )
+            elif plug.isSource:
+                errors.append("Cannot expose a source attribute: %r" % dagpath)
+        errors.extend(_get_duplicates_errors(dagpaths))
+        if errors:
+            raise ValueError("\n".join(errors))
+
+        with _utils_undo.undo_chunk("expose outputs %s" % self.namespace):
+            # Our reference attribute might not be "writable"
+            # (a possible connection source)
+            exposed = _utils_attr.expose_attributes(plugs, self.output, writable=True)
+            _utils_attr.edit_connections(connections=zip(dagpaths, exposed))
+
+        return exposed
 
     def explode(self, remove_namespace=False):
         """
@@ -358,34 +442,53 @@ class Compound(object):  # pylint: disable=too-many-public-methods
 
         :param bool remove_namespace: Should we remove the compound namespace?
         """
-
-        def _remap_attr(attr_):
-            attr_ = (
-                pymel.Attribute(attr_) if isinstance(attr_, basestring) else None
-            )  # conform
-            attr_src = next(iter(attr_.inputs(plugs=True)), None)
-            if attr_src:
-                pymel.disconnectAttr(attr_src, attr_)
-            for attr_dst in attr_.outputs(plugs=True):
-                pymel.disconnectAttr(attr_, attr_dst)
-                if attr_src:
-                    pymel.connectAttr(attr_src, attr_dst, force=True)
-
-        # Redirection input and outputs connections
-        for attr in self.inputs:
-            _remap_attr(attr)
-        for attr in self.outputs:
-            _remap_attr(attr)
-
-        # Delete input and output nodes
-        cmds.delete(self.input)
-        cmds.delete(self.output)
-
-        # Remove namespace if asked
-        if remove_namespace:
-            cmds.namespace(
-                mergeNamespaceWithParent=True, removeNamespace=self.namespace
+        # Resolve all connections first so they are all remapped at once.
+        sources = {}
+        destinations = {}
+        for plug in map(_utils_attr.get_plug, self.inputs + self.outputs):
+            attr = _utils_attr.get_plug_name(plug)
+            sources[attr] = (
+                _utils_attr.get_plug_name(plug.source()) if plug.isDestination else None
             )
+            destinations[attr] = [
+                _utils_attr.get_plug_name(plug_dst) for plug_dst in plug.destinations()
+            ]
+
+        def _resolve_source(attr_):
+            # An input can be connected directly to an output
+            known = set()
+            while attr_ in sources and attr_ not in known:
+                known.add(attr_)
+                attr_ = sources[attr_]
+            return attr_
+
+        disconnections = set()
+        connections = []
+        for attr, attr_src in six.iteritems(sources):
+            if attr_src:
+                disconnections.add((attr_src, attr))
+            for attr_dst in destinations[attr]:
+                disconnections.add((attr, attr_dst))
+                if attr_dst in sources:
+                    continue
+                attr_origin = _resolve_source(attr)
+                if attr_origin:
+                    connections.append((attr_origin, attr_dst))
+
+        with _utils_undo.undo_chunk("explode %s" % self.namespace):
+            _utils_attr.edit_connections(disconnections, connections, force=True)
+
+            # Delete input and output nodes
+            self.disable_cache()
+            cmds.delete(self.input)
+            cmds.delete(self.output)
+
+            # Remove namespace if asked
+            if remove_namespace:
+                cmds.namespace(
+                    mergeNamespaceWithParent=True, removeNamespace=self.namespace
+                )
+                _utils_namespace.get_allocator().discard(self.namespace)
 
     def get_connections(self):
         """
@@ -393,21 +496,39 @@ class Compound(object):  # pylint: disable=too-many-public-methods
         This help with updating/promoting compound.
         :rtype: tuple(dict, dict)
         """
-        # TODO: Remove pymel usage
-        # TODO: Cleanup
-        def _conform(attr_):
-            return str(attr_)
-
-        map_inn = {}
-        map_out = {}
-        for attr in pymel.PyNode(self.input).listAttr(userDefined=True):
-            if attr.isDestination():
-                map_inn[_conform(attr)] = map(_conform, attr.inputs(plugs=True))
-        for attr in pymel.PyNode(self.output).listAttr(userDefined=True):
-            if attr.isSource():
-                map_out[_conform(attr)] = map(_conform, attr.outputs(plugs=True))
+        map_inn = self._get_hub_connections(self.input, self.inputs, inputs=True)
+        map_out = self._get_hub_connections(self.output, self.outputs, inputs=False)
         return map_inn, map_out
 
+    @staticmethod
+    def _get_hub_connections(hub, attrs, inputs=True):
+        """ Query the connections of an hub user-defined attributes at once.
+
+        :param str hub: The hub node
+        :param attrs: The hub user-defined attributes
+        :type attrs: list[str]
+        :param bool inputs: Should we return the input or output connections?
+        :return: The connected attributes, by hub attribute.
+                 Multi attributes are keyed by element. ex: `inputs.attr[0]`
+        :rtype: dict[str, list[str]]
+        """
+        attrs = set(attrs)
+        connections = (
+            cmds.listConnections(
+                hub,
+                source=inputs,
+                destination=not inputs,
+                connections=True,
+                plugs=True,
+            )
+            or []
+        )
+        result = {}
+        for attr, attr_other in zip(connections[::2], connections[1::2]):
+            if attr.split("[", 1)[0] in attrs:
+                result.setdefault(attr, []).append(attr_other)
+        return result
+
     def hold_connections(self):
         """
         Disconnect the compound input and output connections.
@@ -415,17 +536,10 @@ class Compound(object):  # pylint: disable=too-many-public-methods
         :return: The disconnected inputs and outputs connections.
         :rtype: tuple(dict, dict)
         """
-        # TODO: Remove pymel usage
         map_inn, map_out = self.get_connections()
-
-        for attr_dst, attr_srcs in map_inn.iteritems():
-            for attr_src in attr_srcs:
-                cmds.disconnectAttr(attr_src, attr_dst)
-
-        for attr_src, attr_dsts in map_out.iteritems():
-            for attr_dst in attr_dsts:
-                cmds.disconnectAttr(attr_src, attr_dst)
-
+        _utils_attr.edit_connections(
+            disconnections=self._iter_connections(map_inn, map_out)
+        )
         return map_inn, map_out
 
     @staticmethod
@@ -438,13 +552,27 @@ class Compound(object):  # pylint: disable=too-many-public-methods
         :param map_out: Output connections to create
         :type map_out: dict[str, str]
         """
-        for attr_dst, attr_srcs in map_inn.iteritems():
+        _utils_attr.edit_connections(
+            connections=Compound._iter_connections(map_inn, map_out)
+        )
+
+    @staticmethod
+    def _iter_connections(map_inn, map_out):
+        """
+        :param map_inn: Input connections
+        :type map_inn: dict[str, list[str]]
+        :param map_out: Output connections
+        :type map_out: dict[str, list[str]]
+        :return: A generator that yield source and destination attributes
+        :rtype: Generator[tuple[str, str]]
+        """
+        for attr_dst, attr_srcs in six.iteritems(map_inn):
             for attr_src in attr_srcs:
-                cmds.connectAttr(attr_src, attr_dst)
+                yield attr_src, attr_dst
 
-        for attr_src, attr_dsts in map_out.iteritems():
+        for attr_src, attr_dsts in six.iteritems(map_out):
             for attr_dst in attr_dsts:
-                cmds.connectAttr(attr_src, attr_dst)
+                yield attr_src, attr_dst
 
     def rename(self, namespace):
         """
@@ -452,13 +580,17 @@ class Compound(object):  # pylint: disable=too-many-public-methods
 
         :param str namespace: The new namespace to use
         """
-        # TODO: Rename sub compounds?
+        # Nested namespaces, and any compound they hold, are moved along.
         old_namespace = self.namespace
         new_namespace = _utils_namespace.get_unique_namespace(namespace)
         cmds.namespace(addNamespace=new_namespace)
         cmds.namespace(moveNamespace=(self.namespace, new_namespace))
         cmds.namespace(removeNamespace=old_namespace)
+        _utils_namespace.get_allocator().discard(old_namespace)
         self.namespace = new_namespace
+        if self._cache is not None:
+            # Listen to the events of the new namespace, this also invalidate the cache.
+            self._cache.register()
 
     def generate_docstring(self):
         """
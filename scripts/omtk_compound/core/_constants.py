@@ -12,3 +12,9 @@ COMPOUND_DEFAULT_NAMESPACE = "compound1"
 
 # Prefix used when saving metadata in a maya file
 FILE_METADATA_PREFIX = "omtk.compound."
+
+# Name of the file, at the root of the compound location, that index known compounds.
+REGISTRY_INDEX_FILE_NAME = ".omtk_compound_index.json"
+
+# Prefix of the namespaces holding the compound templates used for instantiation.
+TEMPLATE_NAMESPACE_PREFIX = "omtkCompoundTemplate"
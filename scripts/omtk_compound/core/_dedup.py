@@ -0,0 +1,233 @@
+"""
+Merge identical nodes across compound instances.
+
+When the same compound is instantiated many times on the same driver,
+each instance compute the same values. Nodes of pure types
+with the same type, the same attribute values and the same sources
+are merged so only one of them is evaluated.
+"""
+import collections
+import logging
+
+from maya import cmds
+
+from . import _utils, _utils_attr, _utils_undo
+from ._factory import from_scene
+from ._optimize import (
+    PURE_NODE_TYPES,
+    OptimizationReport,
+    count_connections,
+    get_connected_handles,
+)
+
+_LOG = logging.getLogger(__name__)
+
+
+def _freeze(value):
+    """ Convert an attribute value to something hashable.
+
+    >>> _freeze([(1.0, 2.0, 3.0)])
+    ((1.0, 2.0, 3.0),)
+
+    :param object value: An attribute value as returned by getAttr
+    :return: An hashable value
+    :rtype: object
+    """
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _get_values(node, ignored):
+    """ Get the value of all the settable attributes of a node.
+
+    :param str node: A node
+    :param ignored: Attributes to ignore, ex: the connected ones
+    :type ignored: Container[str]
+    :return: Attribute names and values
+    :rtype: tuple[tuple[str, object]]
+    """
+    result = []
+    for attr in cmds.listAttr(node, settable=True, multi=True) or ():
+        if attr in ignored:
+            continue
+        try:
+            value = cmds.getAttr("%s.%s" % (node, attr))
+        except (RuntimeError, ValueError):  # ex: message attributes
+            continue
+        result.append((attr, _freeze(value)))
+    return tuple(result)
+
+
+def _get_sources(nodes):
+    """ Get the input connections of nodes.
+
+    :param nodes: The nodes to inspect
+    :type nodes: Iterable[str]
+    :return: The destination attribute and source attribute dagpath
+             of each input connection by node.
+    :rtype: dict[str, list[tuple[str, str]]]
+    """
+    result = {}
+    for node in nodes:
+        connections = (
+            cmds.listConnections(
+                node,
+                source=True,
+                destination=False,
+                connections=True,
+                plugs=True,
+                skipConversionNodes=False,
+            )
+            or []
+        )
+        result[node] = [
+            (attr_dst.split(".", 1)[1], attr_src)
+            for attr_dst, attr_src in _utils.pairwise(connections)
+        ]
+    return result
+
+
+def _sort_topologically(sources):
+    """ Sort nodes so each node come after the nodes it depends on.
+    Nodes that are part of a cycle are ignored.
+
+    :param sources: The input connections of each node
+    :type sources: dict[str, list[tuple[str, str]]]
+    :return: The sorted nodes
+    :rtype: list[str]
+    """
+    dependencies = {
+        node: {attr_src.split(".", 1)[0] for _, attr_src in connections} & set(sources)
+        for node, connections in sources.items()
+    }
+    dependents = collections.defaultdict(list)
+    for node, nodes_src in dependencies.items():
+        for node_src in nodes_src:
+            dependents[node_src].append(node)
+
+    queue = collections.deque(
+        sorted(node for node, nodes_src in dependencies.items() if not nodes_src)
+    )
+    result = []
+    while queue:
+        node = queue.popleft()
+        result.append(node)
+        for dependent in dependents[node]:
+            dependencies[dependent].discard(node)
+            if not dependencies[dependent]:
+                queue.append(dependent)
+    return result
+
+
+def _resolve_hub_source(attr, hubs):
+    """ Resolve what feed an input hub attribute from outside the compound.
+    Instances on the same driver are fed by different hubs but the same sources.
+
+    :param str attr: A source attribute dagpath
+    :param hubs: The input hubs
+    :type hubs: Container[str]
+    :return: The first source that is not an input hub attribute
+             or the last hub attribute if it is not connected.
+    :rtype: str
+    """
+    while attr.split(".", 1)[0] in hubs:
+        sources = cmds.listConnections(
+            attr,
+            source=True,
+            destination=False,
+            plugs=True,
+            skipConversionNodes=False,
+        )
+        if not sources:
+            break
+        attr = sources[0]
+    return attr
+
+
+def get_duplicates(compounds=None):
+    """ Find the nodes that compute the same thing as another node.
+
+    :param compounds: The compounds to inspect. Default to all compounds in the scene.
+    :type compounds: Iterable[omtk_compound.core.Compound]
+    :return: The node that will replace each duplicated node
+    :rtype: collections.OrderedDict[str, str]
+    """
+    if compounds is None:
+        compounds = from_scene()
+
+    nodes = []
+    hubs = set()
+    for compound in compounds:
+        nodes.extend(cmds.ls(compound.nodes, type=sorted(PURE_NODE_TYPES)))
+        hubs.add(compound.input)
+    sources = _get_sources(nodes)
+
+    replacements = {}
+    signatures = {}
+    result = collections.OrderedDict()
+    for node in _sort_topologically(sources):
+        inputs = []
+        for attr_dst, attr_src in sources[node]:
+            attr_src = _resolve_hub_source(attr_src, hubs)
+            node_src, attr_src = attr_src.split(".", 1)
+            inputs.append((attr_dst, replacements.get(node_src, node_src), attr_src))
+        inputs.sort()
+        ignored = {attr_dst for attr_dst, _, _ in inputs}
+        signature = (cmds.nodeType(node), tuple(inputs), _get_values(node, ignored))
+
+        replacement = signatures.setdefault(signature, node)
+        replacements[node] = replacement
+        if replacement != node:
+            result[node] = replacement
+    return result
+
+
+def merge_duplicates(compounds=None, dry_run=False):
+    """ Merge the nodes that compute the same thing across compounds.
+
+    The consumers of a duplicated node are connected to the node that replace it
+    and the duplicated node is deleted. Note that this create connections
+    between compounds that don't go through their hubs.
+
+    :param compounds: The compounds to inspect. Default to all compounds in the scene.
+    :type compounds: Iterable[omtk_compound.core.Compound]
+    :param bool dry_run: If True, only report the nodes that would be removed.
+    :return: What was removed, or would be removed.
+    :rtype: omtk_compound.core.OptimizationReport
+    """
+    duplicates = get_duplicates(compounds)
+    report = OptimizationReport(dry_run=dry_run)
+    report.nodes["duplicates"] = list(duplicates)
+    if dry_run:
+        return report
+
+    handles = get_connected_handles(duplicates)
+    count_before = count_connections(handles)
+
+    connections = []
+    for node, replacement in duplicates.items():
+        for attr_src, attr_dst in _utils.pairwise(
+            cmds.listConnections(
+                node,
+                source=False,
+                destination=True,
+                connections=True,
+                plugs=True,
+                skipConversionNodes=False,
+            )
+            or []
+        ):
+            if attr_dst.split(".", 1)[0] in duplicates:
+                continue
+            attr_src = "%s.%s" % (replacement, attr_src.split(".", 1)[1])
+            connections.append((attr_src, attr_dst))
+
+    with _utils_undo.undo_chunk("merge duplicates"):
+        _utils_attr.edit_connections(connections=connections, force=True)
+        if duplicates:
+            cmds.delete(list(duplicates))
+
+    report.connections_removed = count_before - count_connections(handles)
+    _LOG.info("%s", report)
+    return report
@@ -11,6 +11,23 @@ _LOG = logging.getLogger(__name__)
 
 _MANDATORY_FIELDS = {"uid", "name", "version"}
 
+# Cache of parsed versions. There's generally few distinct version strings.
+_PARSED_VERSIONS = {}
+
+
+def parse_version(value):
+    """ Parse a version string. Results are cached as parsing is costly.
+
+    :param str value: A version string, ex: "1.0.0"
+    :return: A comparable version object
+    :rtype: omtk_compound.vendor.packaging.version._BaseVersion
+    """
+    try:
+        return _PARSED_VERSIONS[value]
+    except KeyError:
+        result = _PARSED_VERSIONS[value] = version.parse(value)
+        return result
+
 
 def _validate(mapping):
     """ Ensure all mandatory keys in a definition mapping are defined.
@@ -60,13 +77,13 @@ class CompoundDefinition(dict):
     def __gt__(self, other):
         return self.name > other.name or (
             self.name == other.name
-            and version.parse(self.version) > version.parse(other.version)
+            and parse_version(self.version) > parse_version(other.version)
         )
 
     def __lt__(self, other):
         return self.name < other.name or (
             self.name == other.name
-            and version.parse(self.version) < version.parse(other.version)
+            and parse_version(self.version) < parse_version(other.version)
         )
 
     def __ge__(self, other):
@@ -137,10 +154,21 @@ class CompoundDefinition(dict):
         :rtype omtk_compound.compound.CompoundDefinition
         """
         metadata = get_metadata_from_file(path)
-        metadata["path"] = path
+        return cls.from_metadata(metadata, path)
+
+    @classmethod
+    def from_metadata(cls, metadata, path):
+        """ Initialize a compound definition from already parsed file metadata.
+
+        :param dict metadata: The metadata found in the file header
+        :param str path: The path of the file the metadata come from
+        :return: A new compound definition instance
+        :rtype omtk_compound.compound.CompoundDefinition
+        :raises ValueError: If some mandatory fields are missing.
+        """
+        metadata = dict(metadata, path=path)
         _validate(metadata)
-        inst = cls(**metadata)
-        return inst
+        return cls(**metadata)
 
     def write_metadata_to_file(self, path):
         """ Write the definition to a maya ascii (.ma) file.
@@ -3,17 +3,18 @@ Factory providing compound instances.
 """
 import logging
 
-import pymel.core as pymel
 from maya import cmds
+from maya.api import OpenMaya
 
-from ._compound import Compound, CompoundValidationError
+from ._compound import Compound
 from ._constants import (
     INPUT_NODE_NAME,
     OUTPUT_NODE_NAME,
     COMPOUND_DEFAULT_NAMESPACE,
 )
+from ._template import is_template_namespace
 from ._utils import pairwise
-from . import _utils_namespace
+from . import _utils_attr, _utils_dg, _utils_namespace, _utils_undo
 
 _LOG = logging.getLogger(__name__)
 
@@ -56,37 +57,131 @@ def create_from_nodes(objs, namespace=COMPOUND_DEFAULT_NAMESPACE, expose=False):
     :return: A compound object
     :rtype: Compound
     """
-    # Conform objs to pynodes
-    objs = [pymel.PyNode(obj) for obj in objs]
+    # Conform objs to MObject, they stay valid when the nodes are renamed.
+    mobjs = [_utils_attr.get_mobject(str(obj)) for obj in objs]
+    names = [OpenMaya.MFnDependencyNode(mobj).name() for mobj in mobjs]
 
-    common_namespace = _utils_namespace.get_common_namespace(objs)
+    common_namespace = _utils_namespace.get_common_namespace(names)
     if common_namespace:
         namespace = "{0}:{1}".format(common_namespace, namespace)
 
     namespace = _utils_namespace.get_unique_namespace(namespace)
-    cmds.namespace(add=namespace)
 
-    # TODO: Ensure namespaces are always absolute,
-    #  we don't want the current namespace to play any role here.
     # TODO: Error out if we are breaking a compound by splitting it in two?
-    for obj in objs:
-        new_name = _utils_namespace.join_namespace(
-            namespace, _utils_namespace.relative_namespace(str(obj), common_namespace)
+    with _utils_undo.undo_chunk("create compound %s" % namespace):
+        cmds.namespace(add=":" + namespace)
+        _relocate_nodes(mobjs, names, namespace, common_namespace)
+        inst = _create(namespace)
+
+        if expose:
+            objs = [_utils_attr.get_node_name(mobj) for mobj in mobjs]
+            inputs, outputs = _get_attributes_map_from_nodes(objs)
+            _expose_attributes(inst, inputs, outputs)
+
+    return Compound(namespace)
+
+
+def _iter_parent_namespaces(namespace):
+    """ Yield a namespace and all it's parents, from the deepest to the shallowest.
+
+    >>> list(_iter_parent_namespaces("a:b:c"))
+    ['a:b:c', 'a:b', 'a']
+
+    :param str namespace: A namespace
+    :return: A namespace generator
+    :rtype: Generator[str]
+    """
+    while namespace:
+        yield namespace
+        namespace = _utils_namespace.get_parent(namespace)
+
+
+def _get_node_namespace(name):
+    """
+    :param str name: A node name
+    :return: The node namespace, empty if the node has no namespace.
+    :rtype: str
+    """
+    return name.rsplit(":", 1)[0] if ":" in name else ""
+
+
+def _get_moving_namespaces(names, common_namespace):
+    """ Find the namespaces that can be moved as a whole
+    because all of their content is part of the nodes to move.
+
+    :param list[str] names: The name of the nodes to move
+    :param str common_namespace: The namespace shared by all the nodes
+    :return: The namespaces to move, none of them is the child of another.
+    :rtype: list[str]
+    """
+    names_set = set(names)
+    candidates = set()
+    for name in names:
+        for namespace in _iter_parent_namespaces(_get_node_namespace(name)):
+            if namespace == common_namespace:
+                break
+            candidates.add(namespace)
+
+    result = []
+    for namespace in sorted(candidates, key=lambda ns: ns.count(":")):
+        if any(_utils_namespace.is_child_of(namespace, parent) for parent in result):
+            continue
+        content = cmds.namespaceInfo(
+            ":" + namespace, listOnlyDependencyNodes=True, recurse=True
         )
+        if names_set.issuperset(node.lstrip(":") for node in content or []):
+            result.append(namespace)
+    return result
 
-        node_namespace = _utils_namespace.get_namespace(new_name)
-        if node_namespace and not cmds.namespace(exists=node_namespace):
-            cmds.namespace(add=node_namespace)
 
-        obj.rename(new_name)
+def _relocate_nodes(mobjs, names, namespace, common_namespace):
+    """ Move nodes inside a namespace, preserving their namespace
+    relative to the namespace they have in common.
 
-    inst = _create(namespace)
+    Namespaces whose content is entirely moved are moved with a single command.
+    The missing namespaces are then created, parents first,
+    and the other nodes are renamed by a single modifier.
 
-    if expose:
-        inputs, outputs = _get_attributes_map_from_nodes(objs)
-        _expose_attributes(inst, inputs, outputs)
+    :param mobjs: The nodes to move
+    :type mobjs: list[maya.api.OpenMaya.MObject]
+    :param list[str] names: The current name of each node
+    :param str namespace: The namespace to move the nodes in. It must exist.
+    :param str common_namespace: The namespace shared by all the nodes
+    """
 
-    return Compound(namespace)
+    def _get_target(name):
+        return _utils_namespace.join_namespace(
+            namespace, _utils_namespace.relative_namespace(name, common_namespace)
+        )
+
+    moving_namespaces = _get_moving_namespaces(names, common_namespace)
+    renames = [
+        (mobj, _get_target(name))
+        for mobj, name in zip(mobjs, names)
+        if not any(
+            _get_node_namespace(name) == moving
+            or _utils_namespace.is_child_of(_get_node_namespace(name), moving)
+            for moving in moving_namespaces
+        )
+    ]
+
+    # Resolve the target namespace tree once and create what is missing.
+    targets = {_get_target(moving) for moving in moving_namespaces}
+    targets.update(_get_node_namespace(new_name) for _, new_name in renames)
+    tree = {parent for target in targets for parent in _iter_parent_namespaces(target)}
+    for target in sorted(tree, key=lambda ns: ns.count(":")):
+        if not cmds.namespace(exists=":" + target):
+            cmds.namespace(add=":" + target)
+
+    for moving in moving_namespaces:
+        _LOG.debug("Moving namespace %r content to %r", moving, _get_target(moving))
+        cmds.namespace(moveNamespace=(":" + moving, ":" + _get_target(moving)))
+
+    if renames:
+        modifier = OpenMaya.MDGModifier()
+        for mobj, new_name in renames:
+            modifier.renameNode(mobj, new_name)
+        _utils_undo.commit(modifier)
 
 
 def from_namespace(namespace):
@@ -115,13 +210,8 @@ def from_scene():
     :return: A compound generator
     :rtype: Generator[omtk_compound.Compound]
     """
-    cmds.namespace(setNamespace=":")
-    namespaces = cmds.namespaceInfo(listOnlyNamespaces=True, recurse=True)
-    for namespace in namespaces:
-        try:
-            yield Compound(namespace)
-        except CompoundValidationError:
-            pass
+    for namespace in _iter_compound_namespaces():
+        yield Compound(namespace, validate=False)
 
 
 def from_attributes(
@@ -133,26 +223,34 @@ def from_attributes(
 
     :param attrs_inn:
     :type attrs_inn: list(str)
-    :param List[pymel.Attribute] attrs_out:
+    :param attrs_out:
     :type attrs_out: list(str)
-    :param List[pymel.PyNode] dagnodes:
+    :param List[str] dagnodes:
     :param str namespace:
     :return: A compound
     :rtype: Compound
     """
-    # TODO: Remove pymel usage
-    # Conform dagnodes to set
-    dagnodes = set(pymel.PyNode(dagnode) for dagnode in dagnodes) if dagnodes else set()
+    # Conform dagnodes to a set of unique names
+    dagnodes = (
+        set(cmds.ls([str(dagnode) for dagnode in dagnodes])) if dagnodes else set()
+    )
 
-    # Conform inputs and outputs to pymel
-    attrs_inn = [pymel.Attribute(attr) for attr in attrs_inn]
-    attrs_out = [pymel.Attribute(attr) for attr in attrs_out]
+    # Conform inputs and outputs to MPlug, they stay valid when the nodes are renamed.
+    plugs_inn = [_utils_attr.get_plug(str(attr)) for attr in attrs_inn]
+    plugs_out = [_utils_attr.get_plug(str(attr)) for attr in attrs_out]
 
-    additional_dagnodes = _get_nodes_from_attributes(attrs_inn, attrs_out)
+    additional_dagnodes = _get_nodes_from_attributes(
+        [_utils_attr.get_plug_name(plug) for plug in plugs_inn],
+        [_utils_attr.get_plug_name(plug) for plug in plugs_out],
+    )
     dagnodes.update(additional_dagnodes)
 
     inst = create_from_nodes(dagnodes, namespace=namespace, expose=False)
-    _expose_attributes(inst, attrs_inn, attrs_out)
+    _expose_attributes(
+        inst,
+        [_utils_attr.get_plug_name(plug) for plug in plugs_inn],
+        [_utils_attr.get_plug_name(plug) for plug in plugs_out],
+    )
 
     return inst
 
@@ -172,6 +270,34 @@ def from_file(path, namespace=COMPOUND_DEFAULT_NAMESPACE):
     return from_namespace(namespace)
 
 
+def _iter_compound_namespaces():
+    """
+    Find the namespaces containing both an input and an output node.
+    All nodes are queried at once instead of validating every namespace.
+
+    :return: A generator that yield namespaces
+    :rtype: Generator[str]
+    """
+    suffix_inn = ":" + INPUT_NODE_NAME
+    suffix_out = ":" + OUTPUT_NODE_NAME
+    namespaces_inn = {
+        node[: -len(suffix_inn)]
+        for node in cmds.ls("*" + suffix_inn, recursive=True) or []
+        if node.endswith(suffix_inn)
+    }
+    namespaces_out = {
+        node[: -len(suffix_out)]
+        for node in cmds.ls("*" + suffix_out, recursive=True) or []
+        if node.endswith(suffix_out)
+    }
+    # Parent namespaces are sorted before their children.
+    return (
+        namespace
+        for namespace in sorted(namespaces_inn & namespaces_out)
+        if not is_template_namespace(namespace)
+    )
+
+
 def _create(namespace):
     """
     Create a new compound from a provided namespace.
@@ -211,25 +337,47 @@ def _expose_attributes(inst, inputs, outputs):
     # we'll want to re-use the already existing destination.
     known_network_inputs = set()
 
-    for dst_attr in inputs:
-        src_attrs = _hold_input_attributes(dst_attr)
+    # Resolve and break all connections first so they are all edited at once.
+    held_inputs = [
+        (attr, cmds.listConnections(attr, destination=False, plugs=True) or [])
+        for attr in inputs
+    ]
+    held_outputs = [
+        (attr, cmds.listConnections(attr, source=False, plugs=True) or [])
+        for attr in outputs
+    ]
+    _utils_attr.edit_connections(
+        disconnections=[
+            (src_attr, dst_attr)
+            for dst_attr, src_attrs in held_inputs
+            for src_attr in src_attrs
+        ]
+        + [
+            (src_attr, dst_attr)
+            for src_attr, dst_attrs in held_outputs
+            for dst_attr in dst_attrs
+        ]
+    )
 
-        # Any source attribute we already encountered
-        # will re-use the previously exposed destination attribute.
+    # Any source attribute we already encountered
+    # will re-use the previously exposed destination attribute.
+    exposed_inputs = []
+    exposed_sources = []
+    for dst_attr, src_attrs in held_inputs:
         for src_attr in src_attrs:
             if src_attr in known_network_inputs:
                 continue
-
-            exposed_dst_attr = inst.expose_input_attr(dst_attr)
             known_network_inputs.add(src_attr)
-            cmds.connectAttr(src_attr, exposed_dst_attr)
+            exposed_inputs.append(dst_attr)
+            exposed_sources.append(src_attr)
+
+    connections = list(zip(exposed_sources, inst.expose_inputs(exposed_inputs)))
 
-    for src_attr in outputs:
-        dst_attributes = _hold_output_attributes(src_attr)
+    exposed_outputs = inst.expose_outputs(outputs)
+    for exposed_src_attr, (_, dst_attrs) in zip(exposed_outputs, held_outputs):
+        connections.extend((exposed_src_attr, dst_attr) for dst_attr in dst_attrs)
 
-        exposed_src_attr = inst.expose_output_attr(src_attr)
-        for dst_attr in dst_attributes:
-            cmds.connectAttr(exposed_src_attr, dst_attr)
+    _utils_attr.edit_connections(connections=connections)
 
 
 def _get_nodes_from_attributes(inputs, outputs):
@@ -239,18 +387,60 @@ def _get_nodes_from_attributes(inputs, outputs):
 
     :param list[str] inputs: A list of input attributes.
     :param list[str] outputs: A list of output attributes.
+    :return: The nodes between the inputs and the outputs, including their own nodes.
+    :rtype: set[str]
+    """
+    mobjects = _utils_dg.get_enclosed_nodes(
+        [_utils_attr.get_plug(attr).node() for attr in inputs],
+        [_utils_attr.get_plug(attr).node() for attr in outputs],
+    )
+    return {_utils_attr.get_node_name(mobject) for mobject in mobjects}
+
+
+def _split_plug(dagpath):
+    """ Split an attribute dagpath, as returned by cmds.listConnections.
+
+    >>> _split_plug("ns:node.attr[0].child")
+    ('ns:node', 'child')
+
+    :param str dagpath: An attribute dagpath
+    :return: The node name and the attribute name, without any parent or index.
+    :rtype: tuple[str, str]
     """
-    # Conform to pymel
-    inputs = [pymel.Attribute(attr) for attr in inputs]
-    outputs = [pymel.Attribute(attr) for attr in outputs]
+    node, attr = dagpath.split(".", 1)
+    return node, attr.rsplit(".", 1)[-1].split("[", 1)[0]
 
-    hist_inn = set()
-    hist_out = set()
-    for attr_inn in inputs:
-        hist_inn.update(attr_inn.listHistory(future=True))
-    for attr_out in outputs:
-        hist_out.update(attr_out.listHistory(future=False))
-    return hist_inn & hist_out
+
+def _get_message_attributes(dagpaths):
+    """ Find which attributes are message attributes.
+    The type of an attribute is only queried once per node type.
+
+    :param dagpaths: Attribute dagpaths
+    :type dagpaths: Collection[str]
+    :return: The dagpaths of the message attributes
+    :rtype: set[str]
+    """
+    if not dagpaths:
+        return set()
+
+    entries = [_split_plug(dagpath) for dagpath in dagpaths]
+    node_types = dict(
+        pairwise(cmds.ls(list({node for node, _ in entries}), showType=True) or [])
+    )
+
+    attr_types = {}
+    result = set()
+    for dagpath, (node, attr) in zip(dagpaths, entries):
+        key = (node_types.get(node) or cmds.nodeType(node), attr)
+        try:
+            attr_type = attr_types[key]
+        except KeyError:
+            attr_type = attr_types[key] = cmds.attributeQuery(
+                attr, node=node, attributeType=True
+            )
+        if attr_type == "message":
+            result.add(dagpath)
+    return result
 
 
 def _get_attributes_map_from_nodes(nodes):
@@ -259,16 +449,14 @@ def _get_attributes_map_from_nodes(nodes):
 
     :param list[str] nodes: A list of nodes
     :return: The inputs attributes and output attributes
-    :rtype: tuple[list[str], list[str]]
+    :rtype: tuple[set[str], set[str]]
     """
     # TODO: Ignore attributes that point back to the network.
+    if not nodes:
+        return set(), set()
 
-    # For now we don't want to deal with name mismatch so we'll again use pymel.
-    nodes_pm = {pymel.PyNode(node) for node in nodes}
-
-    # Create an attribute map of the attributes we need to expose.
-    inputs = set()
-    outputs = set()
+    # Conform to the shortest unique names, as returned by cmds.listConnections.
+    nodes_set = set(cmds.ls(nodes))
 
     input_connections = (
         cmds.listConnections(
@@ -283,51 +471,22 @@ def _get_attributes_map_from_nodes(nodes):
         or []
     )
 
-    for dst, src in pairwise(input_connections):
-        # Ignore message connection
-        attr = pymel.Attribute(src)
-        if attr.type() == "message":
-            continue
-        if attr.node() in nodes_pm:
-            continue
-        inputs.add(dst)
-
-    for src, dst in pairwise(output_connections):
-        attr = pymel.Attribute(dst)
-        if attr.type() == "message":
-            continue
-        if attr.node() in nodes_pm:
-            continue
-        outputs.add(src)
-
+    # Keep connections to nodes outside the network, only comparing names.
+    external_inputs = [
+        (dst, src)
+        for dst, src in pairwise(input_connections)
+        if src.split(".", 1)[0] not in nodes_set
+    ]
+    external_outputs = [
+        (src, dst)
+        for src, dst in pairwise(output_connections)
+        if dst.split(".", 1)[0] not in nodes_set
+    ]
+
+    # Ignore message connections
+    messages = _get_message_attributes(
+        [src for _, src in external_inputs] + [dst for _, dst in external_outputs]
+    )
+    inputs = {dst for dst, src in external_inputs if src not in messages}
+    outputs = {src for src, dst in external_outputs if dst not in messages}
     return inputs, outputs
-
-
-def _hold_input_attributes(attr):
-    """
-    Find all connections to a provided attribute, remove them,
-    and return the source attributes.
-
-    :param str attr: A destination attribute
-    :return: A list of source attribute
-    :rtype: list[str]
-    """
-    inputs = cmds.listConnections(attr, destination=False, plugs=True) or []
-    for input_ in inputs:
-        cmds.disconnectAttr(input_, attr)
-    return inputs
-
-
-def _hold_output_attributes(attr):
-    """
-    Find all connections from a provided attribute, remote them,
-    and return the destination attributes.
-
-    :param str attr: A source attribute
-    :return: A list of destination attribute
-    :rtype: list[str]
-    """
-    outputs = cmds.listConnections(attr, source=False, plugs=True) or []
-    for output in outputs:
-        cmds.disconnectAttr(attr, output)
-    return outputs
@@ -0,0 +1,367 @@
+"""
+Maya-free reader for the dependency graph stored in a Maya ASCII (.ma) file.
+
+Only the subset of MEL written by :meth:`omtk_compound.Compound.export` is supported:
+`createNode`, `addAttr`, `setAttr`, `connectAttr`, `rename -uid`,
+`select -ne`, `requires` and `fileInfo`. Any other statement is ignored.
+"""
+import array
+import collections
+import re
+
+from ._constants import INPUT_NODE_NAME, OUTPUT_NODE_NAME
+
+# Match a double quoted string (with escaped characters) or any other word.
+_REGEX_TOKEN = re.compile(r'"(?:[^"\\]|\\.)*"|[^\s]+')
+
+_STATEMENTS = frozenset(
+    ("createNode", "addAttr", "setAttr", "connectAttr", "rename", "select")
+)
+
+MaAttribute = collections.namedtuple(
+    "MaAttribute", ("long_name", "short_name", "type", "parent")
+)
+
+
+def _unquote(token):
+    """ Remove the quotes around a MEL string token.
+
+    >>> _unquote('"foo"')
+    'foo'
+    >>> _unquote('foo')
+    'foo'
+
+    :param str token: A MEL token
+    :return: The token value
+    :rtype: str
+    """
+    if len(token) > 1 and token[0] == token[-1] == '"':
+        return token[1:-1].replace('\\"', '"')
+    return token
+
+
+def _get_flag(tokens, *flags):
+    """ Get the value associated with a MEL flag.
+
+    >>> _get_flag(['-ln', '"foo"'], '-ln', '-longName')
+    'foo'
+
+    :param tokens: A sequence of MEL tokens
+    :param str flags: The flag short and long names
+    :return: The unquoted flag value or None if the flag is not present.
+    :rtype: str or None
+    """
+    for idx, token in enumerate(tokens[:-1]):
+        if token in flags:
+            return _unquote(tokens[idx + 1])
+    return None
+
+
+def iter_ma_statements(stream):
+    """ Iterate through the MEL statements of a Maya ASCII file.
+
+    :param stream: A file object opened in text mode.
+    :return: A generator that yield the tokens of each statement
+    :rtype: Generator[list[str]]
+    """
+    lines = []
+    for line in stream:
+        line = line.strip()
+        if not lines and (not line or line.startswith("//")):
+            continue
+        lines.append(line)
+        if not line.endswith(";"):
+            continue
+        statement = " ".join(lines)[:-1]
+        lines = []
+        yield _REGEX_TOKEN.findall(statement)
+
+
+class MaGraph(object):  # pylint: disable=too-many-instance-attributes
+    """
+    Compact in-memory model of the dependency graph stored in a Maya ASCII file.
+
+    Strings are interned in a table and connections are stored
+    in arrays of indices to keep the memory footprint low.
+    """
+
+    def __init__(self):
+        self._strings = []
+        self._string_ids = {}
+        self._node_ids = {}
+
+        self.file_info = collections.OrderedDict()
+        self.requires = []
+
+        # Nodes data, by node index
+        self._node_names = []
+        self._node_types = []  # None for nodes not created by the file
+        self._node_uids = []
+        self._node_parents = []
+        self._node_attributes = []
+        self._node_values = []
+
+        # Connections data, by connection index
+        self._src_nodes = array.array("l")
+        self._src_attrs = array.array("l")
+        self._dst_nodes = array.array("l")
+        self._dst_attrs = array.array("l")
+
+    def __len__(self):
+        """ The number of nodes created by the file. """
+        return len(self.nodes)
+
+    def _intern(self, value):
+        """ Get the index of a string in the string table, adding it if needed.
+
+        :param str value: A string
+        :return: The index of the string
+        :rtype: int
+        """
+        try:
+            return self._string_ids[value]
+        except KeyError:
+            idx = self._string_ids[value] = len(self._strings)
+            self._strings.append(value)
+            return idx
+
+    def _get_node_id(self, name, type_=None):
+        """ Get the index of a node, adding it if needed.
+
+        :param str name: The node name
+        :param str type_: The node type, if known.
+        :return: The index of the node
+        :rtype: int
+        """
+        try:
+            idx = self._node_ids[name]
+        except KeyError:
+            idx = self._node_ids[name] = len(self._node_names)
+            self._node_names.append(self._strings[self._intern(name)])
+            self._node_types.append(None)
+            self._node_uids.append(None)
+            self._node_parents.append(None)
+            self._node_attributes.append([])
+            self._node_values.append({})
+        if type_:
+            self._node_types[idx] = self._strings[self._intern(type_)]
+        return idx
+
+    # --- Public interface ---
+
+    @property
+    def nodes(self):
+        """
+        :return: The name of all nodes created by the file
+        :rtype: list[str]
+        """
+        return [
+            name
+            for name, type_ in zip(self._node_names, self._node_types)
+            if type_ is not None
+        ]
+
+    @property
+    def connections(self):
+        """
+        :return: All connections as source and destination attribute paths
+        :rtype: list[tuple[str, str]]
+        """
+        return list(self.iter_connections())
+
+    @property
+    def inputs(self):
+        """
+        :return: The compound input attributes paths
+        :rtype: list[str]
+        """
+        return self._get_hub_attributes(INPUT_NODE_NAME)
+
+    @property
+    def outputs(self):
+        """
+        :return: The compound output attributes paths
+        :rtype: list[str]
+        """
+        return self._get_hub_attributes(OUTPUT_NODE_NAME)
+
+    def _get_hub_attributes(self, node):
+        """
+        :param str node: A hub node name
+        :return: The path of the hub user-defined attributes
+        :rtype: list[str]
+        """
+        if node not in self._node_ids:
+            return []
+        return [
+            "%s.%s" % (node, attr.long_name) for attr in self.get_attributes(node)
+        ]
+
+    def get_type(self, node):
+        """
+        :param str node: A node name
+        :return: The node type or None if the node is not created by the file.
+        :rtype: str or None
+        :raises KeyError: If the node is unknown
+        """
+        return self._node_types[self._node_ids[node]]
+
+    def get_uid(self, node):
+        """
+        :param str node: A node name
+        :return: The node uuid if one was saved
+        :rtype: str or None
+        :raises KeyError: If the node is unknown
+        """
+        return self._node_uids[self._node_ids[node]]
+
+    def get_parent(self, node):
+        """
+        :param str node: A node name
+        :return: The node parent if it's a child DAG node
+        :rtype: str or None
+        :raises KeyError: If the node is unknown
+        """
+        return self._node_parents[self._node_ids[node]]
+
+    def get_attributes(self, node):
+        """
+        :param str node: A node name
+        :return: The node dynamic attributes definitions, in creation order
+        :rtype: list[MaAttribute]
+        :raises KeyError: If the node is unknown
+        """
+        return list(self._node_attributes[self._node_ids[node]])
+
+    def get_values(self, node):
+        """
+        :param str node: A node name
+        :return: The raw setAttr tokens, by attribute name (ex: ".op")
+        :rtype: dict[str, tuple[str]]
+        :raises KeyError: If the node is unknown
+        """
+        return dict(self._node_values[self._node_ids[node]])
+
+    def iter_connections(self):
+        """ Iterate through all connections.
+
+        :return: A generator of source and destination attribute paths
+        :rtype: Generator[tuple[str, str]]
+        """
+        names = self._node_names
+        strings = self._strings
+        for src_node, src_attr, dst_node, dst_attr in zip(
+            self._src_nodes, self._src_attrs, self._dst_nodes, self._dst_attrs
+        ):
+            yield (
+                "%s.%s" % (names[src_node], strings[src_attr]),
+                "%s.%s" % (names[dst_node], strings[dst_attr]),
+            )
+
+    # --- Parsing ---
+
+    @classmethod
+    def from_file(cls, path):
+        """ Read a Maya ASCII file.
+
+        :param str path: Path to a Maya ASCII (.ma) file
+        :return: A graph instance
+        :rtype: MaGraph
+        """
+        inst = cls()
+        with open(path, "r") as stream:
+            inst.parse(stream)
+        return inst
+
+    def parse(self, stream):
+        """ Parse the content of a Maya ASCII file.
+
+        :param stream: A file object opened in text mode.
+        """
+        node = None  # The current node, affected by addAttr, setAttr and rename
+        for tokens in iter_ma_statements(stream):
+            command = tokens[0]
+            if command == "fileInfo" and len(tokens) > 2:
+                self.file_info[_unquote(tokens[1])] = _unquote(tokens[2])
+            elif command == "requires":
+                self.requires.append(tuple(_unquote(token) for token in tokens[-2:]))
+            elif command not in _STATEMENTS:
+                continue
+            elif command == "createNode":
+                node = self._parse_create_node(tokens)
+            elif command == "select":
+                node = None  # shared nodes are not part of the graph
+            elif command == "connectAttr":
+                self._parse_connect_attr(tokens)
+            elif node is None:
+                continue
+            elif command == "addAttr":
+                self._parse_add_attr(node, tokens)
+            elif command == "setAttr":
+                self._parse_set_attr(node, tokens)
+            elif command == "rename":
+                uid = _get_flag(tokens, "-uid", "-uuid")
+                if uid:
+                    self._node_uids[node] = uid
+
+    def _parse_create_node(self, tokens):
+        """
+        :param list[str] tokens: The tokens of a createNode statement
+        :return: The new node index
+        :rtype: int
+        """
+        type_ = tokens[1]
+        name = _get_flag(tokens, "-n", "-name") or type_
+        idx = self._get_node_id(name, type_)
+        parent = _get_flag(tokens, "-p", "-parent")
+        if parent:
+            self._node_parents[idx] = self._strings[self._intern(parent)]
+        return idx
+
+    def _parse_add_attr(self, node, tokens):
+        """
+        :param int node: The index of the node the attribute is added to
+        :param list[str] tokens: The tokens of an addAttr statement
+        """
+        long_name = _get_flag(tokens, "-ln", "-longName")
+        short_name = _get_flag(tokens, "-sn", "-shortName") or long_name
+        type_ = _get_flag(tokens, "-at", "-attributeType") or _get_flag(
+            tokens, "-dt", "-dataType"
+        )
+        parent = _get_flag(tokens, "-p", "-parent")
+        intern = self._intern
+        strings = self._strings
+        self._node_attributes[node].append(
+            MaAttribute(
+                strings[intern(long_name or short_name)],
+                strings[intern(short_name)],
+                strings[intern(type_)] if type_ else None,
+                strings[intern(parent)] if parent else None,
+            )
+        )
+
+    def _parse_set_attr(self, node, tokens):
+        """
+        :param int node: The index of the node the value is set on
+        :param list[str] tokens: The tokens of a setAttr statement
+        """
+        for idx, token in enumerate(tokens):
+            if token.startswith('".'):
+                attr = self._strings[self._intern(_unquote(token))]
+                self._node_values[node][attr] = tuple(tokens[idx + 1 :])
+                return
+
+    def _parse_connect_attr(self, tokens):
+        """
+        :param list[str] tokens: The tokens of a connectAttr statement
+        """
+        plugs = [_unquote(token) for token in tokens[1:] if token.startswith('"')]
+        if len(plugs) != 2:
+            return
+        (src_node, src_attr), (dst_node, dst_attr) = (
+            plug.split(".", 1) for plug in plugs
+        )
+        self._src_nodes.append(self._get_node_id(src_node))
+        self._src_attrs.append(self._intern(src_attr))
+        self._dst_nodes.append(self._get_node_id(dst_node))
+        self._dst_attrs.append(self._intern(dst_attr))
@@ -0,0 +1,168 @@
+"""
+Persistent on-disk index of a compound library.
+
+The index remember the metadata of every .ma file found in a library
+so subsequent scans only need to re-parse files that were added or modified.
+"""
+import hashlib
+import json
+import logging
+import os
+import shutil
+
+from ._definition import CompoundDefinition
+from ._parser import get_metadata_from_file, iter_ma_files
+from ._utils_pool import imap
+
+_LOG = logging.getLogger(__name__)
+
+# Bumped each time the index format change in a non-backward compatible way.
+_SCHEMA_VERSION = 1
+
+# Size of the blocks read when computing a file hash.
+_HASH_BLOCK_SIZE = 1024 * 1024
+
+
+def get_file_hash(path):
+    """ Compute the hash of a file content.
+
+    :param str path: Path to a file
+    :return: The file content hexadecimal hash
+    :rtype: str
+    """
+    hasher = hashlib.sha1()
+    with open(path, "rb") as stream:
+        for block in iter(lambda: stream.read(_HASH_BLOCK_SIZE), b""):
+            hasher.update(block)
+    return hasher.hexdigest()
+
+
+class RegistryIndex(object):
+    """
+    A cache of the metadata found in a compound library, keyed by file path.
+
+    Each entry remember the file modification time, size and content hash.
+    A file is only re-parsed if it's modification time or size changed
+    and it's content hash don't match the known one anymore.
+    """
+
+    def __init__(self, path):
+        """
+        :param str path: Path to the index file on disk.
+        """
+        self.path = path
+        self._entries = {}
+        self._dirty = False
+        self.load()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, path):
+        return path in self._entries
+
+    def load(self):
+        """ Load the index from disk. A missing or corrupted index is ignored. """
+        self._entries = {}
+        self._dirty = False
+
+        try:
+            with open(self.path, "r") as stream:
+                data = json.load(stream)
+        except (IOError, OSError):
+            return
+        except ValueError:
+            _LOG.warning("Ignoring corrupted registry index %r", self.path)
+            return
+
+        if data.get("version") != _SCHEMA_VERSION:
+            _LOG.info("Ignoring outdated registry index %r", self.path)
+            return
+
+        self._entries = data.get("entries", {})
+
+    def save(self):
+        """ Save the index to disk if it changed since it was loaded.
+
+        :return: True if the index was written, False otherwise.
+        :rtype: bool
+        """
+        if not self._dirty:
+            return False
+
+        data = {"version": _SCHEMA_VERSION, "entries": self._entries}
+        path_tmp = self.path + ".tmp"
+        try:
+            with open(path_tmp, "w") as stream:
+                json.dump(data, stream, separators=(",", ":"), sort_keys=True)
+            shutil.move(path_tmp, self.path)
+        except (IOError, OSError) as error:
+            # The library might be on a read-only location.
+            _LOG.warning("Could not write registry index %r: %s", self.path, error)
+            return False
+
+        self._dirty = False
+        return True
+
+    def get_metadata(self, path):
+        """ Resolve the metadata of a file, re-using the index when possible.
+
+        :param str path: Path to a maya ascii (.ma) file
+        :return: The file metadata
+        :rtype: dict(str, str)
+        """
+        stat = os.stat(path)
+        mtime, size = stat.st_mtime, stat.st_size
+
+        entry = self._entries.get(path)
+        if entry and entry["mtime"] == mtime and entry["size"] == size:
+            return entry["metadata"]
+
+        # The file might have been touched without it's content changing.
+        content_hash = get_file_hash(path)
+        if entry and entry["hash"] == content_hash:
+            metadata = entry["metadata"]
+        else:
+            _LOG.debug("Parsing %r", path)
+            metadata = get_metadata_from_file(path)
+
+        self._entries[path] = {
+            "mtime": mtime,
+            "size": size,
+            "hash": content_hash,
+            "metadata": metadata,
+        }
+        self._dirty = True
+        return metadata
+
+    def scan(self, startdir, workers=None):
+        """ Scan a directory and yield any found definitions.
+        Entries for files that don't exist anymore are dropped.
+        The index is saved afterward if anything changed.
+
+        :param str startdir: The directory to scan
+        :param int workers: An optional number of concurrent workers used to parse files.
+        :return: A compound definition generator
+        :rtype: Generator[CompoundDefinition]
+        """
+        known_paths = set(self._entries)
+        paths = list(iter_ma_files(startdir))
+        known_paths.difference_update(paths)
+
+        prefix = os.path.join(startdir, "")
+        results = imap(self.get_metadata, paths, workers=workers)
+        try:
+            for path, metadata in zip(paths, results):
+                try:
+                    definition = CompoundDefinition.from_metadata(metadata, path)
+                except ValueError:
+                    continue
+                yield definition
+        finally:
+            # Also save if the caller stopped iterating early.
+            for path in known_paths:
+                if path.startswith(prefix):
+                    del self._entries[path]
+                    self._dirty = True
+
+            self.save()
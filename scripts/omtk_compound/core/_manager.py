@@ -3,12 +3,15 @@ Highest logical level for compound manipulation.
 """
 import os
 import logging
+import threading
 
-from ._constants import COMPOUND_DEFAULT_NAMESPACE
+from ._constants import COMPOUND_DEFAULT_NAMESPACE, REGISTRY_INDEX_FILE_NAME
 from ._definition import CompoundDefinition
 from ._factory import from_file
+from ._index import RegistryIndex
 from ._registry import Registry
 from ._preferences import Preferences
+from ._template import TemplateCache
 
 _LOG = logging.getLogger(__name__)
 
@@ -18,11 +21,55 @@ class Manager(object):
     Main point of entry for interaction with the scene, registry and preferences.
     """
 
-    def __init__(self, registry=None, preferences=None):
+    def __init__(self, registry=None, preferences=None, use_index=True, scan=True):
+        """
+        :param Registry registry: An optional registry
+        :param Preferences preferences: Optional preferences
+        :param bool use_index: Should we keep an on-disk index of the compound location
+                               so only new or modified files are parsed on startup?
+        :param bool scan: Should we scan the compound location immediately?
+        """
         self.registry = registry or Registry()
         self.preferences = preferences or Preferences()
+        self.use_index = use_index
+        self._templates = None
+
+        if scan:
+            self.scan()
 
-        self.registry.parse_directory(self.preferences.compound_location)
+    @property
+    def templates(self):
+        """
+        :return: The templates used to instantiate compounds in bulk.
+        :rtype: TemplateCache
+        """
+        if self._templates is None:
+            self._templates = TemplateCache(
+                max_size=self.preferences.template_cache_size
+            )
+        return self._templates
+
+    def scan(self, location=None, workers=None):
+        """ Scan the compound location and register any found definitions.
+
+        Preferences are only read when the location or workers are not provided,
+        which make it safe to call from another thread than Maya main thread.
+
+        :param str location: An optional location. Default to the preferences value.
+        :param int workers: An optional number of workers.
+                            Default to the preferences value.
+        """
+        if location is None:
+            location = self.preferences.compound_location
+        if workers is None:
+            workers = self.preferences.scan_workers
+
+        index = (
+            RegistryIndex(os.path.join(location, REGISTRY_INDEX_FILE_NAME))
+            if self.use_index
+            else None
+        )
+        self.registry.parse_directory(location, index=index, workers=workers)
 
     def create_compound(
         self, uid=None, name=None, version=None, namespace=COMPOUND_DEFAULT_NAMESPACE
@@ -40,11 +87,48 @@ class Manager(object):
         compound_def = self.registry.find(uid=uid, name=name, version=version)
         return from_file(compound_def.path, namespace=namespace)
 
-    def publish_compound(self, compound, force=False):
+    def create_compounds(  # pylint: disable=too-many-arguments
+        self, uid=None, name=None, version=None, count=1, namespaces=None
+    ):
+        """ Create multiple instances of the same compound.
+
+        The compound file is only imported once as a template
+        that is then duplicated for each instance.
+
+        :param str uid: An optional compound uid
+        :param str name: An optional compound name
+        :param str version: An optional compound version
+        :param int count: The number of instances to create.
+                          Ignored if namespaces are provided.
+        :param namespaces: An optional namespace for each instance.
+        :type namespaces: Sequence[str]
+        :return: The new compounds
+        :rtype: list[Compound]
+        :raises LookupError: If no compound could be found.
+        """
+        compound_def = self.registry.find(uid=uid, name=name, version=version)
+        if namespaces is None:
+            namespaces = [COMPOUND_DEFAULT_NAMESPACE] * count
+
+        if not self.templates.max_size:
+            return [
+                from_file(compound_def.path, namespace=namespace)
+                for namespace in namespaces
+            ]
+
+        return [
+            self.templates.instantiate(compound_def.path, namespace=namespace)
+            for namespace in namespaces
+        ]
+
+    def publish_compound(self, compound, force=False, prune=False):
         """ Publish a compound
 
         :param Compound compound: The compound to publish
         :param bool force: Should we overwrite if the destination file exist?
+        :param bool prune: Should we remove the nodes that cannot affect
+                           any of the compound outputs before exporting?
+                           Note that they are removed from the scene too.
         """
         compound_def = CompoundDefinition(**compound.get_metadata())
         path = self._get_publish_location(compound_def)
@@ -54,6 +138,10 @@ class Manager(object):
         if os.path.exists(path) and not force:
             raise ValueError("Compound path already exist on disk. %r" % path)
 
+        if prune:
+            report = compound.optimize(passes=["dead_nodes"])
+            _LOG.info("Pruned %s: %s", compound, report)
+
         compound.export(path)
         self.registry.register(compound_def)
 
@@ -87,3 +175,68 @@ class Manager(object):
             self.preferences.compound_location,
             "%s_v%s.ma" % (compound_def.name, compound_def.version),
         )
+
+
+class LazyManager(object):
+    """
+    Proxy to a :class:`Manager` that is only created when first used.
+
+    This prevent scanning the compound location when importing the package.
+    The scan can also be started in a background thread with :meth:`preload`.
+    """
+
+    def __init__(self):
+        self._manager = None
+        self._pending = None
+        self._thread = None
+
+    def __getattr__(self, item):
+        return getattr(self.get(), item)
+
+    def __repr__(self):
+        state = "loaded" if self._manager is not None else "not loaded"
+        return "<LazyManager %s>" % state
+
+    def get(self):
+        """ Get the proxied manager, creating it if necessary.
+        If a background scan is in progress, wait for it to finish.
+
+        :return: A manager
+        :rtype: Manager
+        """
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+            self._manager, self._pending = self._pending, None
+
+        if self._manager is None:
+            self._manager = Manager()
+
+        return self._manager
+
+    def preload(self):
+        """ Scan the compound location in a background thread.
+
+        Must be called from Maya main thread as the preferences are resolved
+        before the thread is started. Do nothing if the manager already exist.
+        """
+        if self._manager is not None or self._thread is not None:
+            return
+
+        manager = Manager(scan=False)
+        location = manager.preferences.compound_location
+        workers = manager.preferences.scan_workers
+
+        def _scan():
+            try:
+                manager.scan(location=location, workers=workers)
+            except Exception:  # pylint: disable=broad-except
+                # Let the manager be created again when it is first used
+                # so any error is raised in the main thread.
+                _LOG.exception("Could not scan %r in the background.", location)
+            else:
+                self._pending = manager
+
+        self._thread = threading.Thread(target=_scan, name="omtk_compound_scan")
+        self._thread.daemon = True
+        self._thread.start()
@@ -0,0 +1,639 @@
+"""
+Optimization passes that make a compound cheaper to evaluate.
+
+A pass is a function that receive a compound and a `dry_run` flag
+and return the name of the nodes it removed, or would remove in a dry run.
+Passes are registered by name with `register_pass` and run in order by
+`Compound.optimize`.
+"""
+import collections
+import logging
+
+from maya import cmds
+from maya.api import OpenMaya
+
+from . import _utils, _utils_attr, _utils_dg
+
+_LOG = logging.getLogger(__name__)
+
+_Pass = collections.namedtuple("_Pass", ("name", "func", "final"))
+
+_PASSES = collections.OrderedDict()
+
+# The passes run by Compound.optimize when none are specified.
+DEFAULT_PASSES = ("conversion_pairs", "dead_nodes", "hubs")
+
+# Matching attributes of decomposeMatrix and composeMatrix nodes.
+_DECOMPOSE_TO_COMPOSE = (
+    ("outputTranslate", "inputTranslate"),
+    ("outputRotate", "inputRotate"),
+    ("outputScale", "inputScale"),
+    ("outputShear", "inputShear"),
+)
+
+
+# Node types that only compute their outputs from their inputs.
+# Their outputs can be baked when none of their inputs are connected.
+PURE_NODE_TYPES = frozenset(
+    (
+        "addDoubleLinear",
+        "blendColors",
+        "clamp",
+        "composeMatrix",
+        "condition",
+        "decomposeMatrix",
+        "fourByFourMatrix",
+        "inverseMatrix",
+        "multDoubleLinear",
+        "multMatrix",
+        "multiplyDivide",
+        "plusMinusAverage",
+        "reverse",
+        "setRange",
+        "transposeMatrix",
+        "unitConversion",
+        "vectorProduct",
+    )
+)
+
+
+def register_pass(name, final=False):
+    """ Decorator that register an optimization pass.
+
+    :param str name: The pass name
+    :param bool final: Does the pass need to be the last one?
+                       ex: A pass that delete the compound itself.
+    :return: A decorator
+    :rtype: callable
+    """
+
+    def _decorator(func):
+        _PASSES[name] = _Pass(name, func, final)
+        return func
+
+    return _decorator
+
+
+def get_pass_names():
+    """
+    :return: The name of all registered passes
+    :rtype: list[str]
+    """
+    return list(_PASSES)
+
+
+class OptimizationReport(object):
+    """
+    What an optimization removed, or would remove in a dry run.
+    """
+
+    def __init__(self, dry_run=False):
+        """
+        :param bool dry_run: Was the scene left untouched?
+        """
+        self.dry_run = dry_run
+        self.nodes = collections.OrderedDict()
+        self.connections_removed = None
+
+    def __str__(self):
+        summary = "%s %s nodes" % (
+            "Would remove" if self.dry_run else "Removed",
+            self.nodes_removed,
+        )
+        if self.connections_removed is not None:
+            summary += " and %s connections" % self.connections_removed
+        lines = [summary]
+        lines.extend(
+            "  %s: %s nodes" % (name, len(nodes)) for name, nodes in self.nodes.items()
+        )
+        return "\n".join(lines)
+
+    @property
+    def nodes_removed(self):
+        """
+        :return: The number of nodes removed by all passes
+        :rtype: int
+        """
+        return sum(len(nodes) for nodes in self.nodes.values())
+
+
+def get_connected_handles(nodes):
+    """
+    :param list[str] nodes: Node names
+    :return: The nodes and the nodes directly connected to them
+    :rtype: list[maya.api.OpenMaya.MObjectHandle]
+    """
+    mobjects = _utils_dg.NodeSet()
+    for node in nodes:
+        mobject = _utils_attr.get_mobject(node)
+        mobjects.add(mobject)
+        for plug in OpenMaya.MFnDependencyNode(mobject).getConnections():
+            others = list(plug.destinations())
+            if plug.isDestination:
+                others.append(plug.source())
+            for other in others:
+                mobjects.add(other.node())
+    return [OpenMaya.MObjectHandle(mobject) for mobject in mobjects]
+
+
+def count_connections(handles):
+    """
+    :param handles: Nodes to inspect, deleted nodes are ignored
+    :type handles: list[maya.api.OpenMaya.MObjectHandle]
+    :return: The number of connections from or to the nodes
+    :rtype: int
+    """
+    connections = set()
+    for handle in handles:
+        if not handle.isValid():
+            continue
+        for plug in OpenMaya.MFnDependencyNode(handle.object()).getConnections():
+            if plug.isDestination:
+                connections.add((plug.source().name(), plug.name()))
+            for plug_dst in plug.destinations():
+                connections.add((plug.name(), plug_dst.name()))
+    return len(connections)
+
+
+def run_passes(compound, passes=DEFAULT_PASSES, dry_run=False):
+    """ Run optimization passes on a compound.
+
+    :param compound: The compound to optimize
+    :type compound: omtk_compound.core.Compound
+    :param passes: The name of the passes to run, in order.
+    :type passes: Sequence[str]
+    :param bool dry_run: If True, only report what would be removed.
+    :return: What was removed, or would be removed.
+    :rtype: OptimizationReport
+    :raises ValueError: If a pass is unknown or a final pass is not the last one.
+    """
+    unknown = [name for name in passes if name not in _PASSES]
+    if unknown:
+        raise ValueError("Unknown optimization passes: %s" % ", ".join(unknown))
+    for name in passes[:-1]:
+        if _PASSES[name].final:
+            raise ValueError("Optimization pass %r need to be the last one." % name)
+
+    report = OptimizationReport(dry_run=dry_run)
+    handles = None if dry_run else get_connected_handles(compound.nodes)
+    count_before = None if dry_run else count_connections(handles)
+
+    for name in passes:
+        nodes = _PASSES[name].func(compound, dry_run=dry_run)
+        _LOG.debug("Optimization pass %r removed %s nodes", name, len(nodes))
+        report.nodes[name] = nodes
+
+    if not dry_run:
+        report.connections_removed = count_before - count_connections(handles)
+    return report
+
+
+# --- Passes ---
+
+
+def get_dead_nodes(compound):
+    """ Get the nodes of a compound that cannot affect any of it's outputs.
+
+    The graph is traversed upstream from the output hub, without leaving the compound.
+    Only nodes of pure types can be dead. Any other node can be meaningful
+    without feeding an output, ex: a script node or a dag node that is displayed,
+    so they are always kept, as well as the nodes they depend on.
+    Nodes connected directly to nodes outside the compound are also kept.
+
+    :param compound: A compound
+    :type compound: omtk_compound.core.Compound
+    :return: The dead nodes
+    :rtype: list[str]
+    """
+    mobjects = _utils_dg.NodeSet(
+        _utils_attr.get_mobject(node) for node in compound.nodes
+    )
+    roots = [_utils_attr.get_mobject(compound.output)]
+    for mobject in mobjects:
+        if OpenMaya.MFnDependencyNode(mobject).typeName not in PURE_NODE_TYPES or any(
+            neighbour not in mobjects
+            for neighbour in _utils_dg.iter_neighbours(mobject, upstream=False)
+        ):
+            roots.append(mobject)
+
+    traversal = _utils_dg.Traversal(roots, upstream=True)
+    traversal.run(bounds=mobjects)
+
+    return [
+        _utils_attr.get_node_name(mobject)
+        for mobject in mobjects
+        if mobject not in traversal.visited
+    ]
+
+
+@register_pass("dead_nodes")
+def remove_dead_nodes(compound, dry_run=False):
+    """ Remove the nodes that cannot affect any of the compound outputs.
+
+    :param compound: A compound
+    :type compound: omtk_compound.core.Compound
+    :param bool dry_run: If True, only report what would be removed.
+    :return: The removed nodes
+    :rtype: list[str]
+    """
+    nodes = get_dead_nodes(compound)
+    if nodes and not dry_run:
+        cmds.delete(nodes)
+    return nodes
+
+
+def _get_constant_nodes(nodes, excluded=()):
+    """ Get the nodes of pure types that are only driven by other constant nodes.
+
+    :param nodes: The nodes to inspect
+    :type nodes: Iterable[str]
+    :param excluded: Nodes that are never considered constant
+    :type excluded: Container[str]
+    :return: The constant nodes
+    :rtype: set[str]
+    """
+    sources = {
+        node: set(
+            cmds.listConnections(
+                node, source=True, destination=False, skipConversionNodes=False
+            )
+            or ()
+        )
+        for node in cmds.ls(list(nodes), type=sorted(PURE_NODE_TYPES))
+        if node not in excluded
+    }
+    result = set(sources)
+    while True:
+        rejected = {node for node in result if not sources[node] <= result}
+        if not rejected:
+            return result
+        result -= rejected
+
+
+def _get_value(attr):
+    """ Get the value of an attribute in a format setAttr understand.
+
+    :param str attr: An attribute dagpath
+    :return: The positional and keyword arguments for setAttr
+             or None if the attribute type is not supported.
+    :rtype: tuple[list, dict] or None
+    """
+    value = cmds.getAttr(attr)
+    if cmds.getAttr(attr, type=True) == "matrix":
+        return [value], {"type": "matrix"}
+    if isinstance(value, list) and value and isinstance(value[0], tuple):
+        return list(value[0]), {}
+    if isinstance(value, (bool, int, float)):
+        return [value], {}
+    return None
+
+
+def _get_baked_values(constants):
+    """ Evaluate the connections from constant nodes to the rest of the graph.
+
+    :param constants: The constant nodes
+    :type constants: set[str]
+    :return: The source attribute, destination attribute and setAttr arguments
+             of each connection and the nodes with an output we cannot bake.
+    :rtype: tuple[list[tuple[str, str, tuple[list, dict]]], set[str]]
+    """
+    values = []
+    rejected = set()
+    for node in constants:
+        connections = (
+            cmds.listConnections(
+                node,
+                source=False,
+                destination=True,
+                connections=True,
+                plugs=True,
+                skipConversionNodes=False,
+            )
+            or []
+        )
+        for attr_src, attr_dst in _utils.pairwise(connections):
+            if attr_dst.split(".", 1)[0] in constants:
+                continue
+            # Read the evaluated destination so the value is in it's own units.
+            # ex: The output of an unitConversion is in radians, not degrees.
+            value = _get_value(attr_dst)
+            if value is None:  # ex: string or geometry
+                rejected.add(node)
+                break
+            values.append((attr_src, attr_dst, value))
+    return values, rejected
+
+
+@register_pass("constants")
+def fold_constants(compound, dry_run=False):
+    """ Replace nodes of pure types that have no connected inputs
+    by the values they compute.
+
+    :param compound: A compound
+    :type compound: omtk_compound.core.Compound
+    :param bool dry_run: If True, only report what would be removed.
+    :return: The removed nodes
+    :rtype: list[str]
+    """
+    nodes = compound.nodes
+    excluded = set()
+    while True:
+        constants = _get_constant_nodes(nodes, excluded)
+        values, rejected = _get_baked_values(constants)
+        if not rejected:
+            break
+        excluded |= rejected
+
+    if dry_run or not constants:
+        return sorted(constants)
+
+    _utils_attr.edit_connections(
+        disconnections=[(attr_src, attr_dst) for attr_src, attr_dst, _ in values]
+    )
+    for _, attr_dst, (args, kwargs) in values:
+        cmds.setAttr(attr_dst, *args, **kwargs)
+    cmds.delete(list(constants))
+    return sorted(constants)
+
+
+@register_pass("hubs", final=True)
+def remove_hubs(compound, dry_run=False):
+    """ Remove the input and output hubs,
+    connecting their sources to their destinations directly.
+
+    :param compound: A compound
+    :type compound: omtk_compound.core.Compound
+    :param bool dry_run: If True, only report what would be removed.
+    :return: The hub nodes
+    :rtype: list[str]
+    """
+    nodes = [compound.input, compound.output]
+    if not dry_run:
+        compound.explode()
+    return nodes
+
+
+def _get_source(plug):
+    """ Get the source of a plug, even if the connection is made on it's parent.
+
+    :param plug: A destination MPlug
+    :type plug: maya.api.OpenMaya.MPlug
+    :return: The source MPlug or None if the plug is not connected.
+    :rtype: maya.api.OpenMaya.MPlug or None
+    """
+    if plug.isDestination:
+        return plug.source()
+    if plug.isChild:
+        parent = plug.parent()
+        if parent.isDestination:
+            for idx in range(parent.numChildren()):
+                if parent.child(idx) == plug:
+                    return parent.source().child(idx)
+    return None
+
+
+def _has_same_rotate_order(decompose, compose):
+    """
+    :param str decompose: A decomposeMatrix node
+    :param str compose: A composeMatrix node
+    :return: Do both nodes use the same, unconnected, rotation order?
+    :rtype: bool
+    """
+    attr_decompose = decompose + ".inputRotateOrder"
+    attr_compose = compose + ".inputRotateOrder"
+    for attr in (attr_decompose, attr_compose):
+        if _get_source(_utils_attr.get_plug(attr)) is not None:
+            return False
+    return cmds.getAttr(attr_decompose) == cmds.getAttr(attr_compose) and bool(
+        cmds.getAttr(compose + ".useEulerRotation")
+    )
+
+
+def _has_output_connections(node, ignored=()):
+    """
+    :param str node: A node
+    :param ignored: Destination nodes to ignore
+    :type ignored: Container[str]
+    :return: Is the node the source of any connection?
+    :rtype: bool
+    """
+    destinations = cmds.listConnections(node, source=False, destination=True) or []
+    return any(destination not in ignored for destination in destinations)
+
+
+def _get_decompose_source(compose, nodes):
+    """ Find the decomposeMatrix that provide all the components of a composeMatrix.
+
+    :param str compose: A composeMatrix node
+    :param nodes: The compound nodes
+    :type nodes: Container[str]
+    :return: The decomposeMatrix node or None if there's none.
+    :rtype: str or None
+    """
+    decompose = None
+    for attr_out, attr_inn in _DECOMPOSE_TO_COMPOSE:
+        plug_inn = _utils_attr.get_plug("%s.%s" % (compose, attr_inn))
+        for idx in range(plug_inn.numChildren()):
+            source = _get_source(plug_inn.child(idx))
+            if source is None:
+                return None
+            source_node = _utils_attr.get_node_name(source.node())
+            if decompose is None:
+                if (
+                    source_node not in nodes
+                    or cmds.nodeType(source_node) != "decomposeMatrix"
+                ):
+                    return None
+                decompose = source_node
+            elif source_node != decompose:
+                return None
+            plug_out = _utils_attr.get_plug("%s.%s" % (decompose, attr_out))
+            if source != plug_out.child(idx):
+                return None
+    return decompose
+
+
+def _collapse_decompose_compose(compose, nodes, removed, dry_run):
+    """ Bypass a composeMatrix that rebuild the matrix decomposed by a decomposeMatrix.
+
+    :param str compose: A composeMatrix node
+    :param nodes: The compound nodes
+    :type nodes: Container[str]
+    :param removed: The nodes already removed, or that would be in a dry run.
+    :type removed: Iterable[str]
+    :param bool dry_run: If True, only report what would be removed.
+    :return: The removed nodes
+    :rtype: list[str]
+    """
+    decompose = _get_decompose_source(compose, nodes)
+    if decompose is None or not _has_same_rotate_order(decompose, compose):
+        return []
+
+    source = _get_source(_utils_attr.get_plug(decompose + ".inputMatrix"))
+    if source is None:
+        return []
+
+    # In a dry run, the nodes already handled still exist and must be ignored.
+    ignored = set(removed)
+    ignored.add(compose)
+    result = [compose]
+    if not _has_output_connections(decompose, ignored=ignored):
+        result.append(decompose)
+    if dry_run:
+        return result
+
+    destinations = _utils_attr.get_plug(compose + ".outputMatrix").destinations()
+    _utils_attr.edit_connections(
+        connections=[
+            (
+                _utils_attr.get_plug_name(source),
+                _utils_attr.get_plug_name(destination),
+            )
+            for destination in destinations
+        ],
+        force=True,
+    )
+    cmds.delete(result)
+    return result
+
+
+def _get_bypass_connections(decompose, compose):
+    """ Resolve the connections that would replace the outputs of a decomposeMatrix
+    by the inputs of the composeMatrix that provide it's matrix.
+
+    :param str decompose: A decomposeMatrix node
+    :param str compose: A composeMatrix node
+    :return: The new source and destination attributes
+             or None if an output cannot be replaced.
+    :rtype: list[tuple[str, str]] or None
+    """
+    result = []
+    for plug in OpenMaya.MFnDependencyNode(
+        _utils_attr.get_mobject(decompose)
+    ).getConnections():
+        destinations = plug.destinations()
+        if not destinations:
+            continue
+
+        plug_out = plug.parent() if plug.isChild else plug
+        attr_out = plug_out.partialName(useLongNames=True)
+        attr_inn = dict(_DECOMPOSE_TO_COMPOSE).get(attr_out)
+        if attr_inn is None:  # ex: outputQuat
+            return None
+        if attr_out == "outputRotate" and not _has_same_rotate_order(
+            decompose, compose
+        ):
+            return None
+
+        plug_inn = _utils_attr.get_plug("%s.%s" % (compose, attr_inn))
+        if plug.isChild:
+            pairs = [
+                (plug_inn.child(idx), plug_dst)
+                for idx in range(plug_out.numChildren())
+                if plug_out.child(idx) == plug
+                for plug_dst in destinations
+            ]
+        elif plug_inn.isDestination:
+            pairs = [(plug_inn, plug_dst) for plug_dst in destinations]
+        else:
+            pairs = [
+                (plug_inn.child(idx), plug_dst.child(idx))
+                for plug_dst in destinations
+                for idx in range(plug_inn.numChildren())
+            ]
+
+        for plug_inn_, plug_dst in pairs:
+            source = _get_source(plug_inn_)
+            if source is None:  # constant values are not supported
+                return None
+            result.append(
+                (_utils_attr.get_plug_name(source), _utils_attr.get_plug_name(plug_dst))
+            )
+    return result
+
+
+def _collapse_compose_decompose(decompose, nodes, removed, dry_run):
+    """ Bypass a decomposeMatrix that decompose the matrix built by a composeMatrix.
+
+    Note that rotations are only equivalent for angles between -180 and 180 degrees
+    as the decomposeMatrix normalize them.
+
+    :param str decompose: A decomposeMatrix node
+    :param nodes: The compound nodes
+    :type nodes: Container[str]
+    :param removed: The nodes already removed, or that would be in a dry run.
+    :type removed: Iterable[str]
+    :param bool dry_run: If True, only report what would be removed.
+    :return: The removed nodes
+    :rtype: list[str]
+    """
+    source = _get_source(_utils_attr.get_plug(decompose + ".inputMatrix"))
+    if source is None or source.partialName(useLongNames=True) != "outputMatrix":
+        return []
+    compose = _utils_attr.get_node_name(source.node())
+    if compose not in nodes or cmds.nodeType(compose) != "composeMatrix":
+        return []
+
+    connections = _get_bypass_connections(decompose, compose)
+    if connections is None:
+        return []
+
+    # In a dry run, the nodes already handled still exist and must be ignored.
+    ignored = set(removed)
+    ignored.add(decompose)
+    result = [decompose]
+    if not _has_output_connections(compose, ignored=ignored):
+        result.append(compose)
+    if dry_run:
+        return result
+
+    _utils_attr.edit_connections(connections=connections, force=True)
+    cmds.delete(result)
+    return result
+
+
+@register_pass("conversion_pairs")
+def remove_conversion_pairs(compound, dry_run=False):
+    """ Remove composeMatrix that rebuild the matrix decomposed by a decomposeMatrix.
+
+    :param compound: A compound
+    :type compound: omtk_compound.core.Compound
+    :param bool dry_run: If True, only report what would be removed.
+    :return: The removed nodes
+    :rtype: list[str]
+    """
+    nodes = set(compound.nodes)
+    removed = []
+
+    for compose in cmds.ls(list(nodes), type="composeMatrix"):
+        if compose in removed:
+            continue
+        removed.extend(_collapse_decompose_compose(compose, nodes, removed, dry_run))
+        nodes.difference_update(removed)
+
+    return removed
+
+
+@register_pass("compose_decompose")
+def remove_compose_decompose(compound, dry_run=False):
+    """ Remove decomposeMatrix that decompose the matrix built by a composeMatrix.
+
+    This is not part of the default passes as the result can differ,
+    ex: For rotations outside of -180 and 180 degrees or negative scales.
+
+    :param compound: A compound
+    :type compound: omtk_compound.core.Compound
+    :param bool dry_run: If True, only report what would be removed.
+    :return: The removed nodes
+    :rtype: list[str]
+    """
+    nodes = set(compound.nodes)
+    removed = []
+
+    for decompose in cmds.ls(list(nodes), type="decomposeMatrix"):
+        if decompose in removed:
+            continue
+        removed.extend(_collapse_compose_decompose(decompose, nodes, removed, dry_run))
+        nodes.difference_update(removed)
+
+    return removed
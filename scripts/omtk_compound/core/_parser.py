@@ -1,10 +1,13 @@
 """
 Method for reading and parsing .ma files.
 """
+import os
 import re
 import tempfile
 import shutil
 
+import six
+
 from ._constants import FILE_METADATA_PREFIX
 
 # Note: We don't match "$" as it won't work with Windows "\r\n".
@@ -12,6 +15,32 @@ _REGEX_MA_HEADER = re.compile(r"^//Maya ASCII .* scene")
 
 _REGEX_FILE_INFO = re.compile('^fileInfo "(.*)" "(.*)";')
 
+# Statements that can appear in a Maya ASCII header. Indented lines are continuations.
+_HEADER_PREFIXES = ("//", "requires", "currentUnit", "fileInfo", "file ", "\t")
+_HEADER_PREFIXES_BYTES = tuple(prefix.encode("utf-8") for prefix in _HEADER_PREFIXES)
+
+# Size of the blocks read when scanning a file header.
+_HEADER_BLOCK_SIZE = 8 * 1024
+
+# Size of the blocks read when rewriting a file.
+_REWRITE_BLOCK_SIZE = 1024 * 1024
+
+# Default maximum number of bytes read when scanning a file header.
+HEADER_MAX_SIZE = 1024 * 1024
+
+
+def iter_ma_files(startdir):
+    """ Recursively find all maya ascii (.ma) files in a directory.
+
+    :param str startdir: The directory to scan
+    :return: A path generator
+    :rtype: Generator[str]
+    """
+    for rootdir, _, filenames in os.walk(startdir):
+        for filename in filenames:
+            if filename.endswith(".ma"):
+                yield os.path.join(rootdir, filename)
+
 
 def remove_root_namespace(namespace, path):
     """ Remove a namespace from a file. Overwrite the file.
@@ -19,99 +48,229 @@ def remove_root_namespace(namespace, path):
     :param str namespace: The namespace to remove
     :param str path: A path to a file to parse.
     """
-    pattern = '"%s:' % namespace.strip(":")
-    path_tmp = tempfile.mktemp(suffix=".ma")
-    with open(path, "r") as fp_in:
-        with open(path_tmp, "w") as fp_out:
-            for line in fp_in:
-                line = line.replace(pattern, '"')
-                fp_out.write(line)
-
-    shutil.move(path_tmp, path)
+    _rewrite_ma_file(path, namespace=namespace)
 
 
-def write_metadata_to_ma_file(path, metadata):
+def write_metadata_to_ma_file(path, metadata, namespace=None, in_place=False):
     """
     Write metadata to a Maya file.
 
+    Any root namespace to remove from the file can be provided
+    so both operations are done in a single pass.
+
     :param str path:
     :param metadata:
+    :param str namespace: An optional namespace to remove from the file.
+    :param bool in_place: If True and no namespace need to be removed,
+                          only the header region is rewritten if the new metadata fit.
     :return: True if successful, False otherwise
     :rtype bool
     """
-    # TODO: Replace with the appropriate Maya function
-    path_tmp = tempfile.mktemp()
-    success = False
-    found = False
-    with open(path, "r") as fp_read:
-        with open(path_tmp, "w") as fp_write:
-            line = fp_read.readline()
-            if not _REGEX_MA_HEADER.match(line):
-                raise Exception("Invalid Maya ASCII file {0}".format(path))
-            fp_write.write(line)
-
-            for line in fp_read:
-                regex_result = _REGEX_FILE_INFO.match(line)
-                if regex_result:
-                    found = True
-                    key, val = regex_result.groups()
-                    # Ignore any existing omtk metadata
-                    if key.startswith(FILE_METADATA_PREFIX):
-                        continue
-                        # Only dump the metadata on the last fileInfo encounter
-                elif found:
-                    for key, val in metadata.iteritems():
-                        fp_write.write(
-                            'fileInfo "{0}{1}" "{2}";\n'.format(
-                                FILE_METADATA_PREFIX, key, val.replace("\n", r"\n")
-                            )
-                        )
-                    success = True
-                    found = False
-
-                fp_write.write(line)
+    if in_place and not namespace and _write_header_in_place(path, metadata):
+        return True
+    _rewrite_ma_file(path, metadata=metadata, namespace=namespace)
+    return True
+
+
+def _split_header(stream, max_size=HEADER_MAX_SIZE):
+    """ Read the header region of a Maya ASCII file opened in binary mode.
+
+    :param stream: A file object opened in binary mode, positioned at the start.
+    :param int max_size: The maximum number of bytes to read.
+    :return: The header bytes and any bytes already read from the body.
+    :rtype: tuple(bytes, bytes)
+    """
+    data = b""
+    offset = 0  # offset of the first line we did not process
+    while len(data) < max_size:
+        block = stream.read(_HEADER_BLOCK_SIZE)
+        data += block
+        while True:
+            end = data.find(b"\n", offset)
+            if end == -1:
+                if not block:  # end of file, the last line have no line ending
+                    end = len(data) - 1
+                else:
+                    break
+            line = data[offset : end + 1]
+            if not line:
+                return data[:offset], data[offset:]
+            if line.strip() and not line.startswith(_HEADER_PREFIXES_BYTES):
+                return data[:offset], data[offset:]
+            offset = end + 1
+        if not block:
+            break
+    return data[:offset], data[offset:]
+
+
+def _patch_header(path, header, metadata):
+    """ Replace the metadata contained in a Maya ASCII header.
+
+    :param str path: The path of the file, used in error messages.
+    :param bytes header: The header to patch
+    :param dict metadata: The new metadata. If None, the header is not modified.
+    :return: The patched header
+    :rtype: bytes
+    :raises Exception: If the header is not from a Maya ASCII file.
+    """
+    first_line = header.split(b"\n", 1)[0].decode("utf-8", "replace")
+    if not _REGEX_MA_HEADER.match(first_line):
+        raise Exception("Invalid Maya ASCII file {0}".format(path))
+
+    if metadata is None:
+        return header
+
+    newline = b"\r\n" if first_line.endswith("\r") else b"\n"
+    prefix = b'fileInfo "' + FILE_METADATA_PREFIX.encode("utf-8")
+
+    # Ignore any existing omtk metadata
+    lines = [line for line in header.splitlines(True) if not line.startswith(prefix)]
+    if lines and not lines[-1].endswith(b"\n"):
+        lines[-1] += newline
+    for key, val in sorted(metadata.items()):
+        line = u'fileInfo "{0}{1}" "{2}";'.format(
+            FILE_METADATA_PREFIX, key, six.text_type(val).replace("\n", r"\n")
+        )
+        lines.append(line.encode("utf-8") + newline)
+    return b"".join(lines)
+
+
+def _write_header_in_place(path, metadata):
+    """ Overwrite the header of a Maya ASCII file without touching the body.
+    This is only possible if the new header is not larger than the old one.
+    The new header is padded with trailing spaces to match the old header size.
+
+    :param str path: A path to a Maya ASCII file
+    :param dict metadata: The new metadata
+    :return: True if the header could be rewritten, False otherwise
+    :rtype: bool
+    """
+    with open(path, "r+b") as stream:
+        header, _ = _split_header(stream)
+        new_header = _patch_header(path, header, metadata)
+        padding = len(header) - len(new_header)
+        if padding < 0:
+            return False
+
+        newline = b"\r\n" if new_header.endswith(b"\r\n") else b"\n"
+        new_header = new_header[: -len(newline)] + b" " * padding + newline
+        stream.seek(0)
+        stream.write(new_header)
+    return True
+
+
+def _rewrite_ma_file(path, metadata=None, namespace=None):
+    """ Rewrite a Maya ASCII file in one streaming pass.
+
+    :param str path: A path to a Maya ASCII file
+    :param dict metadata: Optional new metadata to write in the header
+    :param str namespace: An optional namespace to remove from the file.
+    """
+    if namespace:
+        pattern = ('"%s:' % namespace.strip(":")).encode("utf-8")
+
+        def _patch(data):
+            return data.replace(pattern, b'"')
+
+    else:
+
+        def _patch(data):
+            return data
+
+    # Write next to the destination so the final move is a simple rename.
+    handle, path_tmp = tempfile.mkstemp(suffix=".ma", dir=os.path.dirname(path))
+    try:
+        # Wrap the handle first so it is closed even if the source cannot be opened.
+        with os.fdopen(handle, "wb") as fp_out, open(path, "rb") as fp_in:
+            header, buffer_ = _split_header(fp_in)
+            fp_out.write(_patch(_patch_header(path, header, metadata)))
+
+            # Process the body by blocks. A namespace can't span multiple lines
+            # so we only process up to the last line ending of each block.
+            while True:
+                block = fp_in.read(_REWRITE_BLOCK_SIZE)
+                buffer_ += block
+                end = buffer_.rfind(b"\n") + 1 if block else len(buffer_)
+                fp_out.write(_patch(buffer_[:end]))
+                buffer_ = buffer_[end:]
+                if not block:
+                    break
+        # mkstemp create files readable by their owner only.
+        shutil.copymode(path, path_tmp)
+    except Exception:
+        os.remove(path_tmp)
+        raise
 
     shutil.move(path_tmp, path)
 
-    return success
 
+def iter_ma_file_header(path, max_size=HEADER_MAX_SIZE):
+    """ Iterate through the header lines of a Maya ASCII file.
+    The header end on the first line that is not a comment, a `requires`,
+    `currentUnit`, `fileInfo` or `file` statement (generally the first `createNode`).
 
-def iter_ma_file_metadata(path):
+    The file is read by blocks and never past the provided byte budget
+    so the cost don't depend on the size of the file body.
+
+    :param str path: An absolute path to a Maya file.
+    :param int max_size: The maximum number of bytes to read.
+    :return: A line generator, without line endings
+    :rtype: Generator[str]
     """
+    with open(path, "r") as stream:
+        remaining = max_size
+        buffer_ = ""
+        while remaining > 0:
+            block = stream.read(min(_HEADER_BLOCK_SIZE, remaining))
+            if not block:  # end of file
+                lines = [buffer_] if buffer_ else []
+                buffer_ = ""
+            else:
+                remaining -= len(block)
+                lines = (buffer_ + block).split("\n")
+                buffer_ = lines.pop()  # the last line might be incomplete
+
+            for line in lines:
+                line = line.rstrip("\r")
+                if line and not line.startswith(_HEADER_PREFIXES):
+                    return
+                yield line
+
+            if not block:
+                return
 
-    :param path: An absolute path to a Maya file.
+
+def iter_ma_file_metadata(path, max_size=HEADER_MAX_SIZE):
+    """ Iterate through the fileInfo entries of a Maya ASCII file header.
+
+    :param str path: An absolute path to a Maya file.
+    :param int max_size: The maximum number of bytes to read.
     :return: A key-value pair generator
     :rtype: generator(tuple(str, str))
+    :raises Exception: If the file is not a Maya ASCII file.
     """
-    with open(path, "r") as fp:
-        line = fp.readline()
-        if not _REGEX_MA_HEADER.match(line):
-            raise Exception("Invalid first line for file {0}: {1}".format(path, line))
-
-        found = False
-        while fp:
-            line = fp.readline()
-            regex_result = _REGEX_FILE_INFO.match(line)
-            if regex_result:
-                found = True
-                key, val = regex_result.groups()
-                yield key, val
-            # If we encountered fileInfo and suddenly stop encountering,
-            # we are finished with the file
-            elif found:
-                break
-
-
-def get_metadata_from_file(path):
+    lines = iter_ma_file_header(path, max_size=max_size)
+    line = next(lines, "")
+    if not _REGEX_MA_HEADER.match(line):
+        raise Exception("Invalid first line for file {0}: {1}".format(path, line))
+
+    for line in lines:
+        regex_result = _REGEX_FILE_INFO.match(line)
+        if regex_result:
+            yield regex_result.groups()
+
+
+def get_metadata_from_file(path, max_size=HEADER_MAX_SIZE):
     """
     Read a file header and return it's metadata.
 
     :param path:
+    :param int max_size: The maximum number of bytes to read.
     :return: A metadata dict
     :rtype: dict(str, object)
     """
     metadata = {}
-    for key, val in iter_ma_file_metadata(path):
+    for key, val in iter_ma_file_metadata(path, max_size=max_size):
         if key.startswith(FILE_METADATA_PREFIX):
             key = key[len(FILE_METADATA_PREFIX) :]
             metadata[key] = None if val == "None" else val
@@ -16,7 +16,12 @@ from maya import cmds
 
 _LOG = logging.getLogger(__name__)
 
-_SCHEMA = {"compound_location": "~/.omtk/compounds", "default_author": None}
+_SCHEMA = {
+    "compound_location": "~/.omtk/compounds",
+    "default_author": None,
+    "scan_workers": 4,
+    "template_cache_size": 16,
+}
 _PREFIX = "omtk.compound."
 
 
@@ -129,3 +134,20 @@ class Preferences(object):
         :return:
         """
         return os.path.expanduser(self["compound_location"])
+
+    @property
+    def scan_workers(self):
+        """
+        :return: The number of concurrent workers used to scan the compound location.
+        :rtype: int
+        """
+        return int(self["scan_workers"])
+
+    @property
+    def template_cache_size(self):
+        """
+        :return: The maximum number of compound files kept in the scene as templates
+                 to speed up instantiation. Zero disable the templates.
+        :rtype: int
+        """
+        return int(self["template_cache_size"])
@@ -0,0 +1,183 @@
+"""
+Measure the evaluation cost of compounds.
+
+Per-node compute times are sampled with `dgtimer` while stepping
+through a frame range, then aggregated by compound namespace.
+"""
+import collections
+import logging
+
+from maya import cmds
+from maya.api import OpenMaya
+
+from ._factory import from_scene
+
+_LOG = logging.getLogger(__name__)
+
+# The evaluation cost of a compound.
+# total: The compute time of all the compound nodes, in milliseconds.
+# count: The number of nodes in the compound.
+# hottest: The node names and compute times of the most expensive nodes.
+CompoundProfile = collections.namedtuple(
+    "CompoundProfile", ("namespace", "total", "count", "hottest")
+)
+
+
+def _get_compute_time(node):
+    """
+    :param str node: A node name
+    :return: The time spent computing the node since dgtimer was last reset
+    :rtype: float
+    """
+    value = cmds.dgtimer(node, query=True, metric="compute", timerType="self")
+    if isinstance(value, (list, tuple)):  # some versions return one value per metric
+        value = sum(value)
+    return float(value or 0.0)
+
+
+def _sample(start, end, nodes, times):
+    """ Step through a frame range with dgtimer enabled.
+
+    The evaluation manager is switched to DG mode for the duration of the sampling
+    as dgtimer don't see the nodes evaluated in parallel.
+
+    If dgtimer was already running, it's timers are not reset.
+    The time spent before the sampling is subtracted instead
+    and dgtimer is left running.
+
+    :param int start: The first frame
+    :param int end: The last frame
+    :param list[str] nodes: Nodes to pull on each frame so they are evaluated
+                            even if nothing is displayed. ex: In mayapy.
+    :param times: The nodes to measure. The values are updated in place.
+    :type times: dict[str, float]
+    """
+    running = cmds.dgtimer(query=True, timerOn=True)
+    if running:
+        offsets = {node: _get_compute_time(node) for node in times}
+    else:
+        offsets = {}
+        cmds.dgtimer(reset=True)
+
+    current = cmds.currentTime(query=True)
+    mode = cmds.evaluationManager(query=True, mode=True)[0]
+    cmds.evaluationManager(mode="off")
+    cmds.dgtimer(on=True)
+    try:
+        for frame in range(start, end + 1):
+            cmds.currentTime(frame, update=True)
+            if nodes:
+                cmds.dgeval(nodes)
+    finally:
+        if not running:
+            cmds.dgtimer(off=True)
+        cmds.evaluationManager(mode=mode)
+        cmds.currentTime(current, update=True)
+
+    for node in times:
+        times[node] = _get_compute_time(node) - offsets.get(node, 0.0)
+
+
+def profile_compounds(compounds=None, start=None, end=None, hottest=5):
+    """ Measure the time spent evaluating each compound over a frame range.
+
+    :param compounds: The compounds to profile. Default to all compounds in the scene.
+    :type compounds: Iterable[omtk_compound.core.Compound]
+    :param int start: The first frame. Default to the playback range start.
+    :param int end: The last frame. Default to the playback range end.
+    :param int hottest: The number of most expensive nodes to keep for each compound.
+    :return: The profile of each compound by namespace
+    :rtype: collections.OrderedDict[str, CompoundProfile]
+    """
+    if compounds is None:
+        compounds = from_scene()
+    nodes_by_namespace = collections.OrderedDict()
+    outputs = []
+    for compound in compounds:
+        nodes_by_namespace[compound.namespace] = compound.nodes
+        outputs.append(compound.output)
+    if start is None:
+        start = cmds.playbackOptions(query=True, minTime=True)
+    if end is None:
+        end = cmds.playbackOptions(query=True, maxTime=True)
+
+    times = {node: 0.0 for nodes in nodes_by_namespace.values() for node in nodes}
+    _sample(int(start), int(end), outputs, times)
+
+    result = collections.OrderedDict()
+    for namespace, nodes in nodes_by_namespace.items():
+        timings = sorted(
+            ((node, times[node]) for node in nodes), key=lambda item: -item[1]
+        )
+        result[namespace] = CompoundProfile(
+            namespace=namespace,
+            total=sum(time for _, time in timings),
+            count=len(nodes),
+            hottest=timings[:hottest],
+        )
+        _LOG.debug("%s: %.3fms", namespace, result[namespace].total)
+    return result
+
+
+class ProfileCache(object):
+    """
+    Store the last profiles and invalidate them using Maya callbacks
+    when nodes or connections are added or removed.
+    The callbacks are removed before a new scene is created or opened
+    and registered again on the next profiling.
+    """
+
+    def __init__(self):
+        self._key = None
+        self._profiles = None
+        self._callback_ids = []
+
+    def get(self, compounds=None, start=None, end=None):
+        """ Get the compounds profiles, profiling them if needed.
+
+        :param compounds: The compounds to profile. Default to all compounds.
+        :type compounds: Iterable[omtk_compound.core.Compound]
+        :param int start: The first frame. Default to the playback range start.
+        :param int end: The last frame. Default to the playback range end.
+        :return: The profile of each compound by namespace
+        :rtype: collections.OrderedDict[str, CompoundProfile]
+        """
+        compounds = list(from_scene() if compounds is None else compounds)
+        key = (tuple(compound.namespace for compound in compounds), start, end)
+        if self._profiles is None or key != self._key:
+            self._profiles = profile_compounds(compounds, start=start, end=end)
+            self._key = key
+            if not self._callback_ids:
+                self.register()
+        return self._profiles.copy()
+
+    def invalidate(self, *_):
+        """ Invalidate the cached profiles. """
+        self._profiles = None
+
+    # --- Callbacks management ---
+
+    def register(self):
+        """ Register the Maya callbacks that invalidate the cache. """
+        self.unregister()
+        self._callback_ids = [
+            OpenMaya.MDGMessage.addNodeAddedCallback(self.invalidate),
+            OpenMaya.MDGMessage.addNodeRemovedCallback(self.invalidate),
+            OpenMaya.MDGMessage.addConnectionCallback(self.invalidate),
+            OpenMaya.MSceneMessage.addCallback(
+                OpenMaya.MSceneMessage.kBeforeNew, self._on_scene_changed
+            ),
+            OpenMaya.MSceneMessage.addCallback(
+                OpenMaya.MSceneMessage.kBeforeOpen, self._on_scene_changed
+            ),
+        ]
+
+    def unregister(self):
+        """ Remove the Maya callbacks. """
+        if self._callback_ids:
+            OpenMaya.MMessage.removeCallbacks(self._callback_ids)
+        self._callback_ids = []
+
+    def _on_scene_changed(self, *_):
+        self.invalidate()
+        self.unregister()
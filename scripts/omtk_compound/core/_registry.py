@@ -1,13 +1,19 @@
 """
 Registry hold all known compound definitions.
 """
-import os
+import bisect
+import re
 from collections import defaultdict
 
 import collections
 import six
 
-from ._definition import CompoundDefinition
+from ._definition import CompoundDefinition, parse_version
+from ._parser import iter_ma_files
+from ._utils_pool import imap
+
+
+_REGEX_SPECIFIER = re.compile(r"^\s*(==|!=|>=|<=|>|<)\s*(\S+)\s*$")
 
 
 class RegistryError(Exception):
@@ -23,28 +29,128 @@ class NotRegisteredError(RegistryError):
 
 
 class VersionStream(dict):
-    """Extended dict."""
+    """
+    Extended dict that keep it's versions sorted.
+
+    Versions are ordered semantically (ex: "0.10.0" is higher than "0.9.0")
+    and the ordering is updated incrementally when versions are added or removed.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super(VersionStream, self).__init__()
+        self._keys = []  # parsed versions, sorted
+        self._versions = []  # version strings, in the same order as _keys
+        for key, value in six.iteritems(dict(*args, **kwargs)):
+            self[key] = value
 
     def __setitem__(self, key, value):
         if key in self:
             raise AlreadyRegisteredError("%s is already registered" % value)
         super(VersionStream, self).__setitem__(key, value)
+        parsed = parse_version(key)
+        idx = bisect.bisect_right(self._keys, parsed)
+        self._keys.insert(idx, parsed)
+        self._versions.insert(idx, key)
+
+    def __delitem__(self, key):
+        super(VersionStream, self).__delitem__(key)
+        self._forget(key)
+
+    def pop(self, key, *args):
+        try:
+            value = super(VersionStream, self).pop(key)
+        except KeyError:
+            if args:
+                return args[0]
+            raise
+        self._forget(key)
+        return value
+
+    def _forget(self, key):
+        """ Remove a version from the sorted versions.
+
+        :param str key: A version string
+        """
+        parsed = parse_version(key)
+        idx = bisect.bisect_left(self._keys, parsed)
+        while self._versions[idx] != key:  # versions can be equivalent
+            idx += 1
+        del self._keys[idx]
+        del self._versions[idx]
+
+    @property
+    def versions(self):
+        """
+        :return: All version strings, from the lowest to the highest
+        :rtype: list[str]
+        """
+        return list(self._versions)
 
     @property
     def latest(self):
         """
         :return: The highest version available
         :rtype: :class:`omtk_compound.core.CompoundDefinition`
+        :raises IndexError: If the stream is empty
         """
-        key = sorted(self.keys())[-1]
-        return self[key]
+        return self[self._versions[-1]]
+
+    def previous(self, version):
+        """ Get the highest version lower than the provided one.
+
+        :param str version: A version string
+        :return: A definition or None if there's no lower version
+        :rtype: :class:`omtk_compound.core.CompoundDefinition` or None
+        """
+        idx = bisect.bisect_left(self._keys, parse_version(version))
+        return self[self._versions[idx - 1]] if idx else None
+
+    def range(self, specifier):
+        """ Get all versions matching a specifier.
+
+        The specifier is a comma separated list of clauses using
+        the ==, !=, >=, >, <= and < operators. Ex: ">=1.0.0,<2.0.0".
+
+        :param str specifier: A version specifier
+        :return: The matching definitions, from the lowest to the highest version.
+        :rtype: list[:class:`omtk_compound.core.CompoundDefinition`]
+        :raises ValueError: If the specifier is invalid.
+        """
+        start, end = 0, len(self._keys)
+        excluded = set()
+        for clause in specifier.split(","):
+            match = _REGEX_SPECIFIER.match(clause)
+            if not match:
+                raise ValueError("Invalid version specifier: %r" % specifier)
+            operator, value = match.groups()
+            parsed = parse_version(value)
+            if operator == "!=":
+                excluded.add(parsed)
+                continue
+            if operator in ("==", ">="):
+                start = max(start, bisect.bisect_left(self._keys, parsed))
+            if operator == ">":
+                start = max(start, bisect.bisect_right(self._keys, parsed))
+            if operator in ("==", "<="):
+                end = min(end, bisect.bisect_right(self._keys, parsed))
+            if operator == "<":
+                end = min(end, bisect.bisect_left(self._keys, parsed))
+
+        return [
+            self[version]
+            for key, version in zip(self._keys[start:end], self._versions[start:end])
+            if key not in excluded
+        ]
 
 
 class Registry(object):
     """A registry of compounds definitions."""
 
     def __init__(self):
-        self._store = defaultdict(VersionStream)
+        self._store = {}
+        # Secondary index of the uids that have a definition with a specific name.
+        # The number of definitions that use the name is stored for each uid.
+        self._uids_by_name = defaultdict(collections.OrderedDict)
 
     def __iter__(self):  # TODO: Should return VersionStream
         for uid, versions in six.iteritems(self._store):
@@ -52,7 +158,7 @@ class Registry(object):
                 yield uid, version
 
     def __len__(self):
-        return len(tuple(iter(self)))
+        return sum(len(stream) for stream in six.itervalues(self._store))
 
     def __getitem__(self, item):
         return self._store[item]
@@ -76,7 +182,14 @@ class Registry(object):
         if not any((name, uid)):
             raise ValueError("Should at least have one query.")
 
-        for stream in self._store.values():
+        uids = []
+        if uid and uid in self._store:
+            uids.append(uid)
+        if name and name in self._uids_by_name:
+            uids.extend(self._uids_by_name[name])
+
+        for uid_ in uids:
+            stream = self._store[uid_]
             compound = stream.get(version) if version else stream.latest
             if compound and (
                 (uid and compound.uid == uid) or (name and compound.name == name)
@@ -100,7 +213,11 @@ class Registry(object):
                     "Expected mapping, got %s: %s" % (type(entry).__name__, entry)
                 )
 
-            self._store[entry.uid][entry.version] = entry
+            stream = self._store.setdefault(entry.uid, VersionStream())
+            stream[entry.version] = entry
+
+            uids = self._uids_by_name[entry.name]
+            uids[entry.uid] = uids.get(entry.uid, 0) + 1
 
     def unregister(self, entry):
         """ Unregister an entry
@@ -109,20 +226,49 @@ class Registry(object):
         :raises NotRegisteredError: When the entry to unregister was never registered.
         """
         try:
-            self._store[entry.uid].pop(entry.version)
+            stream = self._store[entry.uid]
+            entry = stream.pop(entry.version)
         except KeyError:
             raise NotRegisteredError("%s is not registered" % entry)
 
-    def parse_directory(self, startdir):
+        if not stream:
+            del self._store[entry.uid]
+
+        uids = self._uids_by_name[entry.name]
+        uids[entry.uid] -= 1
+        if not uids[entry.uid]:
+            del uids[entry.uid]
+        if not uids:
+            del self._uids_by_name[entry.name]
+
+    def parse_directory(self, startdir, index=None, workers=None):
         """ Scan a directory and register any found definitions.
+
+        Files can be parsed concurrently, however definitions are always registered
+        in the same order as a serial scan.
+
+        :param str startdir: The directory to scan
+        :param index: An optional index used to only parse new or modified files.
+        :type index: omtk_compound.core._index.RegistryIndex
+        :param int workers: An optional number of concurrent workers used to parse files.
         """
-        for rootdir, _, filenames in os.walk(startdir):
-            for filename in filenames:
-                if filename.endswith(".ma"):
-                    path = os.path.join(rootdir, filename)
-                    try:
-                        inst = CompoundDefinition.from_file(path)
-                    except ValueError:  # TODO: Use custom exception
-                        pass
-                    else:
-                        self.register(inst)
+        if index is not None:
+            self.register(*index.scan(startdir, workers=workers))
+            return
+
+        for inst in imap(_parse_file, iter_ma_files(startdir), workers=workers):
+            if inst is not None:
+                self.register(inst)
+
+
+def _parse_file(path):
+    """ Create a compound definition from a file.
+
+    :param str path: A path to a maya ascii (.ma) file
+    :return: A compound definition or None if the file is not a valid compound.
+    :rtype: CompoundDefinition or None
+    """
+    try:
+        return CompoundDefinition.from_file(path)
+    except ValueError:  # TODO: Use custom exception
+        return None
@@ -0,0 +1,220 @@
+"""
+Cache of imported compound files used to instantiate the same compound many times.
+
+Each file is imported once in a template namespace, excluded from the saved scene.
+Instances are then duplicated from the template instead of being imported again.
+"""
+import collections
+import logging
+import os
+
+from maya import cmds
+from maya.api import OpenMaya
+
+from ._compound import Compound
+from ._constants import COMPOUND_DEFAULT_NAMESPACE, TEMPLATE_NAMESPACE_PREFIX
+from . import _utils_attr, _utils_namespace
+
+_LOG = logging.getLogger(__name__)
+
+
+def is_template_namespace(namespace):
+    """
+    :param str namespace: A namespace
+    :return: Is the namespace, or one of it's parent, holding a template?
+    :rtype: bool
+    """
+    return namespace.lstrip(":").startswith(TEMPLATE_NAMESPACE_PREFIX)
+
+
+def _get_descendants(node):
+    """
+    :param str node: A node dagpath
+    :return: The node descendants in a deterministic order, empty for DG nodes.
+    :rtype: list[str]
+    """
+    return cmds.listRelatives(node, allDescendents=True, fullPath=True) or []
+
+
+class _Template(object):
+    """
+    A compound file imported in a template namespace.
+    """
+
+    def __init__(self, path, namespace):
+        """
+        :param str path: The imported file path
+        :param str namespace: The template namespace
+        """
+        self.path = path
+        self.namespace = namespace
+        self.mtime = os.path.getmtime(path)
+
+        nodes = (
+            cmds.namespaceInfo(
+                namespace, listOnlyDependencyNodes=True, recurse=True, dagPath=True
+            )
+            or []
+        )
+
+        # Only the roots are duplicated, their children follow.
+        nodes_set = set(nodes)
+        self.roots = [
+            node
+            for node in nodes
+            if not set(cmds.listRelatives(node, parent=True, fullPath=True) or [])
+            & nodes_set
+        ]
+
+        # Name relative to the template namespace of each root and their descendants.
+        self.names = [
+            [self._get_relative_name(node) for node in [root] + _get_descendants(root)]
+            for root in self.roots
+        ]
+
+        # Exclude the template from the saved scene.
+        for node in nodes:
+            mfn = OpenMaya.MFnDependencyNode(_utils_attr.get_mobject(node))
+            mfn.setDoNotWrite(True)
+
+    def _get_relative_name(self, node):
+        """
+        :param str node: A node dagpath
+        :return: The node name relative to the template namespace.
+        :rtype: str
+        """
+        return _utils_namespace.relative_namespace(
+            node.rsplit("|", 1)[-1], self.namespace
+        )
+
+    def is_valid(self):
+        """
+        :return: Can the template still be used?
+                 It need to exist in the scene and it's file must not have changed.
+        :rtype: bool
+        """
+        if not cmds.namespace(exists=self.namespace):
+            return False
+        try:
+            return self.mtime == os.path.getmtime(self.path)
+        except OSError:
+            return False
+
+    def delete(self):
+        """ Delete the template from the scene. """
+        if cmds.namespace(exists=self.namespace):
+            cmds.namespace(removeNamespace=self.namespace, deleteNamespaceContent=True)
+            _utils_namespace.get_allocator().discard(self.namespace)
+
+    def instantiate(self, namespace):
+        """ Create a new compound from the template.
+
+        :param str namespace: The namespace of the new compound. Must not exist.
+        :return: A new compound
+        :rtype: Compound
+        """
+        cmds.namespace(add=namespace)
+
+        # Input connections are kept to preserve connections to shared nodes
+        # like time1. Connections between duplicated nodes are always kept.
+        new_roots = cmds.duplicate(
+            self.roots, inputConnections=True, returnRootsOnly=True
+        )
+
+        # Resolve the new nodes MObject first as renaming affect their dagpath.
+        entries = []
+        for new_root, names in zip(new_roots, self.names):
+            nodes = [new_root] + _get_descendants(new_root)
+            if len(nodes) != len(names):
+                raise RuntimeError(
+                    "Unexpected hierarchy for %r, found %s nodes instead of %s."
+                    % (new_root, len(nodes), len(names))
+                )
+            entries.extend(
+                (_utils_attr.get_mobject(node), name)
+                for node, name in zip(nodes, names)
+            )
+
+        for mobj, name in entries:
+            OpenMaya.MFnDependencyNode(mobj).setDoNotWrite(False)
+            new_name = _utils_namespace.join_namespace(namespace, name)
+            node_namespace = _utils_namespace.get_namespace(new_name)
+            if not cmds.namespace(exists=node_namespace):
+                cmds.namespace(add=node_namespace)
+            cmds.rename(_utils_attr.get_node_name(mobj), new_name)
+
+        return Compound(namespace)
+
+
+class TemplateCache(object):
+    """
+    Import compound files once and instantiate them by duplication.
+
+    The least recently used templates are deleted from the scene
+    when there's more than `max_size` templates.
+    """
+
+    def __init__(self, max_size=None):
+        """
+        :param int max_size: An optional maximum number of templates to keep.
+        """
+        self.max_size = max_size
+        self._templates = collections.OrderedDict()
+
+    def __len__(self):
+        return len(self._templates)
+
+    def __contains__(self, path):
+        return path in self._templates
+
+    def _get_template(self, path):
+        """ Get the template associated with a file, importing it if necessary.
+
+        :param str path: Path to a maya ascii file (.ma)
+        :return: A template
+        :rtype: _Template
+        """
+        template = self._templates.pop(path, None)
+        if template and not template.is_valid():
+            _LOG.debug("Template %r is outdated.", template.namespace)
+            template.delete()
+            template = None
+
+        if template is None:
+            namespace = _utils_namespace.get_unique_namespace(
+                TEMPLATE_NAMESPACE_PREFIX + "1"
+            )
+            _LOG.info("Importing %r as template %r", path, namespace)
+            cmds.file(path, i=True, namespace=namespace)
+            template = _Template(path, namespace)
+
+        # Keep the most recently used templates at the end
+        self._templates[path] = template
+        return template
+
+    def _evict(self):
+        """ Delete the least recently used templates if we have too many. """
+        while self.max_size is not None and len(self._templates) > self.max_size:
+            _, template = self._templates.popitem(last=False)
+            template.delete()
+
+    def instantiate(self, path, namespace=COMPOUND_DEFAULT_NAMESPACE):
+        """ Create a compound from a file, re-using a template if possible.
+
+        :param str path: Path to a maya ascii file (.ma)
+        :param str namespace: The namespace to use for the compound.
+        :return: A compound instance.
+        :rtype: Compound
+        """
+        template = self._get_template(path)
+        namespace = _utils_namespace.get_unique_namespace(namespace)
+        _LOG.info("Creating compound with namespace: %s", namespace)
+        inst = template.instantiate(namespace)
+        self._evict()
+        return inst
+
+    def clear(self):
+        """ Delete all templates. """
+        for template in self._templates.values():
+            template.delete()
+        self._templates.clear()
@@ -2,7 +2,9 @@
 import itertools
 import re
 from contextlib import contextmanager
-import pymel.core as pymel
+
+import six
+from maya import cmds
 
 _REGEX_GROUP_PREFIX = re.compile("(.*[^0-9]+)([0-9]*)$")
 
@@ -38,15 +40,17 @@ def get_unique_key(name, all_names, naming_format="{0}{1}", start=1):
 
 def pairwise(iterable):
     """ Consume an iterable by yielded two values at the time.
-    Recipe from: https://docs.python.org/2/library/itertools.html
+    Values are not re-used, this is not the "pairwise" itertools recipe.
+
+    >>> list(pairwise([1, 2, 3, 4]))
+    [(1, 2), (3, 4)]
 
     :param Iterable iterable: An iterable
     :return: A generator that yield two values at once
     :rtype: Generator[object, object]
     """
-    iter_a, iter_b = itertools.tee(iterable)
-    next(iter_b, None)
-    return itertools.izip(iter_a, iter_b)
+    iterator = iter(iterable)
+    return six.moves.zip(iterator, iterator)
 
 
 @contextmanager
@@ -56,9 +60,11 @@ def preserve_selection():
     :return: A context
     :rtype: Generator
     """
-    sel = pymel.selected()
+    # Use uuids so renamed nodes are still re-selected.
+    sel = cmds.ls(selection=True, uuid=True)
     yield
+    sel = cmds.ls(sel) if sel else None
     if sel:
-        pymel.select(sel)
+        cmds.select(sel)
     else:
-        pymel.select(clear=True)
+        cmds.select(clear=True)
@@ -5,17 +5,92 @@ import logging
 import re
 from contextlib import contextmanager
 
-import pymel.core as pymel
-from maya import OpenMaya, cmds, mel
+from maya import cmds, mel
+from maya.api import OpenMaya
 
-from . import _utils_namespace
+from . import _attr_spec, _utils_namespace, _utils_undo
 
 _LOG = logging.getLogger(__name__)
 
 
-def expose_attribute(
-    src_node, dst_node, src_name, dst_name=None
-):  # pylint: disable=too-many-locals
+def get_mobject(dagpath):
+    """ Resolve a node to it's MObject.
+
+    :param str dagpath: A node dagpath
+    :return: The node MObject
+    :rtype: maya.api.OpenMaya.MObject
+    """
+    sel = OpenMaya.MSelectionList()
+    sel.add(dagpath)
+    return sel.getDependNode(0)
+
+
+def get_plug(dagpath):
+    """ Resolve an attribute to it's MPlug.
+
+    :param str dagpath: An attribute dagpath. ex: "node.translateX"
+    :return: The attribute MPlug
+    :rtype: maya.api.OpenMaya.MPlug
+    """
+    sel = OpenMaya.MSelectionList()
+    sel.add(dagpath)
+    return sel.getPlug(0)
+
+
+def get_node_name(mobject):
+    """ Get the shortest unique name of a node.
+
+    :param mobject: A node MObject
+    :type mobject: maya.api.OpenMaya.MObject
+    :return: The node name
+    :rtype: str
+    """
+    if mobject.hasFn(OpenMaya.MFn.kDagNode):
+        return OpenMaya.MFnDagNode(mobject).partialPathName()
+    return OpenMaya.MFnDependencyNode(mobject).name()
+
+
+def get_plug_name(plug):
+    """ Get the dagpath of an attribute, using long attribute names.
+    This match the string representation of a pymel.Attribute.
+
+    :param plug: An attribute MPlug
+    :type plug: maya.api.OpenMaya.MPlug
+    :return: The attribute dagpath. ex: "node.translateX"
+    :rtype: str
+    """
+    return "%s.%s" % (get_node_name(plug.node()), plug.partialName(useLongNames=True))
+
+
+class _AttributeNames(object):
+    """
+    The attribute names of a node, long or short, and names about to be created.
+    Membership is tested directly on the node instead of listing all it's attributes.
+    """
+
+    def __init__(self, mfn):
+        """
+        :param mfn: A node function set
+        :type mfn: maya.api.OpenMaya.MFnDependencyNode
+        """
+        self._mfn = mfn
+        self._pending = set()
+
+    def __len__(self):
+        return self._mfn.attributeCount() + len(self._pending)
+
+    def __contains__(self, name):
+        return name in self._pending or self._mfn.hasAttribute(name)
+
+    def add(self, *names):
+        """ Reserve names for attributes that are not created yet.
+
+        :param str names: Attribute names
+        """
+        self._pending.update(names)
+
+
+def expose_attribute(src_node, dst_node, src_name, dst_name=None):
     """
     Copy an existing attribute from a node to another.
 
@@ -25,109 +100,110 @@ def expose_attribute(
     :param str dst_name: An optional name of the destination attribute
     :return: The dagpath of the newly created attribute
     """
-    # TODO: Simplify logic
     src_name = src_name.split("[", 1)[0]  # remove [0]  # HACK
-    dst_name = dst_name or src_name
-    dst_name = dst_name.split("[", 1)[0]  # remove [0]  # HACK
-    src_path = "%s.%s" % (src_node, src_name)
+    src_plug = get_plug("%s.%s" % (src_node, src_name))
+    dst_path = expose_attributes([src_plug], dst_node)[0]
+    _LOG.debug("Conformed %r to %r", dst_name or src_name, dst_path)
+    return dst_path
 
-    # Get MFnAttribute
-    src_attr = pymel.Attribute(src_path)  # TODO: Remove pymel usage
-    root_attr = src_attr.array() if src_attr.isElement() else src_attr
-    attr_long_name = root_attr.longName()
-    attr_short_name = root_attr.shortName()
 
-    _LOG.debug("Exposed attribute is %r", root_attr)
+def expose_attributes(plugs, dst_node, **properties):
+    """
+    Copy many existing attributes to a node at once.
+    Name collisions are resolved in a single pass
+    and all attributes are created by the same modifier.
 
-    existing_long_names = cmds.listAttr(str(dst_node))
-    existing_short_names = cmds.listAttr(str(dst_node), shortNames=True)
+    Elements of multi-attributes are copied as non-multi attributes.
 
-    _LOG.debug("Existing long names: %s", existing_long_names)
-    _LOG.debug("Existing short names: %s", existing_short_names)
+    :param plugs: The attributes to transfer
+    :type plugs: Iterable[maya.api.OpenMaya.MPlug]
+    :param str dst_node: The destination node
+    :param properties: MFnAttribute properties to set on the new attributes.
+                       ex: readable=True
+    :return: The dagpath of the newly created attributes, in order.
+    :rtype: list[str]
+    """
+    properties["array"] = False
 
-    unique_long_name = _utils_namespace.get_unique_namespace(
-        attr_long_name, existing_long_names
-    )
-    unique_short_name = _utils_namespace.get_unique_namespace(
-        attr_short_name, existing_short_names
-    )
+    dst_mobject = get_mobject(dst_node)
+    existing_names = _AttributeNames(OpenMaya.MFnDependencyNode(dst_mobject))
+    modifier = OpenMaya.MDGModifier()
+    modified = False
+    result = []
 
-    dst_path_conformed = "%s.%s" % (dst_node, unique_long_name)
-    _LOG.debug("Conformed %r to %r", dst_name, unique_short_name)
+    for plug in plugs:
+        root_plug = plug.array() if plug.isElement else plug
+        root_mfn = OpenMaya.MFnAttribute(root_plug.attribute())
+        attr_long_name = root_mfn.name
+        attr_short_name = root_mfn.shortName
 
-    # Generic attribute (Tdatacompound) cannot be constructed in MEL.
-    # TODO: Use the OpenMaya method as the only transfer method?
-    if src_attr.type() == "generic":
-        _expose_generic_attribute(
-            src_attr, dst_node, unique_long_name, unique_short_name
+        unique_long_name = _utils_namespace.get_unique_namespace(
+            attr_long_name, existing_names
         )
-    else:
-        _expose_attribute_mel(
-            src_attr,
-            dst_node,
-            attr_long_name,
-            attr_short_name,
-            unique_long_name,
-            unique_short_name,
+        unique_short_name = _utils_namespace.get_unique_namespace(
+            attr_short_name, existing_names
         )
+        dst_path = "%s.%s" % (dst_node, unique_long_name)
+        result.append(dst_path)
+
+        try:
+            spec = _attr_spec.get_attribute_spec(plug)
+        except _attr_spec.UnsupportedAttributeError as error:
+            _LOG.debug("%s, falling back to MEL.", error)
+
+            # Create any pending attribute first to preserve the attributes order.
+            if modified:
+                _utils_undo.commit(modifier)
+                modifier = OpenMaya.MDGModifier()
+                modified = False
+
+            _expose_attribute_mel(
+                plug,
+                dst_node,
+                attr_long_name,
+                attr_short_name,
+                unique_long_name,
+                unique_short_name,
+            )
+            mfn = OpenMaya.MFnAttribute(get_plug(dst_path).attribute())
+            for name, value in properties.items():
+                if name != "array":
+                    setattr(mfn, name, value)
+            continue
+
+        for names in spec.iter_names(unique_long_name, unique_short_name):
+            existing_names.add(*names)
+        modifier.addAttribute(
+            dst_mobject, spec.create(unique_long_name, unique_short_name, **properties)
+        )
+        modified = True
 
-    return dst_path_conformed
-
-
-def _expose_generic_attribute(attr, dst_node, dst_name, attr_short_name):
-    """
-    Transfer a GENERIC attribute from a node to another.
-
-    :param attr: The attribute to transfer
-    :type attr: pymel.Attribute
-    :param str dst_node: The node to create the new attribute on
-    :param str dst_name: The new attribute long name
-    :param attr_short_name: The new attribute short name
-    """
-    old_mfn = OpenMaya.MFnGenericAttribute(attr.__apimobject__())
-
-    accepts = [
-        idx
-        for idx in range(OpenMaya.MFnData.kInvalid + 1, OpenMaya.MFnData.kLast)
-        if old_mfn.accepts(idx)
-    ]
-
-    new_mfn = OpenMaya.MFnGenericAttribute()
-    new_mobject = new_mfn.create(dst_name, attr_short_name)
-    for accept in accepts:
-        new_mfn.addDataAccept(accept)
-
-    new_mfn.setWritable(old_mfn.isWritable())
-    new_mfn.setReadable(old_mfn.isReadable())
-    new_mfn.setCached(old_mfn.isCached())
-    new_mfn.setStorable(old_mfn.isStorable())
+    if modified:
+        _utils_undo.commit(modifier)
 
-    node_mfn = pymel.PyNode(dst_node).__apimfn__()
-    node_mfn.addAttribute(new_mobject)
+    return result
 
 
 def _expose_attribute_mel(  # pylint: disable=too-many-arguments
-    attr, dst_node, old_long_name, old_short_name, new_long_name, new_short_name
+    plug, dst_node, old_long_name, old_short_name, new_long_name, new_short_name
 ):
     """
-    Transfer an attribute from a node to another.
+    Transfer an attribute from a node to another using MEL.
+    Used for attributes that cannot be described by an AttributeSpec.
     Note that it don't work with generic attributes.
 
-    :param attr: The attribute to transfer
-    :type attr: pymel.Attribute
+    :param plug: The attribute to transfer
+    :type plug: maya.api.OpenMaya.MPlug
     :param str dst_node: The node to transfer to attribute to.
     :param str old_long_name: The attribute old long name
     :param str old_short_name: The attribute old short name
     :param str new_long_name: The attribute new long name
     :param str new_short_name: The attribute new short name
     """
-    mfn_attr = attr.__apimattr__()
-
     # Compound attribute need to be handled differently
-    if attr.isCompound():
-        mfn_attr = OpenMaya.MFnCompoundAttribute(mfn_attr.object())
-        mel_cmds = []
-        mfn_attr.getAddAttrCmds(mel_cmds)
+    if plug.isCompound:
+        mfn_attr = OpenMaya.MFnCompoundAttribute(plug.attribute())
+        mel_cmds = list(mfn_attr.getAddAttrCmds())
 
         # Rename the children parent attributes
         mel_cmds = [
@@ -136,12 +212,13 @@ def _expose_attribute_mel(  # pylint: disable=too-many-arguments
         ]
 
     else:
+        mfn_attr = OpenMaya.MFnAttribute(plug.attribute())
         mel_cmd = mfn_attr.getAddAttrCmd()
 
         # If we are transferring a child attribute,
         # we want to ignore any parent he might have.
         # Sadly modifying the mel script seem like the most simple way atm.
-        if attr.isChild():
+        if plug.isChild:
             mel_cmd = re.sub(r'-p "\w+"', "", mel_cmd)
 
         mel_cmds = [mel_cmd]
@@ -171,40 +248,106 @@ def _expose_attribute_mel(  # pylint: disable=too-many-arguments
         mel.eval(mel_cmd)
 
 
+def edit_connections(disconnections=(), connections=(), force=False):
+    """
+    Disconnect and connect attributes at once.
+    All edits are done by a single modifier and are undone together.
+
+    :param disconnections: Source and destination attributes to disconnect.
+    :type disconnections: Iterable[tuple[str, str]]
+    :param connections: Source and destination attributes to connect.
+    :type connections: Iterable[tuple[str, str]]
+    :param bool force: Should we replace existing connections to the destinations?
+    """
+    modifier = OpenMaya.MDGModifier()
+    disconnected = set()
+    connected = False
+    for attr_src, attr_dst in disconnections:
+        disconnected.add(attr_dst)
+        modifier.disconnect(get_plug(attr_src), get_plug(attr_dst))
+    for attr_src, attr_dst in connections:
+        connected = True
+        plug_dst = get_plug(attr_dst)
+        if force and attr_dst not in disconnected and plug_dst.isDestination:
+            modifier.disconnect(plug_dst.source(), plug_dst)
+        modifier.connect(get_plug(attr_src), plug_dst)
+
+    # Don't pollute the undo queue if there's nothing to do.
+    if disconnected or connected:
+        _utils_undo.commit(modifier)
+
+
+def _get_plug_connections(plug, inputs=True, outputs=True):
+    """
+    :param plug: An attribute MPlug
+    :type plug: maya.api.OpenMaya.MPlug
+    :param bool inputs: Should we return the input connection?
+    :param bool outputs: Should we return the output connections?
+    :return: The source and destination plugs of each connection
+    :rtype: list[tuple[maya.api.OpenMaya.MPlug, maya.api.OpenMaya.MPlug]]
+    """
+    result = []
+    if inputs and plug.isDestination:
+        result.append((plug.source(), plug))
+    if outputs and plug.isSource:
+        result.extend((plug, plug_dst) for plug_dst in plug.destinations())
+    return result
+
+
 def hold_connections(attrs, hold_inputs=True, hold_outputs=True):
     """
     Disconnect all inputs from the provided attributes but keep their in memory
     for ulterior re-connection.
 
-    :param attrs: A list of pymel.Attribute instances.
-    :type attrs: list of pymel.Attribute
+    :param attrs: A list of attributes dagpaths.
+    :type attrs: list of str
     :param bool hold_inputs: Should we disconnect input connections?
     :param bool hold_outputs: Should we disconnect output connections?
     :return: The origin source and destination attribute for each entries.
     :rtype:list(tuple(src, str)
     """
-    result = []
-    for attr in attrs:
-        if hold_inputs:
-            attr_src = next(iter(attr.inputs(plugs=True)), None)
-            if attr_src:
-                pymel.disconnectAttr(attr_src, attr)
-                result.append((attr_src, attr))
-        if hold_outputs:
-            for attr_dst in attr.outputs(plugs=True):
-                pymel.disconnectAttr(attr, attr_dst)
-                result.append((attr, attr_dst))
+    result = [
+        (get_plug_name(plug_src), get_plug_name(plug_dst))
+        for attr in attrs
+        for plug_src, plug_dst in _get_plug_connections(
+            get_plug(str(attr)), inputs=hold_inputs, outputs=hold_outputs
+        )
+    ]
+    edit_connections(disconnections=result)
+    return result
+
+
+def hold_node_connections(node, hold_inputs=True, hold_outputs=True):
+    """
+    Disconnect all inputs from a node attributes, except it's message attribute,
+    but keep their in memory for ulterior re-connection.
 
+    :param str node: A node dagpath
+    :param bool hold_inputs: Should we disconnect input connections?
+    :param bool hold_outputs: Should we disconnect output connections?
+    :return: The origin source and destination attribute for each entries.
+    :rtype:list(tuple(src, str)
+    """
+    mfn = OpenMaya.MFnDependencyNode(get_mobject(node))
+    message = mfn.attribute("message")
+    result = [
+        (get_plug_name(plug_src), get_plug_name(plug_dst))
+        for plug in mfn.getConnections()
+        if plug.attribute() != message
+        for plug_src, plug_dst in _get_plug_connections(
+            plug, inputs=hold_inputs, outputs=hold_outputs
+        )
+    ]
+    edit_connections(disconnections=result)
     return result
 
 
 def fetch_connections(data):
     """
     Reconnect all attributes using returned data from the hold_connections function.
-    :param data: A list of tuple of size-two containing pymel.Attribute instances.
+    :param data: A list of tuple of size-two containing attributes dagpaths.
     """
-    for attr_src, attr_dst in data:
-        pymel.connectAttr(attr_src, attr_dst)
+    edit_connections(connections=data)
 
 
 @contextmanager
@@ -214,15 +357,38 @@ def context_disconnected_attrs(attrs, hold_inputs=True, hold_outputs=True):
     the provided attributes are disconnected temporarily.
 
     :param attrs: Redirected to hold_connections.
-    :type attrs: Sequence[pymel.Attribute]
+    :type attrs: Sequence[str]
     :param bool hold_inputs: Should we disconnect input connections?
     :param bool hold_outputs: Should we disconnect output connections?
     :return: A context that temporary disconnect attributes
     :rtype: Generator
     """
     data = hold_connections(attrs, hold_inputs=hold_inputs, hold_outputs=hold_outputs)
-    yield
-    fetch_connections(data)
+    try:
+        yield
+    finally:
+        fetch_connections(data)
+
+
+@contextmanager
+def context_disconnected_node(node, hold_inputs=True, hold_outputs=True):
+    """
+    A context (use with the 'with' statement) to apply instruction while ensuring
+    the provided node is disconnected temporarily.
+
+    :param str node: Redirected to hold_node_connections.
+    :param bool hold_inputs: Should we disconnect input connections?
+    :param bool hold_outputs: Should we disconnect output connections?
+    :return: A context that temporary disconnect a node
+    :rtype: Generator
+    """
+    data = hold_node_connections(
+        node, hold_inputs=hold_inputs, hold_outputs=hold_outputs
+    )
+    try:
+        yield
+    finally:
+        fetch_connections(data)
 
 
 def reorder_attributes(node, attributes):
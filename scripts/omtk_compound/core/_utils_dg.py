@@ -0,0 +1,161 @@
+"""
+Traversal of the scene dependency graph using OpenMaya.
+"""
+import collections
+
+from maya.api import OpenMaya
+
+
+class NodeSet(object):
+    """
+    A set of nodes MObject that preserve the insertion order.
+
+    MObjectHandle.hashCode is not unique, two nodes can share the same value.
+    It is only used to find candidates, identity is confirmed by comparing handles.
+    """
+
+    def __init__(self, mobjects=()):
+        """
+        :param mobjects: The initial nodes
+        :type mobjects: Iterable[maya.api.OpenMaya.MObject]
+        """
+        self._buckets = collections.defaultdict(list)
+        self._mobjects = []
+        for mobject in mobjects:
+            self.add(mobject)
+
+    def __contains__(self, mobject):
+        handle = OpenMaya.MObjectHandle(mobject)
+        return any(
+            other == handle for other in self._buckets.get(handle.hashCode(), ())
+        )
+
+    def __iter__(self):
+        return iter(self._mobjects)
+
+    def __len__(self):
+        return len(self._mobjects)
+
+    def add(self, mobject):
+        """ Add a node if it is not already in the set.
+
+        :param mobject: A node MObject
+        :type mobject: maya.api.OpenMaya.MObject
+        :return: True if the node was added, False if it was already in the set.
+        :rtype: bool
+        """
+        handle = OpenMaya.MObjectHandle(mobject)
+        bucket = self._buckets[handle.hashCode()]
+        if any(other == handle for other in bucket):
+            return False
+        bucket.append(handle)
+        self._mobjects.append(mobject)
+        return True
+
+
+def iter_neighbours(mobject, upstream):
+    """ Yield the nodes directly connected to a node.
+
+    :param mobject: A node MObject
+    :type mobject: maya.api.OpenMaya.MObject
+    :param bool upstream: Yield the source nodes if True,
+                          the destination nodes otherwise.
+    :return: A generator of node MObject
+    :rtype: Generator[maya.api.OpenMaya.MObject]
+    """
+    for plug in OpenMaya.MFnDependencyNode(mobject).getConnections():
+        if upstream:
+            if plug.isDestination:
+                yield plug.source().node()
+        else:
+            for plug_dst in plug.destinations():
+                yield plug_dst.node()
+
+
+class Traversal(object):
+    """
+    A breadth-first traversal of the dependency graph in one direction.
+    """
+
+    def __init__(self, roots, upstream):
+        """
+        :param roots: The nodes to start from
+        :type roots: Iterable[maya.api.OpenMaya.MObject]
+        :param bool upstream: Traverse the graph upstream if True, downstream otherwise.
+        """
+        self.upstream = upstream
+        self.visited = NodeSet()
+        self._queue = collections.deque()
+        for mobject in roots:
+            self._visit(mobject)
+
+    def __bool__(self):
+        return bool(self._queue)
+
+    __nonzero__ = __bool__  # python-2 compatibility
+
+    def _visit(self, mobject, bounds=None):
+        """ Queue a node if it was never visited.
+
+        :param mobject: A node MObject
+        :type mobject: maya.api.OpenMaya.MObject
+        :param bounds: Optional nodes we are allowed to visit
+        :type bounds: Container[maya.api.OpenMaya.MObject]
+        """
+        if bounds is not None and mobject not in bounds:
+            return
+        if self.visited.add(mobject):
+            self._queue.append(mobject)
+
+    def step(self, bounds=None):
+        """ Expand the current frontier by one level.
+
+        :param bounds: Optional nodes we are allowed to expand
+        :type bounds: Container[maya.api.OpenMaya.MObject]
+        """
+        for _ in range(len(self._queue)):
+            mobject = self._queue.popleft()
+            if bounds is not None and mobject not in bounds:
+                continue
+            for neighbour in iter_neighbours(mobject, self.upstream):
+                self._visit(neighbour, bounds)
+
+    def run(self, bounds=None):
+        """ Expand the frontier until the traversal is exhausted.
+
+        :param bounds: Optional nodes we are allowed to expand
+        :type bounds: Container[maya.api.OpenMaya.MObject]
+        """
+        while self._queue:
+            self.step(bounds)
+
+
+def get_enclosed_nodes(roots_inn, roots_out):
+    """ Get the nodes that are both downstream of any input node
+    and upstream of any output node.
+
+    Both directions are traversed together, one level at a time,
+    until one of them is exhausted. The other is then only allowed to visit
+    nodes found by the first, as any other node cannot be enclosed.
+    Each node is visited at most once in each direction.
+
+    :param roots_inn: The input nodes
+    :type roots_inn: Iterable[maya.api.OpenMaya.MObject]
+    :param roots_out: The output nodes
+    :type roots_out: Iterable[maya.api.OpenMaya.MObject]
+    :return: The enclosed nodes, including the input and output nodes themselves.
+    :rtype: list[maya.api.OpenMaya.MObject]
+    """
+    forward = Traversal(roots_inn, upstream=False)
+    backward = Traversal(roots_out, upstream=True)
+
+    while forward and backward:
+        forward.step()
+        backward.step()
+
+    if forward:
+        forward.run(bounds=backward.visited)
+    else:
+        backward.run(bounds=forward.visited)
+
+    return [mobject for mobject in forward.visited if mobject in backward.visited]
@@ -57,17 +57,37 @@ def relative_namespace(namespace, parent_namespace):
     return namespace
 
 
+_REGEX_SUFFIX = re.compile(r"^(?P<prefix>[\w:]*?)(?P<suffix>\d*)$")
+
+
+def _split_suffix(namespace):
+    """ Split a namespace numbered suffix.
+
+    >>> _split_suffix('test12')
+    ('test', 12)
+    >>> _split_suffix('test')
+    ('test', 0)
+
+    :param str namespace: A namespace
+    :return: The namespace prefix and suffix
+    :rtype: tuple[str, int]
+    """
+    prefix, suffix = _REGEX_SUFFIX.match(namespace).groups()
+    return prefix, int(suffix) if suffix else 0
+
+
 def get_unique_namespace(namespace, pool=None):
     """
     :param str namespace: The start namespace
+    :param pool: Optional existing values. Default to the scene namespaces.
+    :type pool: Sequence[str]
     :return: A unique namespace
     :rtype namespace
     """
-    pool = pool or get_all_namespaces()
-    prefix, suffix = re.match(
-        r"^(?P<prefix>[\w:]*?)(?P<suffix>\d*)$", namespace
-    ).groups()
-    suffix = int(suffix) if suffix else 0
+    if not pool:
+        return get_allocator().get_unique(namespace)
+
+    prefix, suffix = _split_suffix(namespace)
     guess = namespace
     while guess in pool:
         suffix += 1
@@ -75,6 +95,167 @@ def get_unique_namespace(namespace, pool=None):
     return guess
 
 
+class NamespaceAllocator(object):
+    """
+    Keep track of the scene namespaces to resolve unique namespaces quickly.
+
+    Known namespaces are stored in a set and, for each prefix, we remember
+    the first suffix after an uninterrupted sequence of used namespaces.
+    ex: If "a1", "a2" and "a4" exist, the next suffix for "a" is 3.
+
+    The pool is filled lazily and is reset when a new scene is created or opened.
+    Namespaces created outside of the allocator are detected when we try to use them.
+    """
+
+    def __init__(self, namespaces=None):
+        """
+        :param namespaces: Optional known namespaces.
+                           Default to the scene namespaces on first use.
+        :type namespaces: Iterable[str]
+        """
+        self._pool = None
+        self._next_suffixes = {}
+        self._callback_ids = []
+        if namespaces is not None:
+            self.reset(namespaces)
+
+    def __contains__(self, namespace):
+        return namespace in self._get_pool()
+
+    def _get_pool(self):
+        """
+        :return: The known namespaces, reading them from the scene if necessary.
+        :rtype: set[str]
+        """
+        if self._pool is None:
+            self.reset(get_all_namespaces() or [])
+        return self._pool
+
+    def reset(self, namespaces=None):
+        """ Forget about all known namespaces.
+
+        :param namespaces: Optional known namespaces.
+                           Default to the scene namespaces on next use.
+        :type namespaces: Iterable[str]
+        """
+        self._next_suffixes = {}
+        if namespaces is None:
+            self._pool = None
+            return
+        self._pool = set()
+        for namespace in namespaces:
+            self.add(namespace)
+
+    def add(self, namespace):
+        """ Register an existing namespace.
+
+        :param str namespace: A namespace
+        """
+        pool = self._get_pool()
+        pool.add(namespace)
+
+        prefix, suffix = _split_suffix(namespace)
+        next_suffix = self._next_suffixes.get(prefix, 1)
+        if suffix != next_suffix or prefix + str(suffix) != namespace:
+            return
+        while prefix + str(next_suffix) in pool:
+            next_suffix += 1
+        self._next_suffixes[prefix] = next_suffix
+
+    def discard(self, namespace):
+        """ Unregister a namespace and it's children.
+
+        :param str namespace: A namespace
+        """
+        pool = self._pool
+        if pool is None:  # nothing to forget
+            return
+        children_prefix = namespace + ":"
+        for namespace_ in [namespace] + [
+            namespace_ for namespace_ in pool if namespace_.startswith(children_prefix)
+        ]:
+            pool.discard(namespace_)
+            prefix, suffix = _split_suffix(namespace_)
+            if suffix < self._next_suffixes.get(prefix, 1):
+                self._next_suffixes[prefix] = suffix
+
+    def _is_used(self, namespace):
+        """ Check if a namespace is used, validating unknown namespaces with Maya.
+
+        :param str namespace: A namespace
+        :return: Is the namespace already used?
+        :rtype: bool
+        """
+        if namespace in self._get_pool():
+            return True
+
+        from maya import cmds
+
+        if cmds.namespace(exists=":" + namespace.lstrip(":")):
+            self.add(namespace)
+            return True
+        return False
+
+    def get_unique(self, namespace):
+        """ Resolve an unused namespace.
+
+        :param str namespace: The start namespace
+        :return: A unique namespace
+        :rtype: str
+        """
+        if not self._is_used(namespace):
+            return namespace
+
+        # Skip the suffixes we know are used.
+        prefix, suffix = _split_suffix(namespace)
+        suffix = max(suffix + 1, self._next_suffixes.get(prefix, 1))
+        guess = prefix + str(suffix)
+        while self._is_used(guess):
+            suffix += 1
+            guess = prefix + str(suffix)
+        return guess
+
+    def register_callbacks(self):
+        """ Reset the allocator when a new scene is created or opened. """
+        from maya.api import OpenMaya
+
+        self.unregister_callbacks()
+        self._callback_ids = [
+            OpenMaya.MSceneMessage.addCallback(message, self._on_scene_changed)
+            for message in (
+                OpenMaya.MSceneMessage.kAfterNew,
+                OpenMaya.MSceneMessage.kAfterOpen,
+            )
+        ]
+
+    def unregister_callbacks(self):
+        """ Remove the callbacks registered by `register_callbacks`. """
+        if self._callback_ids:
+            from maya.api import OpenMaya
+
+            OpenMaya.MMessage.removeCallbacks(self._callback_ids)
+        self._callback_ids = []
+
+    def _on_scene_changed(self, *_):
+        self.reset()
+
+
+_ALLOCATOR = None
+
+
+def get_allocator():
+    """ Get the allocator shared by the whole session.
+
+    :return: A namespace allocator
+    :rtype: NamespaceAllocator
+    """
+    global _ALLOCATOR  # pylint: disable=global-statement
+    if _ALLOCATOR is None:
+        _ALLOCATOR = NamespaceAllocator()
+        _ALLOCATOR.register_callbacks()
+    return _ALLOCATOR
+
+
 @contextlib.contextmanager
 def with_temporary_namespace(namespace):
     """
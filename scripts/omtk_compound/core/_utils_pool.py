@@ -0,0 +1,30 @@
+"""
+Utility methods for running work on a pool of workers.
+"""
+from multiprocessing.pool import ThreadPool
+
+
+def imap(func, iterable, workers=None):
+    """ Apply a function to each value of an iterable, optionally using a thread pool.
+    Results are always yielded in the same order as the values.
+
+    Threads are used instead of processes as the work we distribute
+    is mostly waiting on I/O (ex: opening files on a network drive).
+
+    :param callable func: The function to apply
+    :param Iterable iterable: The values to apply the function on
+    :param int workers: The number of workers. Zero or one mean no pool is used.
+    :return: A generator that yield each function result
+    :rtype: Generator[object]
+    """
+    if not workers or workers < 2:
+        for value in iterable:
+            yield func(value)
+        return
+
+    pool = ThreadPool(workers)
+    try:
+        for result in pool.imap(func, iterable):
+            yield result
+    finally:
+        pool.terminate()
@@ -0,0 +1,81 @@
+"""
+Undo support for edits done with the OpenMaya api.
+
+Modifiers executed with `commit` are registered in Maya undo queue
+through the `omtkCompoundUndo` command, provided by a small plugin.
+"""
+import collections
+import logging
+import os
+from contextlib import contextmanager
+
+from maya import cmds
+
+_LOG = logging.getLogger(__name__)
+
+# Name of the command registering a modifier in the undo queue.
+COMMAND_NAME = "omtkCompoundUndo"
+
+_PLUGIN_PATH = os.path.abspath(
+    os.path.join(
+        os.path.dirname(__file__), "..", "..", "..", "plug-ins", COMMAND_NAME + ".py"
+    )
+)
+
+# Modifiers waiting to be consumed by the undo command.
+_PENDING = collections.deque()
+
+
+def _load_plugin():
+    """ Load the undo command plugin if necessary. """
+    if cmds.pluginInfo(COMMAND_NAME, query=True, loaded=True):
+        return
+    # The plugin is found automatically when installed as a module.
+    try:
+        cmds.loadPlugin(COMMAND_NAME, quiet=True)
+    except RuntimeError:
+        cmds.loadPlugin(_PLUGIN_PATH, quiet=True)
+
+
+def pop_pending():
+    """ Called by the undo command to get the modifier it need to own.
+
+    :return: The oldest modifier waiting to be registered
+    :rtype: maya.api.OpenMaya.MDGModifier
+    :raises IndexError: If no modifier is waiting to be registered
+    """
+    return _PENDING.popleft()
+
+
+def commit(modifier):
+    """ Execute a modifier and register it as a single entry in Maya undo queue.
+
+    :param modifier: A modifier containing the edits to execute
+    :type modifier: maya.api.OpenMaya.MDGModifier
+    """
+    modifier.doIt()
+    if not cmds.undoInfo(query=True, state=True):
+        return
+    try:
+        _load_plugin()
+    except RuntimeError:
+        _LOG.warning("Could not load %r, changes cannot be undone.", COMMAND_NAME)
+        return
+    _PENDING.append(modifier)
+    getattr(cmds, COMMAND_NAME)()
+
+
+@contextmanager
+def undo_chunk(name):
+    """ A context (use with the 'with' statement) that group any change done
+    inside it as a single entry in Maya undo queue.
+
+    :param str name: The name of the undo chunk
+    :return: A context
+    :rtype: Generator
+    """
+    cmds.undoInfo(openChunk=True, chunkName=name)
+    try:
+        yield
+    finally:
+        cmds.undoInfo(closeChunk=True)
@@ -1,7 +1,7 @@
 """
 Qt models
 """
-from ._roles import DataRole
+from ._roles import DataRole, SortRole
 from omtk_compound.models.model_compound import ModelAttributes
 from omtk_compound.models.model_compounds import CompoundManagerModel
 from omtk_compound.models.model_registry import CompoundRegistryModel
@@ -3,3 +3,6 @@ from omtk_compound.vendor.Qt import QtCore
 
 # Role used to query the model data.
 DataRole = QtCore.Qt.UserRole + 1  # pylint: disable=invalid-name
+
+# Role used to sort the model rows.
+SortRole = QtCore.Qt.UserRole + 2  # pylint: disable=invalid-name
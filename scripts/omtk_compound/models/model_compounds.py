@@ -2,7 +2,7 @@
 Model for displaying compounds in a QTableView.
 """
 from ..vendor.Qt import QtCore
-from ._roles import DataRole
+from ._roles import DataRole, SortRole
 from ._base import BaseTableModel
 
 
@@ -11,7 +11,7 @@ class CompoundManagerModel(BaseTableModel):
     Model for displaying compounds in a QTableView.
     """
 
-    _COLUMNS = ["namespace", "type", "version", "status"]
+    _COLUMNS = ["namespace", "type", "version", "status", "cost"]
 
     def __init__(self, manager, entries=None):
         """
@@ -20,9 +20,31 @@ class CompoundManagerModel(BaseTableModel):
         :param entries: An optional list of compounds to display
         :type entries: list[omtk_compound.Compound]
         """
+        self.profiles = {}
         super(CompoundManagerModel, self).__init__(entries)
         self.manager = manager
 
+    def set_profiles(self, profiles):
+        """ Set the evaluation cost of the compounds.
+
+        :param profiles: The profile of each compound by namespace
+        :type profiles: dict[str, omtk_compound.core.CompoundProfile]
+        """
+        self.profiles = profiles
+        column = self._COLUMNS.index("cost")
+        self.dataChanged.emit(
+            self.index(0, column), self.index(len(self.entries) - 1, column)
+        )
+
+    def _get_cost(self, compound):
+        """
+        :param omtk_compound.Compound compound: A compound
+        :return: The compound compute time in milliseconds or None if not profiled
+        :rtype: float or None
+        """
+        profile = self.profiles.get(compound.namespace)
+        return profile.total if profile else None
+
     def _get_compound_status(self, compound):
         """
         :param omtk_compound.Compound compound: A compound
@@ -78,6 +100,25 @@ class CompoundManagerModel(BaseTableModel):
                 return metadata.get("version", "unregistered")
             if column == 3:
                 return self.statuses[row]
+            if column == 4:
+                cost = self._get_cost(entry)
+                return "" if cost is None else "%.3f ms" % cost
+
+        if role == QtCore.Qt.ToolTipRole and index.column() == 4:
+            profile = self.profiles.get(self.entries[index.row()].namespace)
+            if profile:
+                return "\n".join(
+                    "%s: %.3f ms" % (node, time) for node, time in profile.hottest
+                )
+
+        if role == SortRole:
+            row = index.row()
+            column = index.column()
+            entry = self.entries[row]
+            if column == 4:
+                cost = self._get_cost(entry)
+                return -1.0 if cost is None else cost
+            return self.data(index, QtCore.Qt.DisplayRole)
 
         if role == DataRole:
             row = index.row()
@@ -46,6 +46,17 @@ class FormCompoundManager(QtWidgets.QMainWindow):
         self.ui.pushButton.pressed.connect(self.show_create)
         self.ui.pushButton_2.pressed.connect(self.show_publisher)
 
+    def closeEvent(self, event):  # pylint: disable=invalid-name
+        """
+        Re-implement QtWidgets.QWidget.closeEvent to remove the outliner callbacks.
+        The embedded outliner don't receive the event itself.
+
+        :param event: The close event
+        :type event: QtGui.QCloseEvent
+        """
+        self.ui.widget_outliner.release()
+        super(FormCompoundManager, self).closeEvent(event)
+
     def on_outliner_selection_changed(self, compounds):
         """
         Called when the user change the selection in the outliner.
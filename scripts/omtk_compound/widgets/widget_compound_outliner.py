@@ -1,20 +1,35 @@
 """
 QWidget that list compound instances in the scene.
 """
+import functools
 import logging
 
 from maya import cmds
 
 from omtk_compound import manager
+from omtk_compound.core import ProfileCache
 from omtk_compound.core._factory import from_scene, from_file
 from omtk_compound.vendor.Qt import QtCore, QtWidgets
 from omtk_compound.widgets.ui import widget_compound_outliner as ui_def
-from omtk_compound.models import CompoundManagerModel, DataRole
+from omtk_compound.models import CompoundManagerModel, DataRole, SortRole
 from omtk_compound.widgets.form_compound_picker import FormCompoundPicker
 
 _LOG = logging.getLogger(__name__)
 
 
+def _release(compounds, profile_cache, *_):
+    """ Remove the cache callbacks of compounds and profiles.
+
+    :param compounds: The compounds to disable the cache of
+    :type compounds: Iterable[omtk_compound.Compound]
+    :param profile_cache: The profiles cache
+    :type profile_cache: omtk_compound.core.ProfileCache
+    """
+    for compound in compounds:
+        compound.disable_cache()
+    profile_cache.unregister()
+
+
 class CompoundOutlinerWidget(QtWidgets.QWidget):
     """
     QWidget that list compound instances in the scene.
@@ -36,21 +51,50 @@ class CompoundOutlinerWidget(QtWidgets.QWidget):
 
         self.manager = manager
         compounds = tuple(from_scene())
+        # The model and selection query the compounds repeatedly.
+        for compound in compounds:
+            compound.enable_cache()
         self.model = CompoundManagerModel(self.manager, entries=compounds)
-        self.ui.treeView.setModel(self.model)
+        self.profile_cache = ProfileCache()
+        # closeEvent is not received when the widget is embedded in another window.
+        # Don't bind to a method, the widget is already half destroyed at this point.
+        self.destroyed.connect(
+            functools.partial(_release, compounds, self.profile_cache)
+        )
+        self.proxy_model = QtCore.QSortFilterProxyModel(self)
+        self.proxy_model.setSortRole(SortRole)
+        self.proxy_model.setSourceModel(self.model)
+        self.ui.treeView.setModel(self.proxy_model)
+        self.ui.treeView.setSortingEnabled(True)
         self.selection_model = self.ui.treeView.selectionModel()
         self.selection_model.selectionChanged.connect(self.on_selection_changed)
         self.ui.treeView.customContextMenuRequested.connect(
             self.on_custom_context_menu_requested
         )
 
+    def release(self):
+        """
+        Remove the cache callbacks. Call when the widget is not needed anymore.
+        """
+        _release(self.model.entries, self.profile_cache)
+
+    def closeEvent(self, event):  # pylint: disable=invalid-name
+        """
+        Re-implement QtWidgets.QWidget.closeEvent to remove the cache callbacks.
+
+        :param event: The close event
+        :type event: QtGui.QCloseEvent
+        """
+        self.release()
+        super(CompoundOutlinerWidget, self).closeEvent(event)
+
     def _get_selected_compounds(self):
         """
         :return: A list of selected compounds
         :rtype: List[omtk_compound.Compounds]
         """
         indexes = self.selection_model.selectedRows()
-        return [self.model.data(index, DataRole) for index in indexes]
+        return [self.proxy_model.data(index, DataRole) for index in indexes]
 
     def on_selection_changed(self, *_):
         """
@@ -74,8 +118,18 @@ class CompoundOutlinerWidget(QtWidgets.QWidget):
         action_promote = QtWidgets.QAction("Promote To...", self)
         action_promote.triggered.connect(self.on_action_promote_selected)
         menu.addAction(action_promote)
+        action_profile = QtWidgets.QAction("Profile Playback", self)
+        action_profile.triggered.connect(self.on_action_profile)
+        menu.addAction(action_profile)
         menu.exec_(self.ui.treeView.mapToGlobal(pos))
 
+    def on_action_profile(self):
+        """
+        Called when the user want to measure the evaluation cost of the compounds.
+        """
+        profiles = self.profile_cache.get(self.model.entries)
+        self.model.set_profiles(profiles)
+
     def on_action_promote_selected(self):
         """
         Called when the user want to promote a compound.
@@ -31,3 +31,14 @@ def cmds(maya_standalone):  # pylint: disable=unused-argument
     from maya import cmds
 
     return cmds
+
+
+@pytest.fixture
+def undo(cmds):
+    """Fixture that enable the undo queue and restore it's previous state afterward."""
+    state = cmds.undoInfo(query=True, state=True)
+    cmds.undoInfo(state=True)
+
+    yield
+
+    cmds.undoInfo(state=state)
@@ -1,13 +1,14 @@
 """
 Tests for omtk_compound.core._compound
 """
-# pylint: disable=redefined-outer-name
+# pylint: disable=redefined-outer-name,protected-access
 import os
 
 import pytest
 from maya import cmds as cmds_
 
 from omtk_compound.core import Compound
+from omtk_compound.core import _cache
 
 _MAYA_DEFAULT_NODES = None
 
@@ -265,6 +266,33 @@ def test_get_connections(compound2):
     assert actual == expected
 
 
+def test_get_connections_multi(cmds, compound):
+    """Validate we get the connections of each element of a multi hub attribute."""
+    cmds.createNode("transform", name="source")
+    cmds.createNode("transform", name="destination")
+    cmds.addAttr("test:inputs", longName="testInputs", multi=True)
+    cmds.addAttr("test:outputs", longName="testOutputs", multi=True)
+    cmds.connectAttr("source.translateX", "test:inputs.testInputs[0]")
+    cmds.connectAttr("source.translateY", "test:inputs.testInputs[1]")
+    cmds.connectAttr("test:outputs.testOutputs[0]", "destination.translateX")
+
+    actual = compound.get_connections()
+
+    assert actual == (
+        {
+            "test:inputs.testInputs[0]": ["source.translateX"],
+            "test:inputs.testInputs[1]": ["source.translateY"],
+        },
+        {"test:outputs.testOutputs[0]": ["destination.translateX"]},
+    )
+
+    compound.hold_connections()
+    assert not cmds.isConnected("source.translateY", "test:inputs.testInputs[1]")
+    compound.fetch_connections(*actual)
+    assert cmds.isConnected("source.translateY", "test:inputs.testInputs[1]")
+    assert cmds.isConnected("test:outputs.testOutputs[0]", "destination.translateX")
+
+
 def test_hold_connections(cmds, compound2):
     """Validate we can hold a compound connections."""
     assert cmds.isConnected("inputs.translateX", "test:inputs.testInput")
@@ -285,8 +313,315 @@ def test_fetch_connections(cmds, compound2):
     assert cmds.isConnected("test:outputs.testOutput", "outputs.translateX")
 
 
-def test_optimize(compound):
-    """Validate optimizing a compound raise a NotImplementedError"""
-    # TODO: Write test
-    with pytest.raises(NotImplementedError):
-        compound.optimize()
+@pytest.mark.usefixtures("undo")
+def test_hold_connections_undo(cmds, compound2):
+    """Validate holding connections can be undone in a single step."""
+    compound2.hold_connections()
+    assert not cmds.isConnected("inputs.translateX", "test:inputs.testInput")
+    assert not cmds.isConnected("test:outputs.testOutput", "outputs.translateX")
+
+    cmds.undo()
+    assert cmds.isConnected("inputs.translateX", "test:inputs.testInput")
+    assert cmds.isConnected("test:outputs.testOutput", "outputs.translateX")
+
+
+@pytest.mark.usefixtures("undo")
+def test_explode_undo(cmds, compound2):
+    """Validate exploding a compound can be undone in a single step."""
+    compound2.explode()
+    assert cmds.isConnected("inputs.translateX", "test:body.translateX")
+    assert not cmds.objExists("test:inputs")
+
+    cmds.undo()
+    assert cmds.objExists("test:inputs")
+    assert cmds.isConnected("inputs.translateX", "test:inputs.testInput")
+    assert cmds.isConnected("test:outputs.testOutput", "outputs.translateX")
+
+
+def test_optimize(cmds, compound2):
+    """Validate optimizing a compound remove it's hubs."""
+    report = compound2.optimize()
+
+    assert report.nodes_removed == 2
+    assert report.connections_removed == 4
+    assert not cmds.objExists("test:inputs")
+    assert not cmds.objExists("test:outputs")
+    assert cmds.isConnected("inputs.translateX", "test:body.translateX")
+    assert cmds.isConnected("test:body.translateX", "outputs.translateX")
+
+
+def test_optimize_dry_run(cmds, compound2):
+    """Validate a dry run report what would be removed without changing anything."""
+    report = compound2.optimize(dry_run=True)
+
+    assert report.nodes == {
+        "conversion_pairs": [],
+        "dead_nodes": [],
+        "hubs": ["test:inputs", "test:outputs"],
+    }
+    assert report.connections_removed is None
+    assert cmds.objExists("test:inputs")
+    assert cmds.objExists("test:outputs")
+
+
+@pytest.fixture
+def scene_dead_nodes(cmds, scene_complex):  # pylint: disable=unused-argument
+    """Fixture for a compound with nodes that don't affect it's outputs."""
+    cmds.createNode("plusMinusAverage", name="test:dead1")
+    cmds.createNode("multiplyDivide", name="test:dead2")
+    cmds.createNode("multiplyDivide", name="test:leak")
+    cmds.connectAttr("test:inputs.testInput", "test:dead1.input1D[0]")
+    cmds.connectAttr("test:dead1.output1D", "test:dead2.input1X")
+    cmds.connectAttr("test:inputs.testInput", "test:leak.input1X")
+    cmds.connectAttr("test:leak.outputX", "outputs.translateY")
+
+
+@pytest.mark.usefixtures("scene_dead_nodes")
+def test_get_dead_nodes():
+    """Validate we can find the nodes that don't affect any output."""
+    compound = Compound("test")
+    assert sorted(compound.get_dead_nodes()) == ["test:dead1", "test:dead2"]
+
+
+@pytest.mark.usefixtures("scene_dead_nodes")
+def test_get_dead_nodes_side_effects(cmds):
+    """Validate we keep the nodes that can be meaningful without feeding an output."""
+    cmds.scriptNode(name="test:script", scriptType=1, beforeScript="pass")
+    cmds.createNode("network", name="test:data")
+    cmds.createNode("multiplyDivide", name="test:source")
+    cmds.addAttr("test:data", longName="value")
+    cmds.connectAttr("test:source.outputX", "test:data.value")
+
+    compound = Compound("test")
+    assert sorted(compound.get_dead_nodes()) == ["test:dead1", "test:dead2"]
+
+
+@pytest.mark.usefixtures("scene_dead_nodes")
+def test_optimize_dead_nodes(cmds):
+    """Validate we can remove the nodes that don't affect any output."""
+    compound = Compound("test")
+
+    report = compound.optimize(passes=["dead_nodes"], dry_run=True)
+    assert sorted(report.nodes["dead_nodes"]) == ["test:dead1", "test:dead2"]
+    assert cmds.objExists("test:dead1")
+
+    report = compound.optimize(passes=["dead_nodes"])
+    assert report.nodes_removed == 2
+    assert report.connections_removed == 2
+    assert not cmds.objExists("test:dead1")
+    assert not cmds.objExists("test:dead2")
+    assert cmds.objExists("test:leak")
+    assert cmds.objExists("test:body")
+
+
+def test_optimize_constants(cmds, compound):
+    """Validate we can bake the values of nodes that have no connected inputs."""
+    cmds.createNode("transform", name="driver")
+    cmds.createNode("multiplyDivide", name="test:multiply")
+    cmds.createNode("plusMinusAverage", name="test:plus")
+    cmds.setAttr("test:multiply.input1", 2.0, 4.0, 0.0)
+    cmds.setAttr("test:multiply.input2X", 3.0)
+    cmds.connectAttr("test:multiply.outputX", "test:foobar.translateX")
+    cmds.connectAttr("test:multiply.outputY", "test:plus.input1D[0]")
+    cmds.connectAttr("driver.translateY", "test:plus.input1D[1]")
+
+    report = compound.optimize(passes=["constants"])
+
+    assert report.nodes == {"constants": ["test:multiply"]}
+    assert not cmds.objExists("test:multiply")
+    assert cmds.getAttr("test:foobar.translateX") == 6.0
+    assert cmds.getAttr("test:plus.input1D[0]") == 4.0
+    assert cmds.isConnected("driver.translateY", "test:plus.input1D[1]")
+
+
+def test_optimize_constants_rotate(cmds, compound):
+    """Validate we bake angles in the units of their destination."""
+    cmds.createNode("multiplyDivide", name="test:multiply")
+    cmds.createNode("unitConversion", name="test:conversion")
+    cmds.setAttr("test:multiply.input1X", 45.0)
+    cmds.setAttr("test:conversion.conversionFactor", 0.017453292519943295)
+    cmds.connectAttr("test:multiply.outputX", "test:conversion.input")
+    cmds.connectAttr("test:conversion.output", "test:foobar.rotateX")
+
+    report = compound.optimize(passes=["constants"])
+
+    assert report.nodes == {"constants": ["test:conversion", "test:multiply"]}
+    assert cmds.getAttr("test:foobar.rotateX") == pytest.approx(45.0)
+
+
+def test_optimize_constants_matrix(cmds, compound):
+    """Validate we can bake a constant matrix."""
+    cmds.createNode("transform", name="driver")
+    cmds.createNode("fourByFourMatrix", name="test:matrix")
+    cmds.createNode("multMatrix", name="test:mult")
+    cmds.setAttr("test:matrix.in30", 5.0)
+    cmds.connectAttr("driver.worldMatrix[0]", "test:mult.matrixIn[0]")
+    cmds.connectAttr("test:matrix.output", "test:mult.matrixIn[1]")
+
+    report = compound.optimize(passes=["constants"], dry_run=True)
+    assert report.nodes == {"constants": ["test:matrix"]}
+    assert cmds.objExists("test:matrix")
+
+    compound.optimize(passes=["constants"])
+    assert not cmds.objExists("test:matrix")
+    assert cmds.getAttr("test:mult.matrixIn[1]")[12] == 5.0
+    assert cmds.isConnected("driver.worldMatrix[0]", "test:mult.matrixIn[0]")
+
+
+def test_optimize_invalid_passes(compound):
+    """Validate we cannot run unknown passes or passes after the hubs removal."""
+    with pytest.raises(ValueError):
+        compound.optimize(passes=["unknown"])
+    with pytest.raises(ValueError):
+        compound.optimize(passes=["hubs", "conversion_pairs"])
+
+
+def test_optimize_decompose_compose(cmds, compound):
+    """Validate we remove a composeMatrix that rebuild a decomposed matrix."""
+    cmds.createNode("transform", name="driver")
+    cmds.createNode("decomposeMatrix", name="test:decompose")
+    cmds.createNode("composeMatrix", name="test:compose")
+    cmds.createNode("multMatrix", name="test:mult")
+    cmds.connectAttr("driver.worldMatrix[0]", "test:decompose.inputMatrix")
+    for attr in ("Translate", "Rotate", "Scale", "Shear"):
+        cmds.connectAttr("test:decompose.output" + attr, "test:compose.input" + attr)
+    cmds.connectAttr("test:compose.outputMatrix", "test:mult.matrixIn[0]")
+
+    report = compound.optimize(passes=["conversion_pairs"])
+
+    assert report.nodes == {"conversion_pairs": ["test:compose", "test:decompose"]}
+    assert cmds.isConnected("driver.worldMatrix[0]", "test:mult.matrixIn[0]")
+
+
+def test_optimize_decompose_compose_shared(cmds, compound):
+    """Validate a dry run report a decomposeMatrix shared by many composeMatrix."""
+    cmds.createNode("transform", name="driver")
+    cmds.createNode("decomposeMatrix", name="test:decompose")
+    cmds.connectAttr("driver.worldMatrix[0]", "test:decompose.inputMatrix")
+    cmds.createNode("multMatrix", name="test:mult")
+    for idx in range(2):
+        compose = cmds.createNode("composeMatrix", name="test:compose%s" % idx)
+        for attr in ("Translate", "Rotate", "Scale", "Shear"):
+            cmds.connectAttr("test:decompose.output" + attr, compose + ".input" + attr)
+        cmds.connectAttr(compose + ".outputMatrix", "test:mult.matrixIn[%s]" % idx)
+
+    report_dry = compound.optimize(passes=["conversion_pairs"], dry_run=True)
+    report = compound.optimize(passes=["conversion_pairs"])
+
+    assert sorted(report_dry.nodes["conversion_pairs"]) == sorted(
+        report.nodes["conversion_pairs"]
+    )
+    assert sorted(report.nodes["conversion_pairs"]) == [
+        "test:compose0",
+        "test:compose1",
+        "test:decompose",
+    ]
+
+
+def test_optimize_compose_decompose(cmds, compound):
+    """Validate we remove a decomposeMatrix that decompose a composed matrix."""
+    cmds.createNode("transform", name="driver")
+    cmds.createNode("composeMatrix", name="test:compose")
+    cmds.createNode("decomposeMatrix", name="test:decompose")
+    cmds.connectAttr("driver.translate", "test:compose.inputTranslate")
+    cmds.connectAttr("driver.rotateX", "test:compose.inputRotateX")
+    cmds.connectAttr("test:compose.outputMatrix", "test:decompose.inputMatrix")
+    cmds.connectAttr("test:decompose.outputTranslate", "test:foobar.translate")
+    cmds.connectAttr("test:decompose.outputRotateX", "test:foobar.rotateX")
+
+    # Not done by default as the rotation could change
+    report = compound.optimize(passes=["conversion_pairs"])
+    assert report.nodes_removed == 0
+
+    report = compound.optimize(passes=["compose_decompose"])
+
+    assert report.nodes == {"compose_decompose": ["test:decompose", "test:compose"]}
+    assert cmds.isConnected("driver.translate", "test:foobar.translate")
+    assert cmds.isConnected("driver.rotateX", "test:foobar.rotateX")
+
+
+def test_optimize_compose_decompose_constant(cmds, compound):
+    """Validate we keep conversion pairs using constant values."""
+    cmds.createNode("composeMatrix", name="test:compose")
+    cmds.createNode("decomposeMatrix", name="test:decompose")
+    cmds.connectAttr("test:compose.outputMatrix", "test:decompose.inputMatrix")
+    cmds.connectAttr("test:decompose.outputTranslate", "test:foobar.translate")
+
+    report = compound.optimize(passes=["compose_decompose"])
+
+    assert report.nodes_removed == 0
+    assert cmds.isConnected("test:decompose.outputTranslate", "test:foobar.translate")
+
+
+def test_cache(cmds, compound):
+    """Validate cached values are invalidated when the compound change."""
+    compound.enable_cache()
+    try:
+        assert compound.inputs == []
+        assert compound.outputs == []
+        assert compound.get_metadata() == {}
+
+        cmds.createNode("transform", name="test:new")
+        cmds.rename("test:foobar", "test:renamed")
+        assert set(compound.nodes) == {
+            "test:inputs",
+            "test:outputs",
+            "test:new",
+            "test:renamed",
+        }
+
+        compound.add_input_attr("testInput")
+        compound.add_output_attr("testOutput")
+        assert compound.inputs == ["test:inputs.testInput"]
+        assert compound.outputs == ["test:outputs.testOutput"]
+
+        compound.set_metadata({"uid": "test_uid"})
+        assert compound.get_metadata() == {"uid": "test_uid"}
+        compound.set_metadata({"uid": "another_uid"})
+        assert compound.get_metadata() == {"uid": "another_uid"}
+    finally:
+        compound.disable_cache()
+    assert not compound.cache_enabled
+
+
+def test_cache_shared_callbacks(cmds, compound):
+    """Validate all caches share the same global callbacks."""
+    cmds.namespace(addNamespace="test2")
+    cmds.createNode("network", name="test2:inputs")
+    cmds.createNode("network", name="test2:outputs")
+    compound2 = Compound("test2")
+
+    compound.enable_cache()
+    compound2.enable_cache()
+    try:
+        assert len(_cache._LISTENER._callback_ids) == 5
+        cmds.createNode("transform", name="test2:new")
+        assert "test2:new" in compound2.nodes
+    finally:
+        compound.disable_cache()
+        compound2.disable_cache()
+    assert not _cache._LISTENER._callback_ids
+
+
+def test_cache_rename(cmds, compound):
+    """Validate the cache follow the compound when it is renamed."""
+    compound.enable_cache()
+    try:
+        compound.rename("renamed")
+        assert "renamed:foobar" in compound.nodes
+
+        cmds.createNode("transform", name="renamed:new")
+        assert "renamed:new" in compound.nodes
+    finally:
+        compound.disable_cache()
+    assert not _cache._LISTENER._callback_ids
+
+
+def test_cache_new_scene(cmds, compound):
+    """Validate caches are disabled before a new scene is created."""
+    compound.enable_cache()
+
+    cmds.file(new=True, force=True)
+
+    assert not compound.cache_enabled
+    assert not _cache._LISTENER._callback_ids
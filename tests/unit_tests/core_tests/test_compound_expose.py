@@ -142,6 +142,47 @@ def test_expose_output_attr_non_writable(cmds, compound):
     assert cmds.attributeQuery("testAttr", node="test:outputs", writable=True)
 
 
+def test_expose_inputs(cmds, compound):
+    """Validate we can expose many attributes as inputs at once."""
+    cmds.addAttr("test:foobar", longName="testAttr")
+    actual = compound.expose_inputs(["test:foobar.testAttr", "test:foobar.translate"])
+
+    assert actual == ["test:inputs.testAttr", "test:inputs.translate"]
+    assert cmds.isConnected("test:inputs.testAttr", "test:foobar.testAttr")
+    assert cmds.isConnected("test:inputs.translate", "test:foobar.translate")
+    assert cmds.objExists("test:inputs.translateX")
+
+
+def test_expose_inputs_same_name(cmds, compound):
+    """Validate name collisions are resolved when exposing many attributes at once."""
+    cmds.createNode("transform", name="test:other")
+    actual = compound.expose_inputs(["test:foobar.translate", "test:other.translate"])
+
+    assert actual == ["test:inputs.translate", "test:inputs.translate1"]
+    assert cmds.objExists("test:inputs.translate1X")
+
+
+def test_expose_inputs_invalid(cmds, compound):
+    """Validate nothing is exposed if any attribute cannot be exposed."""
+    cmds.addAttr("test:foobar", longName="testAttr")
+    cmds.addAttr("test:foobar", longName="testAttrB", writable=False)
+
+    with pytest.raises(ValueError):
+        compound.expose_inputs(["test:foobar.testAttr", "test:foobar.testAttrB"])
+
+    assert not cmds.listAttr("test:inputs", userDefined=True)
+
+
+def test_expose_outputs(cmds, compound):
+    """Validate we can expose many attributes as outputs at once."""
+    cmds.addAttr("test:foobar", longName="testAttr")
+    actual = compound.expose_outputs(["test:foobar.testAttr", "test:foobar.translate"])
+
+    assert actual == ["test:outputs.testAttr", "test:outputs.translate"]
+    assert cmds.isConnected("test:foobar.testAttr", "test:outputs.testAttr")
+    assert cmds.isConnected("test:foobar.translate", "test:outputs.translate")
+
+
 def test_generate_docstring(compound):
     """Validate we can generate a compound description."""
     actual = compound.generate_docstring()
@@ -0,0 +1,69 @@
+"""
+Tests for omtk_compound.core._dedup
+"""
+# pylint: disable=redefined-outer-name
+import pytest
+
+from omtk_compound.core import Compound, create_from_nodes, merge_duplicates
+
+
+def _create_instance(cmds, namespace, factor):
+    """Create a compound that decompose the matrix of the same control."""
+    decompose = cmds.createNode("decomposeMatrix", name="decompose")
+    multiply = cmds.createNode("multiplyDivide", name="multiply")
+    driven = cmds.createNode("transform", name=namespace + "_driven")
+    cmds.connectAttr("ctrl.worldMatrix[0]", decompose + ".inputMatrix")
+    cmds.connectAttr(decompose + ".outputTranslate", multiply + ".input1")
+    cmds.setAttr(multiply + ".input2X", factor)
+    cmds.connectAttr(multiply + ".output", driven + ".translate")
+    create_from_nodes([decompose, multiply], namespace=namespace, expose=True)
+
+
+def _get_source_node(cmds, attr):
+    """Get the node that drive an attribute through an output hub."""
+    (attr_hub,) = cmds.listConnections(attr, source=True, destination=False, plugs=True)
+    (node,) = cmds.listConnections(attr_hub, source=True, destination=False)
+    return node
+
+
+@pytest.fixture
+def scene(cmds):
+    """Fixture for a scene with three compounds driven by the same control."""
+    cmds.createNode("transform", name="ctrl")
+    _create_instance(cmds, "a", 2.0)
+    _create_instance(cmds, "b", 2.0)
+    _create_instance(cmds, "c", 3.0)
+
+
+@pytest.mark.usefixtures("scene")
+def test_merge_duplicates_dry_run(cmds):
+    """Validate we can report the nodes that would be merged."""
+    # The instances are fed through their own input hub
+    assert cmds.listConnections("b:decompose.inputMatrix", source=True) == ["b:inputs"]
+
+    report = merge_duplicates(dry_run=True)
+
+    assert report.nodes == {"duplicates": ["b:decompose", "c:decompose", "b:multiply"]}
+    assert cmds.objExists("b:decompose")
+
+
+@pytest.mark.usefixtures("scene")
+def test_merge_duplicates(cmds):
+    """Validate we can merge identical nodes across compounds."""
+    report = merge_duplicates()
+
+    assert report.nodes_removed == 3
+    assert not cmds.objExists("b:decompose")
+    assert not cmds.objExists("b:multiply")
+    assert _get_source_node(cmds, "b_driven.translate") == "a:multiply"
+    assert cmds.listConnections("c:multiply.input1", source=True) == ["a:decompose"]
+    assert cmds.getAttr("c:multiply.input2X") == 3.0
+
+
+@pytest.mark.usefixtures("scene")
+def test_merge_duplicates_compounds(cmds):
+    """Validate we can restrict the merge to some compounds."""
+    report = merge_duplicates(compounds=[Compound("a"), Compound("c")])
+
+    assert report.nodes["duplicates"] == ["c:decompose"]
+    assert cmds.objExists("b:decompose")
@@ -11,6 +11,7 @@ from omtk_compound.core import (
     from_attributes,
     from_namespace,
 )
+from omtk_compound.core._factory import from_scene
 
 _MAYA_DEFAULT_NODES = None
 
@@ -162,6 +163,52 @@ def test_create_from_nodes_nested_2():
     }
 
 
+@pytest.mark.usefixtures("scene")
+def test_create_from_nodes_relative_namespaces():
+    """
+    Validate we keep the namespaces of the nodes,
+    whether all the nodes of a namespace are moved or not.
+    """
+    cmds.namespace(addNamespace="namespace_a")
+    cmds.namespace(addNamespace="namespace_b")
+    cmds.rename("b", "namespace_a:b")
+    cmds.rename("c", "namespace_a:c")
+    cmds.rename("d", "namespace_b:d")
+    cmds.rename("e", "namespace_b:e")
+
+    create_from_nodes({"namespace_a:b", "namespace_a:c", "namespace_b:d"})
+
+    assert _ls() == {
+        "a",
+        "compound1:inputs",
+        "compound1:namespace_a:b",
+        "compound1:namespace_a:c",
+        "compound1:namespace_b:d",
+        "compound1:outputs",
+        "namespace_b:e",
+    }
+
+
+@pytest.mark.usefixtures("scene", "undo")
+def test_create_from_nodes_undo():
+    """Validate creating a compound from a set of nodes can be undone in one step."""
+    create_from_nodes({"b", "c"})
+    cmds.undo()
+
+    assert _ls() == {"a", "b", "c", "d", "e"}
+
+
+@pytest.mark.usefixtures("scene", "undo")
+def test_create_from_nodes_expose_undo():
+    """Validate the exposed attributes are undone with the compound creation."""
+    create_from_nodes({"b", "c"}, expose=True)
+    cmds.undo()
+
+    assert _ls() == {"a", "b", "c", "d", "e"}
+    assert cmds.isConnected("a.translateX", "b.translateX")
+    assert cmds.isConnected("c.translateX", "d.translateX")
+
+
 def test_create_from_nodes_expose_reused_input_attributes(cmds):
     """ Ensure that we re-use an attribute if it is used twice as the network input.
     """
@@ -206,6 +253,25 @@ def test_map_from_nodes_expose_simple(cmds):
         assert cmds.isConnected(src, dst)
 
 
+def test_map_from_nodes_expose_ignore_message(cmds):
+    """ Validate we ignore message connections to nodes outside the network."""
+    cmds.createNode("transform", name="a")
+    cmds.createNode("transform", name="b")
+    cmds.createNode("transform", name="c")
+    cmds.addAttr("b", longName="testMessage", attributeType="message")
+    cmds.connectAttr("a.message", "b.testMessage")
+    cmds.addAttr("c", longName="testMessage", attributeType="message")
+    cmds.connectAttr("a.translateX", "b.translateX")
+    cmds.connectAttr("b.message", "c.testMessage")
+
+    create_from_nodes(["b"], expose=True)
+
+    assert cmds.listAttr("compound1:inputs", userDefined=True) == ["translateX"]
+    assert not cmds.listAttr("compound1:outputs", userDefined=True)
+    assert cmds.isConnected("compound1:b.message", "c.testMessage")
+    assert cmds.isConnected("a.message", "compound1:b.testMessage")
+
+
 def test_map_from_nodes_expose_cyclic(cmds):
     """ Validate we ignore connections pointing to nodes in the network."""
     cmds.createNode("transform", name="a")
@@ -325,3 +391,16 @@ def test_from_namespace_missing_output():
         from_namespace("a")
 
     assert str(error.value) == "'a:inputs' don't exist."
+
+
+def test_from_scene():
+    """Validate we can find all the compounds in a scene, including nested ones."""
+    create_empty("a")
+    create_empty("a:b")
+    create_empty("c")
+
+    # A namespace with only one of the hub is not a compound.
+    cmds.namespace(addNamespace=":d")
+    cmds.createNode("network", name=":d:inputs")
+
+    assert [compound.namespace for compound in from_scene()] == ["a", "a:b", "c"]
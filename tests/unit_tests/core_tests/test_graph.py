@@ -0,0 +1,84 @@
+"""
+Tests for omtk_compound.core._graph
+"""
+# pylint: disable=redefined-outer-name
+import os
+
+import pytest
+
+from omtk_compound.core._graph import MaGraph, MaAttribute
+
+_PATH_COMPOUND = os.path.join(
+    os.path.dirname(__file__),
+    "..",
+    "..",
+    "..",
+    "compounds",
+    "omtk.matrixFrom2Vectors_v0.0.1.ma",
+)
+
+
+@pytest.fixture(scope="module")
+def graph():
+    """Fixture for the graph of the shipped compound."""
+    return MaGraph.from_file(_PATH_COMPOUND)
+
+
+def test_nodes(graph):
+    """Validate we can list the nodes created by the file."""
+    assert len(graph) == 7
+    assert set(graph.nodes) == {
+        "getEye",
+        "getMatrix",
+        "getUp",
+        "inputs",
+        "normalizeLook",
+        "normalizeUp",
+        "outputs",
+    }
+
+
+def test_node_data(graph):
+    """Validate we can query a node type, uuid and values."""
+    assert graph.get_type("getMatrix") == "fourByFourMatrix"
+    assert graph.get_uid("getEye") == "944B3980-0000-407A-5C99-8B5800000794"
+    assert graph.get_values("normalizeUp") == {".op": ("0",), ".no": ("yes",)}
+
+
+def test_shared_nodes(graph):
+    """Validate shared nodes are not considered as part of the graph."""
+    assert graph.get_type(":defaultRenderUtilityList1") is None
+    assert ":time1" not in graph.nodes
+
+
+def test_inputs(graph):
+    """Validate we can list the compound input attributes."""
+    assert graph.inputs[:4] == [
+        "inputs.pos1",
+        "inputs.pos1X",
+        "inputs.pos1Y",
+        "inputs.pos1Z",
+    ]
+    assert graph.get_attributes("inputs")[1] == MaAttribute(
+        "pos1X", "pos1X", "float", "pos1"
+    )
+
+
+def test_outputs(graph):
+    """Validate we can list the compound output attributes."""
+    assert "outputs.outputMatrix" in graph.outputs
+    assert len(graph.outputs) == 13
+
+
+def test_connections(graph):
+    """Validate we can list connections."""
+    connections = graph.connections
+    assert len(connections) == 27
+    assert connections[0] == ("normalizeLook.o", "getEye.i1")
+    assert ("getMatrix.o", "outputs.outputMatrix") in connections
+
+
+def test_file_info(graph):
+    """Validate we can read fileInfo statements."""
+    assert graph.file_info["omtk.compound.name"] == "omtk.matrixFrom2Vectors"
+    assert ("maya", "2017ff05") in graph.requires
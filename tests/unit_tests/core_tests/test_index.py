@@ -0,0 +1,140 @@
+"""
+Tests for omtk_compound.core._index
+"""
+# pylint: disable=redefined-outer-name
+import os
+
+import mock
+import pytest
+
+from omtk_compound.core import _index
+from omtk_compound.core._index import RegistryIndex
+from omtk_compound.core._registry import Registry
+
+_CONTENT = """//Maya ASCII 2017ff05 scene
+//Name: test.ma
+requires maya "2017ff05";
+fileInfo "application" "maya";
+fileInfo "omtk.compound.uid" "%(uid)s";
+fileInfo "omtk.compound.name" "%(name)s";
+fileInfo "omtk.compound.version" "%(version)s";
+createNode network -n "inputs";
+createNode network -n "outputs";
+"""
+
+
+def _write(path, uid, name="test", version="0.0.1"):
+    """Write a minimal compound file to disk."""
+    with open(path, "w") as stream:
+        stream.write(_CONTENT % {"uid": uid, "name": name, "version": version})
+
+
+@pytest.fixture
+def library(tmp_path):
+    """Fixture for a directory containing two compounds."""
+    _write(str(tmp_path / "a.ma"), "uid_a", name="a")
+    _write(str(tmp_path / "b.ma"), "uid_b", name="b")
+    return str(tmp_path)
+
+
+@pytest.fixture
+def index_path(tmp_path):
+    """Fixture for the path of an index file."""
+    return str(tmp_path / "index.json")
+
+
+def _scan(library, index_path):
+    """Scan a library using an index and return the found definitions uids."""
+    index = RegistryIndex(index_path)
+    return sorted(definition.uid for definition in index.scan(library))
+
+
+def test_scan_cold(library, index_path):
+    """Validate a first scan parse every file and write the index."""
+    assert _scan(library, index_path) == ["uid_a", "uid_b"]
+    assert os.path.exists(index_path)
+    assert len(RegistryIndex(index_path)) == 2
+
+
+def test_scan_warm(library, index_path):
+    """Validate a second scan don't parse unchanged files."""
+    _scan(library, index_path)
+
+    with mock.patch.object(_index, "get_metadata_from_file") as mocked:
+        assert _scan(library, index_path) == ["uid_a", "uid_b"]
+    assert not mocked.called
+
+
+def test_scan_modified(library, index_path):
+    """Validate a modified file is parsed again."""
+    _scan(library, index_path)
+
+    _write(os.path.join(library, "b.ma"), "uid_c", name="another_name")
+
+    assert _scan(library, index_path) == ["uid_a", "uid_c"]
+
+
+def test_scan_touched(library, index_path):
+    """Validate a file with a new modification time but same content is not parsed."""
+    _scan(library, index_path)
+
+    path = os.path.join(library, "a.ma")
+    stat = os.stat(path)
+    os.utime(path, (stat.st_atime, stat.st_mtime + 10))
+
+    with mock.patch.object(_index, "get_metadata_from_file") as mocked:
+        assert _scan(library, index_path) == ["uid_a", "uid_b"]
+    assert not mocked.called
+
+
+def test_scan_deleted(library, index_path):
+    """Validate deleted files are removed from the index."""
+    _scan(library, index_path)
+
+    os.remove(os.path.join(library, "a.ma"))
+
+    assert _scan(library, index_path) == ["uid_b"]
+    assert len(RegistryIndex(index_path)) == 1
+
+
+def test_scan_sibling_directory(tmp_path, index_path):
+    """Validate scanning a directory keep the entries of it's sibling directories."""
+    os.mkdir(str(tmp_path / "rig"))
+    os.mkdir(str(tmp_path / "rig2"))
+    _write(str(tmp_path / "rig" / "a.ma"), "uid_a", name="a")
+    _write(str(tmp_path / "rig2" / "b.ma"), "uid_b", name="b")
+    _scan(str(tmp_path / "rig"), index_path)
+    _scan(str(tmp_path / "rig2"), index_path)
+
+    _scan(str(tmp_path / "rig"), index_path)
+
+    assert len(RegistryIndex(index_path)) == 2
+
+
+def test_scan_interrupted(library, index_path):
+    """Validate the index is saved even if the caller stop iterating early."""
+    index = RegistryIndex(index_path)
+    scan = index.scan(library)
+    next(scan)
+    scan.close()
+
+    assert os.path.exists(index_path)
+
+
+def test_scan_corrupted(library, index_path):
+    """Validate a corrupted index is ignored."""
+    with open(index_path, "w") as stream:
+        stream.write("not json")
+
+    assert _scan(library, index_path) == ["uid_a", "uid_b"]
+
+
+def test_registry_parse_directory(library, index_path):
+    """Validate scanning with an index give the same result than without."""
+    expected = Registry()
+    expected.parse_directory(library)
+
+    actual = Registry()
+    actual.parse_directory(library, index=RegistryIndex(index_path))
+
+    assert actual == expected
@@ -0,0 +1,93 @@
+"""
+Tests for omtk_compound.core._manager
+"""
+# pylint: disable=redefined-outer-name,protected-access
+import os
+
+import pytest
+
+from omtk_compound.core import (
+    CompoundDefinition,
+    LazyManager,
+    Manager,
+    Preferences,
+    create_empty,
+)
+
+
+@pytest.fixture
+def location(tmp_path, monkeypatch):
+    """Fixture for a compound location containing one compound."""
+    with open(str(tmp_path / "compound.ma"), "w") as stream:
+        stream.write(
+            "//Maya ASCII 2017ff05 scene\n"
+            'fileInfo "omtk.compound.uid" "test_uid";\n'
+            'fileInfo "omtk.compound.name" "test_name";\n'
+            'fileInfo "omtk.compound.version" "0.0.1";\n'
+        )
+    monkeypatch.setenv("OMTK_COMPOUND_COMPOUND_LOCATION", str(tmp_path))
+    return str(tmp_path)
+
+
+@pytest.mark.usefixtures("location")
+def test_manager_no_scan():
+    """Validate we can create a manager without scanning the compound location."""
+    manager = Manager(scan=False)
+    assert not len(manager.registry)
+
+    manager.scan()
+    assert len(manager.registry) == 1
+
+
+@pytest.mark.usefixtures("location")
+def test_lazy_manager():
+    """Validate the lazy manager only scan the compound location when first used."""
+    manager = LazyManager()
+    assert manager._manager is None
+
+    assert isinstance(manager.get(), Manager)
+    assert manager.registry.find(name="test_name") == CompoundDefinition(
+        name="test_name", version="0.0.1"
+    )
+
+
+@pytest.mark.usefixtures("location")
+def test_lazy_manager_preload():
+    """Validate we can scan the compound location in the background."""
+    manager = LazyManager()
+    manager.preload()
+
+    assert manager.registry.find(uid="test_uid").name == "test_name"
+    assert manager._thread is None
+
+
+@pytest.mark.usefixtures("cmds")
+def test_create_compounds():
+    """Validate we can create multiple instances of the same compound at once."""
+    location = os.path.join(os.path.dirname(__file__), "..", "..", "..", "compounds")
+    manager = Manager(
+        preferences=Preferences(compound_location=location), use_index=False
+    )
+
+    compounds = manager.create_compounds(
+        name="omtk.matrixFrom2Vectors", namespaces=["a", "b"]
+    )
+
+    assert [compound.namespace for compound in compounds] == ["a", "b"]
+    assert len(manager.templates) == 1
+
+
+@pytest.mark.usefixtures("cmds")
+def test_publish_compound_prune(cmds, tmp_path):
+    """Validate we can remove the dead nodes of a compound when publishing it."""
+    manager = Manager(
+        preferences=Preferences(compound_location=str(tmp_path)), use_index=False
+    )
+    compound = create_empty(namespace="test")
+    compound.set_metadata({"uid": "test_uid", "name": "test", "version": "0.0.1"})
+    cmds.createNode("multiplyDivide", name="test:dead")
+
+    manager.publish_compound(compound, prune=True)
+
+    assert not cmds.objExists("test:dead")
+    assert os.path.exists(str(tmp_path / "test_v0.0.1.ma"))
@@ -0,0 +1,170 @@
+"""
+Tests for omtk_compound.core._parser
+"""
+# pylint: disable=redefined-outer-name
+import os
+
+import pytest
+
+from omtk_compound.core._parser import (
+    get_metadata_from_file,
+    iter_ma_file_header,
+    iter_ma_file_metadata,
+    remove_root_namespace,
+    write_metadata_to_ma_file,
+)
+
+_PATH_COMPOUND = os.path.join(
+    os.path.dirname(__file__),
+    "..",
+    "..",
+    "..",
+    "compounds",
+    "omtk.matrixFrom2Vectors_v0.0.1.ma",
+)
+
+_HEADER = """//Maya ASCII 2017ff05 scene
+//Name: test.ma
+requires maya "2017ff05";
+currentUnit -l centimeter -a degree -t film;
+"""
+
+
+def _write(path, content, newline="\n"):
+    """Write a file to disk, using the provided line ending."""
+    with open(path, "wb") as stream:
+        stream.write(content.replace("\n", newline).encode("utf-8"))
+    return path
+
+
+def _read(path):
+    """Read a file content as text."""
+    with open(path, "r") as stream:
+        return stream.read()
+
+
+@pytest.fixture
+def path(tmp_path):
+    """Fixture for a file with metadata followed by a body."""
+    content = (
+        _HEADER + 'fileInfo "omtk.compound.uid" "test_uid";\n'
+        'fileInfo "omtk.compound.name" "test_name";\n'
+        'createNode network -n "inputs";\n'
+        'fileInfo "omtk.compound.version" "should_be_ignored";\n'
+    )
+    return _write(str(tmp_path / "test.ma"), content)
+
+
+def test_metadata(path):
+    """Validate we can read the metadata of a file."""
+    assert get_metadata_from_file(path) == {"uid": "test_uid", "name": "test_name"}
+
+
+def test_metadata_crlf(tmp_path):
+    """Validate we can read the metadata of a file with windows line endings."""
+    content = _HEADER + 'fileInfo "omtk.compound.uid" "test_uid";\n'
+    path = _write(str(tmp_path / "test.ma"), content, newline="\r\n")
+    assert get_metadata_from_file(path) == {"uid": "test_uid"}
+
+
+def test_metadata_shipped_compound():
+    """Validate we can read the metadata of the shipped compound."""
+    actual = get_metadata_from_file(_PATH_COMPOUND)
+    assert actual["name"] == "omtk.matrixFrom2Vectors"
+    assert actual["version"] == "0.0.1"
+
+
+def test_no_file_info(tmp_path):
+    """Validate we don't hang on a file without any fileInfo."""
+    content = _HEADER + 'createNode network -n "inputs";\n'
+    path = _write(str(tmp_path / "test.ma"), content)
+    assert not list(iter_ma_file_metadata(path))
+
+
+def test_header_stop_at_body(path):
+    """Validate we stop reading the header on the first body statement."""
+    lines = list(iter_ma_file_header(path))
+    assert lines[-1] == 'fileInfo "omtk.compound.name" "test_name";'
+
+
+def test_header_max_size(tmp_path):
+    """Validate we never read past the provided budget."""
+    content = _HEADER + "//" + "x" * 100000 + "\n" + 'fileInfo "a" "b";\n'
+    path = _write(str(tmp_path / "test.ma"), content)
+    assert not list(iter_ma_file_metadata(path, max_size=1024))
+
+
+def test_invalid_header(tmp_path):
+    """Validate we raise if the file is not a Maya ASCII file."""
+    path = _write(str(tmp_path / "test.ma"), "Not a maya file\n")
+    with pytest.raises(Exception) as error:
+        list(iter_ma_file_metadata(path))
+    assert str(error.value).startswith("Invalid first line for file")
+
+
+def test_write_metadata(path):
+    """Validate we can replace a file metadata."""
+    write_metadata_to_ma_file(path, {"uid": "new_uid", "version": "1.0.0"})
+
+    assert get_metadata_from_file(path) == {"uid": "new_uid", "version": "1.0.0"}
+    assert _read(path).endswith(
+        'createNode network -n "inputs";\n'
+        'fileInfo "omtk.compound.version" "should_be_ignored";\n'
+    )
+
+
+def test_write_metadata_mode(path):
+    """Validate rewriting a file preserve it's permissions."""
+    os.chmod(path, 0o644)
+
+    write_metadata_to_ma_file(path, {"uid": "new_uid"})
+
+    assert os.stat(path).st_mode & 0o777 == 0o644
+
+
+def test_write_metadata_missing_file(tmp_path):
+    """Validate no temporary file is left behind if the file cannot be read."""
+    with pytest.raises(IOError):
+        write_metadata_to_ma_file(str(tmp_path / "missing.ma"), {"uid": "new_uid"})
+
+    assert not os.listdir(str(tmp_path))
+
+
+def test_write_metadata_namespace(tmp_path):
+    """Validate we can replace a file metadata and remove a namespace at once."""
+    content = _HEADER + 'createNode network -n "test:inputs";\n'
+    path = _write(str(tmp_path / "test.ma"), content)
+
+    write_metadata_to_ma_file(path, {"uid": "new_uid"}, namespace="test")
+
+    assert _read(path) == (
+        _HEADER + 'fileInfo "omtk.compound.uid" "new_uid";\n'
+        'createNode network -n "inputs";\n'
+    )
+
+
+def test_write_metadata_in_place(path):
+    """Validate the header is rewritten in place when the new metadata fit."""
+    size = os.path.getsize(path)
+
+    write_metadata_to_ma_file(path, {"uid": "new_uid"}, in_place=True)
+
+    assert os.path.getsize(path) == size
+    assert get_metadata_from_file(path) == {"uid": "new_uid"}
+
+
+def test_write_metadata_in_place_too_large(path):
+    """Validate the whole file is rewritten if the new metadata don't fit."""
+    write_metadata_to_ma_file(path, {"description": "x" * 1000}, in_place=True)
+
+    assert get_metadata_from_file(path) == {"description": "x" * 1000}
+
+
+def test_remove_root_namespace(tmp_path):
+    """Validate we can remove a namespace from a file."""
+    content = _HEADER + 'connectAttr "test:a.tx" "test:b.tx";\n'
+    path = _write(str(tmp_path / "test.ma"), content)
+
+    remove_root_namespace("test", path)
+
+    assert _read(path) == _HEADER + 'connectAttr "a.tx" "b.tx";\n'
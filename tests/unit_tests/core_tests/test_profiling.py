@@ -0,0 +1,88 @@
+"""
+Tests for omtk_compound.core._profiling
+"""
+# pylint: disable=redefined-outer-name,protected-access
+import mock
+import pytest
+
+from omtk_compound.core import Compound, ProfileCache, profile_compounds
+from omtk_compound.core import _profiling
+
+
+@pytest.fixture
+def compound(cmds):
+    """Fixture for a compound driven by an animated control."""
+    cmds.createNode("transform", name="ctrl")
+    cmds.setKeyframe("ctrl", attribute="translateX", time=1, value=0)
+    cmds.setKeyframe("ctrl", attribute="translateX", time=10, value=10)
+
+    cmds.namespace(addNamespace="test")
+    cmds.createNode("network", name="test:inputs")
+    cmds.createNode("network", name="test:outputs")
+    cmds.createNode("multiplyDivide", name="test:multiply")
+    cmds.addAttr("test:inputs", longName="testInput")
+    cmds.addAttr("test:outputs", longName="testOutput")
+    cmds.connectAttr("ctrl.translateX", "test:inputs.testInput")
+    cmds.connectAttr("test:inputs.testInput", "test:multiply.input1X")
+    cmds.connectAttr("test:multiply.outputX", "test:outputs.testOutput")
+    return Compound("test")
+
+
+def test_profile_compounds(compound):
+    """Validate we can measure the evaluation cost of a compound."""
+    profiles = profile_compounds([compound], start=1, end=10, hottest=2)
+
+    assert list(profiles) == ["test"]
+    profile = profiles["test"]
+    assert profile.count == 3
+    assert len(profile.hottest) == 2
+    assert profile.hottest[0][1] >= profile.hottest[1][1]
+    times = dict(profile.hottest)
+    assert times["test:multiply"] > 0.0
+    assert profile.total >= times["test:multiply"]
+
+
+def test_profile_compounds_running_dgtimer(cmds, compound):
+    """Validate we don't stop or reset a dgtimer session already running."""
+    cmds.dgtimer(on=True, reset=True)
+    try:
+        profile_compounds([compound], start=1, end=10)
+        assert cmds.dgtimer(query=True, timerOn=True)
+        before = cmds.dgtimer("test:multiply", query=True, metric="compute")
+
+        profile_compounds([compound], start=1, end=10)
+        assert cmds.dgtimer("test:multiply", query=True, metric="compute") >= before
+    finally:
+        cmds.dgtimer(off=True)
+
+
+def test_profile_cache(cmds, compound):
+    """Validate profiles are cached until the scene change."""
+    cache = ProfileCache()
+    with mock.patch.object(
+        _profiling, "profile_compounds", wraps=_profiling.profile_compounds
+    ) as profile_mock:
+        try:
+            cache.get([compound], start=1, end=2)
+            cache.get([compound], start=1, end=2)
+            assert profile_mock.call_count == 1
+
+            cache.get([compound], start=1, end=3)
+            assert profile_mock.call_count == 2
+
+            cmds.createNode("transform", name="test:new")
+            cache.get([compound], start=1, end=3)
+            assert profile_mock.call_count == 3
+        finally:
+            cache.unregister()
+
+
+def test_profile_cache_new_scene(cmds, compound):
+    """Validate the cache callbacks are removed before a new scene is created."""
+    cache = ProfileCache()
+    cache.get([compound], start=1, end=2)
+    assert cache._callback_ids
+
+    cmds.file(new=True, force=True)
+
+    assert not cache._callback_ids
@@ -111,3 +111,106 @@ def test_find_fail_no_query(registry):
     with pytest.raises(ValueError) as error:
         registry.find(version=1)  # a version is not enough
     assert str(error.value) == "Should at least have one query."
+
+
+def test_parse_directory_workers(tmp_path):
+    """Validate a parallel scan register the same definitions in the same order."""
+    for idx in range(20):
+        with open(str(tmp_path / ("compound_%02d.ma" % idx)), "w") as stream:
+            stream.write(
+                "//Maya ASCII 2017ff05 scene\n"
+                'fileInfo "omtk.compound.uid" "uid_%s";\n'
+                'fileInfo "omtk.compound.name" "name_%s";\n'
+                'fileInfo "omtk.compound.version" "0.0.1";\n' % (idx, idx)
+            )
+
+    expected = Registry()
+    expected.parse_directory(str(tmp_path))
+
+    actual = Registry()
+    actual.parse_directory(str(tmp_path), workers=4)
+
+    assert len(actual) == 20
+    assert tuple(actual) == tuple(expected)
+
+
+def test_get_unknown_uid(registry):
+    """Validate we raise a KeyError when accessing an unknown version stream."""
+    with pytest.raises(KeyError):
+        _ = registry["an_unregistered_uid"]
+
+
+def test_find_after_unregister(registry, entry1_v1, entry1_v2):
+    """Validate lookups are up to date after unregistering entries."""
+    registry.unregister(entry1_v2)
+    assert registry.find(uid=1) is entry1_v1
+    assert registry.find(name="testComponent") is entry1_v1
+
+    registry.unregister(entry1_v1)
+    assert not len(registry)
+    with pytest.raises(LookupError):
+        registry.find(name="testComponent")
+
+
+def test_find_by_name_many(registry_empty):
+    """Validate we can find an entry by name among multiple streams."""
+    entries = [
+        CompoundDefinition(name="name_%s" % idx, version="1.0.0", uid="uid_%s" % idx)
+        for idx in range(100)
+    ]
+    registry_empty.register(*entries)
+    assert len(registry_empty) == 100
+    assert registry_empty.find(name="name_42") is entries[42]
+    assert registry_empty.find(uid="uid_42") is entries[42]
+
+
+@pytest.fixture
+def stream():
+    """Fixture for a version stream with versions that don't sort as strings."""
+    inst = VersionStream()
+    for version in ("0.9.0", "0.10.0", "0.2.0", "1.0.0"):
+        inst[version] = CompoundDefinition(name="test", version=version, uid=1)
+    return inst
+
+
+def test_stream_latest_semantic(stream):
+    """Validate the latest version use semantic versioning."""
+    assert stream.latest.version == "1.0.0"
+    assert stream.versions == ["0.2.0", "0.9.0", "0.10.0", "1.0.0"]
+
+
+def test_stream_latest_after_pop(stream):
+    """Validate the ordering is updated when removing a version."""
+    stream.pop("1.0.0")
+    assert stream.latest.version == "0.10.0"
+    del stream["0.10.0"]
+    assert stream.latest.version == "0.9.0"
+
+
+def test_stream_previous(stream):
+    """Validate we can get the version before another one."""
+    assert stream.previous("0.10.0").version == "0.9.0"
+    assert stream.previous("0.9.5").version == "0.9.0"
+    assert stream.previous("0.2.0") is None
+
+
+@pytest.mark.parametrize(
+    "specifier,expected",
+    (
+        (">=0.9.0", ["0.9.0", "0.10.0", "1.0.0"]),
+        (">0.9.0,<1.0.0", ["0.10.0"]),
+        ("<=0.9.0", ["0.2.0", "0.9.0"]),
+        ("==0.10.0", ["0.10.0"]),
+        ("!=0.10.0, <1", ["0.2.0", "0.9.0"]),
+    ),
+)
+def test_stream_range(stream, specifier, expected):
+    """Validate we can get the versions matching a specifier."""
+    assert [entry.version for entry in stream.range(specifier)] == expected
+
+
+def test_stream_range_invalid(stream):
+    """Validate we raise on an invalid specifier."""
+    with pytest.raises(ValueError) as error:
+        stream.range("~1.0")
+    assert str(error.value) == "Invalid version specifier: '~1.0'"
@@ -0,0 +1,88 @@
+"""
+Tests for omtk_compound.core._template
+"""
+# pylint: disable=redefined-outer-name
+import os
+import shutil
+
+import pytest
+
+from omtk_compound.core._factory import from_file, from_scene
+from omtk_compound.core._template import TemplateCache
+
+_PATH_COMPOUND = os.path.join(
+    os.path.dirname(__file__),
+    "..",
+    "..",
+    "..",
+    "compounds",
+    "omtk.matrixFrom2Vectors_v0.0.1.ma",
+)
+
+
+def _get_relative_nodes(compound):
+    """Get the name of a compound nodes, without the compound namespace."""
+    prefix = compound.namespace + ":"
+    return sorted(node[len(prefix) :] for node in compound.nodes)
+
+
+@pytest.mark.usefixtures("cmds")
+def test_instantiate():
+    """Validate instances created from a template match an imported compound."""
+    expected = _get_relative_nodes(from_file(_PATH_COMPOUND, namespace="expected"))
+
+    cache = TemplateCache()
+    compounds = [cache.instantiate(_PATH_COMPOUND, namespace="test") for _ in range(3)]
+
+    assert len(cache) == 1
+    assert [compound.namespace for compound in compounds] == ["test", "test1", "test2"]
+    for compound in compounds:
+        assert _get_relative_nodes(compound) == expected
+
+
+def test_instantiate_connections(cmds):
+    """Validate the internal connections are preserved."""
+    expected = from_file(_PATH_COMPOUND, namespace="expected")
+    actual = TemplateCache().instantiate(_PATH_COMPOUND, namespace="test")
+
+    def _get_connections(compound):
+        connections = (
+            cmds.listConnections(compound.nodes, connections=True, plugs=True) or []
+        )
+        return sorted(
+            (src.split(":", 1)[-1], dst.split(":", 1)[-1])
+            for src, dst in zip(connections[::2], connections[1::2])
+        )
+
+    assert _get_connections(actual) == _get_connections(expected)
+
+
+@pytest.mark.usefixtures("cmds")
+def test_template_hidden_from_scene():
+    """Validate templates are not considered as compounds in the scene."""
+    TemplateCache().instantiate(_PATH_COMPOUND, namespace="test")
+
+    assert [compound.namespace for compound in from_scene()] == ["test"]
+
+
+def test_template_eviction(cmds, tmp_path):
+    """Validate the least recently used templates are deleted."""
+    path = str(tmp_path / "compound.ma")
+    shutil.copy(_PATH_COMPOUND, path)
+
+    cache = TemplateCache(max_size=1)
+    cache.instantiate(_PATH_COMPOUND)
+    cache.instantiate(path)
+
+    assert _PATH_COMPOUND not in cache
+    assert path in cache
+    assert not cmds.namespace(exists="omtkCompoundTemplate1")
+
+
+def test_template_outdated_scene(cmds):
+    """Validate a template is imported again if the scene changed."""
+    cache = TemplateCache()
+    cache.instantiate(_PATH_COMPOUND)
+    cmds.file(new=True, force=True)
+
+    assert cache.instantiate(_PATH_COMPOUND, namespace="test").namespace == "test"
@@ -3,7 +3,12 @@ Tests for omtk_compound.core._utils_attr
 """
 from maya import cmds
 
-from omtk_compound.core._utils_attr import expose_attribute, reorder_attributes
+from omtk_compound.core import _attr_spec
+from omtk_compound.core._utils_attr import (
+    expose_attribute,
+    get_plug,
+    reorder_attributes,
+)
 
 
 def test_transfer_attribute_single_scalar():
@@ -36,6 +41,68 @@ def test_transform_attribute_child_scalar_to_single_scalar():
     assert cmds.objExists("dst.testY")
 
 
+def test_transfer_attribute_enum():
+    """
+    Validate we can transfer an enum attribute and it's fields.
+    """
+    src = cmds.createNode("transform", name="src")
+    dst = cmds.createNode("transform", name="dst")
+    cmds.addAttr(src, longName="test", attributeType="enum", enumName="a=1:b=3")
+
+    expose_attribute(src, dst, "test")
+
+    assert cmds.attributeQuery("test", node=dst, listEnum=True) == ["a=1:b=3"]
+
+
+def test_transfer_attribute_element_compound():
+    """
+    Validate we can transfer an element of a multi compound attribute
+    to a non-multi compound attribute.
+    """
+    src = cmds.createNode("transform", name="src")
+    dst = cmds.createNode("transform", name="dst")
+    cmds.addAttr(src, longName="test", attributeType="compound", nc=2, multi=True)
+    cmds.addAttr(src, longName="testA", attributeType="float", parent="test")
+    cmds.addAttr(src, longName="testB", dataType="string", parent="test")
+
+    expose_attribute(src, dst, "test[0]")
+
+    assert not cmds.attributeQuery("test", node=dst, multi=True)
+    assert cmds.listAttr("dst.test") == ["test", "testA", "testB"]
+
+
+def test_transfer_attribute_unique_name():
+    """
+    Validate a transferred attribute is renamed if it's name is already used.
+    """
+    src = cmds.createNode("transform", name="src")
+    dst = cmds.createNode("transform", name="dst")
+
+    assert expose_attribute(src, dst, "translateX") == "dst.translateX1"
+    assert cmds.objExists("dst.translateX1")
+
+
+def test_attribute_spec_cache():
+    """
+    Validate specifications of static attributes are cached by node type
+    and that dynamic attributes are not.
+    """
+    _attr_spec.clear_cache()
+    node_a = cmds.createNode("transform")
+    node_b = cmds.createNode("transform")
+    cmds.addAttr(node_a, longName="test")
+    cmds.addAttr(node_b, longName="test", attributeType="bool")
+
+    spec_a = _attr_spec.get_attribute_spec(get_plug(node_a + ".translateX"))
+    spec_b = _attr_spec.get_attribute_spec(get_plug(node_b + ".translateX"))
+    assert spec_a is spec_b
+
+    spec_a = _attr_spec.get_attribute_spec(get_plug(node_a + ".test"))
+    spec_b = _attr_spec.get_attribute_spec(get_plug(node_b + ".test"))
+    assert spec_a is not spec_b
+    assert spec_a.args != spec_b.args
+
+
 def test_reorder_attributes():
     """
     Validate we can re-order attributes.
@@ -0,0 +1,77 @@
+"""
+Tests for omtk_compound.core._utils_dg
+"""
+from maya import cmds
+
+from omtk_compound.core._utils_attr import get_mobject, get_node_name
+from omtk_compound.core._utils_dg import NodeSet, get_enclosed_nodes
+
+
+def _get_enclosed_nodes(inputs, outputs):
+    """
+    Wrapper around get_enclosed_nodes that work with node names.
+    """
+    result = get_enclosed_nodes(
+        [get_mobject(node) for node in inputs], [get_mobject(node) for node in outputs]
+    )
+    return {get_node_name(mobject) for mobject in result}
+
+
+def _create_chain(*names):
+    """
+    Create a chain of transform connected by their translateX attribute.
+    """
+    for name in names:
+        cmds.createNode("transform", name=name)
+    for src, dst in zip(names, names[1:]):
+        cmds.connectAttr(src + ".translateX", dst + ".translateX")
+
+
+def test_get_enclosed_nodes():
+    """
+    Validate we only return the nodes between the inputs and the outputs.
+    """
+    _create_chain("a", "b", "c", "d", "e")
+
+    assert _get_enclosed_nodes(["b"], ["d"]) == {"b", "c", "d"}
+
+
+def test_get_enclosed_nodes_branches():
+    """
+    Validate branches that don't lead to an output are ignored.
+    """
+    _create_chain("a", "b", "c", "d")
+    _create_chain("e", "f")
+    cmds.connectAttr("b.translateY", "e.translateY")
+    cmds.connectAttr("f.translateY", "d.translateY")
+    cmds.createNode("transform", name="g")
+    cmds.connectAttr("c.translateZ", "g.translateZ")
+
+    assert _get_enclosed_nodes(["a"], ["d"]) == {"a", "b", "c", "d", "e", "f"}
+
+
+def test_get_enclosed_nodes_disconnected():
+    """
+    Validate we return nothing when the inputs and outputs are not connected.
+    """
+    _create_chain("a", "b")
+    _create_chain("c", "d")
+
+    assert _get_enclosed_nodes(["a"], ["d"]) == set()
+
+
+def test_node_set():
+    """
+    Validate a node set contain each node once and preserve the insertion order.
+    """
+    _create_chain("a", "b", "c")
+    mobjects = [get_mobject(node) for node in ("b", "a", "b")]
+
+    node_set = NodeSet(mobjects)
+
+    assert len(node_set) == 2
+    assert [get_node_name(mobject) for mobject in node_set] == ["b", "a"]
+    assert get_mobject("a") in node_set
+    assert get_mobject("c") not in node_set
+    assert not node_set.add(get_mobject("a"))
+    assert node_set.add(get_mobject("c"))
@@ -4,6 +4,7 @@ Tests for omtk_compound.core._utils_namespace
 import pytest
 
 from omtk_compound.core._utils_namespace import (
+    NamespaceAllocator,
     get_unique_namespace,
     get_common_namespace,
     relative_namespace,
@@ -43,6 +44,37 @@ def test_get_unique_namespace_clash_with_suffix(cmds):
     assert actual == "test2"
 
 
+def test_get_unique_namespace_clash_after_new_scene(cmds):
+    """Assert namespaces of a previous scene are forgotten."""
+    cmds.namespace(addNamespace="test")
+    assert get_unique_namespace("test") == "test1"
+
+    cmds.file(new=True, force=True)
+    assert get_unique_namespace("test") == "test"
+
+
+@pytest.mark.usefixtures("cmds")
+def test_namespace_allocator():
+    """Assert the allocator skip known namespaces and re-use released ones."""
+    allocator = NamespaceAllocator(["test1", "test2", "test4"])
+    assert allocator.get_unique("test1") == "test3"
+
+    allocator.add("test3")
+    assert allocator.get_unique("test1") == "test5"
+
+    allocator.discard("test2")
+    assert allocator.get_unique("test1") == "test2"
+
+
+def test_namespace_allocator_unknown_namespace(cmds):
+    """Assert the allocator detect namespaces it was not told about."""
+    allocator = NamespaceAllocator([])
+    cmds.namespace(addNamespace="test")
+
+    assert allocator.get_unique("test") == "test1"
+    assert "test" in allocator
+
+
 @pytest.mark.parametrize(
     "namespaces,expected",
     (
@@ -0,0 +1,40 @@
+"""Test for omtk_compound.models.model_compounds"""
+# pylint: disable=redefined-outer-name
+import mock
+import pytest
+
+from omtk_compound import Compound
+from omtk_compound.core import CompoundProfile
+from omtk_compound.models import CompoundManagerModel, SortRole
+from omtk_compound.vendor.Qt import QtCore
+
+
+@pytest.fixture
+def model(cmds):
+    """Fixture for a model displaying two compounds"""
+    for namespace in ("a", "b"):
+        cmds.namespace(addNamespace=namespace)
+        cmds.createNode("network", name=namespace + ":inputs")
+        cmds.createNode("network", name=namespace + ":outputs")
+    manager = mock.MagicMock()
+    manager.registry = {}
+    return CompoundManagerModel(manager, entries=[Compound("a"), Compound("b")])
+
+
+def test_cost(model):
+    """Validate the model display the compounds evaluation cost."""
+    index = model.index(0, 4)
+    assert model.headerData(4, QtCore.Qt.Horizontal, QtCore.Qt.DisplayRole) == "cost"
+    assert model.data(index, QtCore.Qt.DisplayRole) == ""
+    assert model.data(index, SortRole) == -1.0
+
+    model.set_profiles(
+        {"a": CompoundProfile("a", 1.5, 2, [("a:inputs", 1.0), ("a:outputs", 0.5)])}
+    )
+
+    assert model.data(index, QtCore.Qt.DisplayRole) == "1.500 ms"
+    assert model.data(index, SortRole) == 1.5
+    assert model.data(index, QtCore.Qt.ToolTipRole) == (
+        "a:inputs: 1.000 ms\na:outputs: 0.500 ms"
+    )
+    assert model.data(model.index(1, 4), QtCore.Qt.DisplayRole) == ""